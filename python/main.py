@@ -18,6 +18,7 @@ from src.config.manager import ConfigManager
 from src.config.wizard import ConfigWizard
 from src.menu.main_menu import MainMenu
 from src.cli.commands import CLI
+from src.database.connection import DatabaseConnection
 
 
 def main():
@@ -40,6 +41,14 @@ def main():
         # 加载配置
         config = config_manager.load()
 
+        # 数据库连接调优方案（default / low_memory / large）
+        database_profile = config.get('storage', {}).get('database_profile', 'default')
+        try:
+            DatabaseConnection.set_tuning_profile(database_profile)
+        except ValueError:
+            print(f"⚠️  未知的数据库调优方案 {database_profile}，使用 default")
+            DatabaseConnection.set_tuning_profile('default')
+
         # 判断模式
         if len(sys.argv) > 1:
             # 命令行模式
@@ -5,6 +5,9 @@ Phase 4: 数据分析 + 可视化
 
 模块结构:
 - exif_analyzer.py: EXIF 分析器
+- exif_engine.py: EXIF 并行提取引擎（APP1 快速读取 + 进程池 + 批量写入）
+- geocoder.py: 离线 GPS 反查（内置地点数据集 + 最近邻索引）
+- geocode_cache.py: GPS 反查持久化缓存（geohash 分桶 + TTL）
 - text_analyzer.py: 文本分析器
 - time_analyzer.py: 时间分析器
 - visualizer.py: 可视化器
@@ -15,6 +18,9 @@ Phase 4: 数据分析 + 可视化
 """
 
 from .exif_analyzer import ExifAnalyzer
+from .exif_engine import ExifExtractionEngine, ExifBatchWriter
+from .geocoder import OfflineGeocoder
+from .geocode_cache import GeocodeCache
 from .text_analyzer import TextAnalyzer
 from .time_analyzer import TimeAnalyzer
 from .visualizer import Visualizer
@@ -22,6 +28,10 @@ from .report_generator import ReportGenerator
 
 __all__ = [
     'ExifAnalyzer',
+    'ExifExtractionEngine',
+    'ExifBatchWriter',
+    'OfflineGeocoder',
+    'GeocodeCache',
     'TextAnalyzer',
     'TimeAnalyzer',
     'Visualizer',
@@ -3,7 +3,7 @@ EXIF 分析器模块
 
 功能：
 1. 提取图片 EXIF 元数据
-2. GPS 坐标反查地理位置
+2. GPS 坐标反查地理位置（默认 Nominatim 在线查询，可选离线数据集）
 3. 统计相机使用情况
 4. 分析拍摄参数分布
 
@@ -17,26 +17,42 @@ EXIF 分析器模块
 
 from typing import Dict, Optional, Tuple, List
 from pathlib import Path
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from PIL.ExifTags import TAGS
 import logging
 import time
 
+from .exif_engine import load_exif
+from .geocode_cache import GeocodeCache, MISS
+
 logger = logging.getLogger(__name__)
 
 
 class ExifAnalyzer:
     """EXIF 数据分析器"""
 
-    def __init__(self, db_connection=None):
+    def __init__(
+        self,
+        db_connection=None,
+        geocode_mode: str = 'online',
+        geocode_dataset: Optional[str] = None,
+        geocode_cache=None
+    ):
         """
         初始化 EXIF 分析器
 
         Args:
             db_connection: 数据库连接（可选）
+            geocode_mode: GPS 反查方式，'online'（Nominatim）或 'offline'（内置数据集，仅城市级）
+            geocode_dataset: 离线地点数据集路径（默认内置 places.csv）
+            geocode_cache: 在线反查的持久化缓存 GeocodeCache
+                （None 为默认缓存 python/data/geocode_cache.db，False 为不使用）
         """
         self.db = db_connection
+        self.geocode_mode = geocode_mode
+        self.geocode_dataset = geocode_dataset
         self.geolocator = None  # 延迟初始化
+        self.offline_geocoder = None  # 延迟初始化
+        self.geocode_cache = geocode_cache  # 延迟初始化
 
         # GPS 反查缓存（避免重复查询）
         self._location_cache: Dict[Tuple[float, float], str] = {}
@@ -54,6 +70,22 @@ class ExifAnalyzer:
                 logger.warning("geopy 未安装，GPS 反查功能不可用")
                 self.geolocator = False
 
+    def _init_offline_geocoder(self):
+        """延迟初始化离线反查器"""
+        if self.offline_geocoder is None:
+            try:
+                from .geocoder import OfflineGeocoder
+                self.offline_geocoder = OfflineGeocoder(self.geocode_dataset)
+            except Exception as e:
+                logger.warning(f"离线地点数据集加载失败，GPS 反查功能不可用: {e}")
+                self.offline_geocoder = False
+
+    def _get_geocode_cache(self):
+        """获取持久化反查缓存（未指定时使用默认缓存）"""
+        if self.geocode_cache is None:
+            self.geocode_cache = GeocodeCache()
+        return self.geocode_cache or None
+
     def extract_exif(self, image_path: str) -> Dict[str, any]:
         """
         提取图片 EXIF 元数据
@@ -83,8 +115,8 @@ class ExifAnalyzer:
             raise FileNotFoundError(f"图片文件不存在: {image_path}")
 
         try:
-            img = Image.open(image_path)
-            exif_data = img.getexif()
+            # JPEG 只读取 APP1 段，不解码图片
+            exif_data = load_exif(image_path)
 
             if not exif_data:
                 logger.debug(f"图片无 EXIF 数据: {image_path}")
@@ -258,18 +290,30 @@ class ExifAnalyzer:
 
         示例：
             >>> analyzer.reverse_geocode(39.9042, 116.4074)
-            '北京市朝阳区'
+            '北京市'
         """
-        self._init_geolocator()
-
-        if self.geolocator is False:
-            return None
-
         # 检查缓存
         cache_key = (round(latitude, 4), round(longitude, 4))
         if cache_key in self._location_cache:
             return self._location_cache[cache_key]
 
+        if self.geocode_mode == 'offline':
+            return self.reverse_geocode_many([(latitude, longitude)])[0]
+
+        # 持久化缓存（跨运行共享，按 geohash 分桶）
+        geocode_cache = self._get_geocode_cache()
+        if geocode_cache is not None:
+            cached = geocode_cache.get('online', latitude, longitude)
+            if cached is not MISS:
+                if cached:
+                    self._location_cache[cache_key] = cached
+                return cached
+
+        self._init_geolocator()
+
+        if self.geolocator is False:
+            return None
+
         try:
             from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
@@ -279,11 +323,16 @@ class ExifAnalyzer:
                 timeout=10
             )
 
+            address = None
             if location and location.address:
                 # 提取简化地址（城市 + 区）
                 address = self._simplify_address(location.address)
                 self._location_cache[cache_key] = address
-                return address
+
+            # 无地址的位置（如海上）同样缓存，避免重复请求
+            if geocode_cache is not None:
+                geocode_cache.put('online', latitude, longitude, address)
+            return address
 
         except GeocoderTimedOut:
             logger.warning(f"GPS 反查超时: ({latitude}, {longitude})")
@@ -294,6 +343,35 @@ class ExifAnalyzer:
 
         return None
 
+    def reverse_geocode_many(
+        self,
+        coordinates: List[Tuple[float, float]]
+    ) -> List[Optional[str]]:
+        """
+        批量 GPS 反查（离线模式下一次向量化查询）
+
+        Args:
+            coordinates: [(纬度, 经度), ...]
+
+        Returns:
+            list: 与输入一一对应的地理位置（失败为 None）
+        """
+        if self.geocode_mode != 'offline':
+            return [self.reverse_geocode(lat, lng) for lat, lng in coordinates]
+
+        self._init_offline_geocoder()
+        if self.offline_geocoder is False or not coordinates:
+            return [None] * len(coordinates)
+
+        addresses = self.offline_geocoder.lookup_many(
+            [lat for lat, _ in coordinates],
+            [lng for _, lng in coordinates]
+        )
+        for (lat, lng), address in zip(coordinates, addresses):
+            if address:
+                self._location_cache[(round(lat, 4), round(lng, 4))] = address
+        return addresses
+
     def _simplify_address(self, full_address: str) -> str:
         """
         简化地址（提取城市 + 区）
@@ -329,9 +407,10 @@ class ExifAnalyzer:
         if not self.db:
             raise ValueError("需要数据库连接")
 
-        conn = self.db.get_connection()
+        conn = self.db.get_read_connection()
         cursor = conn.execute("""
-            SELECT * FROM v_camera_stats
+            SELECT * FROM mv_camera_stats
+            ORDER BY photo_count DESC
             LIMIT 10
         """)
 
@@ -392,6 +471,11 @@ class ExifAnalyzer:
                 else:
                     failed += 1
 
+        # EXIF 变化的相机由触发器入队，写完后一次性刷新统计物化表
+        if self.db:
+            from ..database.camera_stats import refresh_dirty_camera_stats
+            refresh_dirty_camera_stats(self.db)
+
         return {
             'total': total,
             'success': success,
@@ -413,6 +497,7 @@ class ExifAnalyzer:
                     )
                     if location:
                         exif_data['location'] = location
+                        exif_data['location_source'] = self.geocode_mode
 
                 # 更新数据库
                 if self.db:
@@ -430,8 +515,6 @@ class ExifAnalyzer:
         if not self.db:
             return
 
-        conn = self.db.get_connection()
-
         # 构建 UPDATE 语句
         fields = []
         values = []
@@ -446,7 +529,8 @@ class ExifAnalyzer:
             'focal_length': 'exif_focal_length',
             'gps_lat': 'exif_gps_lat',
             'gps_lng': 'exif_gps_lng',
-            'location': 'exif_location'
+            'location': 'exif_location',
+            'location_source': 'exif_location_source'
         }
 
         for key, db_field in field_mapping.items():
@@ -457,5 +541,5 @@ class ExifAnalyzer:
         if fields:
             values.append(media_id)
             sql = f"UPDATE media SET {', '.join(fields)} WHERE id = ?"
-            conn.execute(sql, values)
-            conn.commit()
+            with self.db.transaction() as conn:
+                conn.execute(sql, values)
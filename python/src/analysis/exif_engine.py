@@ -0,0 +1,244 @@
+"""
+EXIF 并行提取引擎
+
+功能：
+1. 只读取 JPEG 的 APP1（EXIF）段，不解码图片像素
+2. 进程池并行提取（可配置 worker 数）
+3. 单一写入者批量提交 EXIF 更新
+
+使用示例：
+    engine = ExifExtractionEngine(workers=4)
+    writer = ExifBatchWriter(db, batch_size=500)
+    for media_id, exif_data in engine.extract_many(items):
+        writer.add(media_id, exif_data)
+    writer.flush()
+    engine.close()
+"""
+
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+# EXIF 字段 → media 表列名
+EXIF_COLUMN_MAPPING = {
+    'make': 'exif_make',
+    'model': 'exif_model',
+    'datetime': 'exif_datetime',
+    'iso': 'exif_iso',
+    'aperture': 'exif_aperture',
+    'shutter_speed': 'exif_shutter_speed',
+    'focal_length': 'exif_focal_length',
+    'gps_lat': 'exif_gps_lat',
+    'gps_lng': 'exif_gps_lng',
+    'location': 'exif_location',
+    'location_source': 'exif_location_source'
+}
+
+# 少于该数量时直接在当前进程提取（进程间通信开销大于收益）
+MIN_PARALLEL_ITEMS = 8
+
+
+def read_app1_exif(image_path: str) -> Optional[bytes]:
+    """
+    从 JPEG 文件中只读取 APP1 EXIF 段
+
+    按段标记顺序跳读，遇到 SOS（图像数据开始）即停止，不读取像素数据。
+
+    Args:
+        image_path: 图片路径
+
+    Returns:
+        bytes: EXIF 数据（TIFF 头开始），无 EXIF 时返回 b''
+        None: 不是 JPEG 文件（调用方应回退到 Pillow）
+    """
+    with open(image_path, 'rb') as f:
+        if f.read(2) != b'\xFF\xD8':
+            return None
+
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return b''
+            if byte != b'\xFF':
+                return b''
+
+            # 跳过填充字节 0xFF
+            marker = f.read(1)
+            while marker == b'\xFF':
+                marker = f.read(1)
+            if not marker:
+                return b''
+
+            code = marker[0]
+            if code in (0xD9, 0xDA):
+                # EOI / SOS：之后是图像数据，EXIF 不会再出现
+                return b''
+            if 0xD0 <= code <= 0xD7 or code == 0x01:
+                # 无长度字段的标记
+                continue
+
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return b''
+            length = int.from_bytes(length_bytes, 'big') - 2
+
+            if code == 0xE1:
+                data = f.read(length)
+                if data.startswith(b'Exif\x00\x00'):
+                    return data[6:]
+            else:
+                f.seek(length, os.SEEK_CUR)
+
+
+def load_exif(image_path: str) -> Image.Exif:
+    """
+    读取图片 EXIF（JPEG 走 APP1 快速路径，其他格式回退到 Pillow）
+
+    Args:
+        image_path: 图片路径
+
+    Returns:
+        Image.Exif 对象（无 EXIF 时为空）
+    """
+    block = read_app1_exif(image_path)
+    if block is None:
+        with Image.open(image_path) as img:
+            return img.getexif()
+
+    exif = Image.Exif()
+    if block:
+        exif.load(block)
+    return exif
+
+
+# -----------------------------------------------------------------------------
+# 进程池 worker
+# -----------------------------------------------------------------------------
+
+_worker_analyzer = None
+
+
+def _extract_worker(item: Tuple[Any, str]) -> Tuple[Any, Dict]:
+    """worker 进程：提取单张图片的 EXIF（模块级函数，可被 pickle）"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from .exif_analyzer import ExifAnalyzer
+        _worker_analyzer = ExifAnalyzer()
+
+    key, image_path = item
+    try:
+        return key, _worker_analyzer.extract_exif(image_path)
+    except Exception as e:
+        logger.debug(f"提取 EXIF 失败: {image_path} - {e}")
+        return key, {}
+
+
+class ExifExtractionEngine:
+    """EXIF 并行提取引擎（进程池）"""
+
+    def __init__(self, workers: Optional[int] = None, chunksize: int = 32):
+        """
+        初始化提取引擎
+
+        Args:
+            workers: worker 进程数（默认 CPU 核数 - 1，<= 1 时在当前进程提取）
+            chunksize: 每次分发给 worker 的任务数
+        """
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) - 1)
+        self.workers = workers
+        self.chunksize = chunksize
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def extract_many(
+        self,
+        items: Iterable[Tuple[Any, str]]
+    ) -> Iterator[Tuple[Any, Dict]]:
+        """
+        批量提取 EXIF（按输入顺序返回结果）
+
+        Args:
+            items: (key, 图片路径) 迭代器，key 通常为 media id
+
+        Yields:
+            (key, exif_data)，无 EXIF 或失败时 exif_data 为 {}
+        """
+        items = list(items)
+        if self.workers <= 1 or len(items) < MIN_PARALLEL_ITEMS:
+            for item in items:
+                yield _extract_worker(item)
+            return
+
+        if self._executor is None:
+            # spawn：调用方（archiver）是多线程进程，fork 可能让子进程继承被占用的锁而死锁
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        yield from self._executor.map(_extract_worker, items, chunksize=self.chunksize)
+
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ExifBatchWriter:
+    """EXIF 批量写入器（单一写入者，攒够一批再提交）"""
+
+    def __init__(self, db, batch_size: int = 500):
+        """
+        初始化写入器
+
+        Args:
+            db: DatabaseConnection
+            batch_size: 每批提交的记录数
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.written = 0
+        self._pending: List[Tuple] = []
+
+    def add(self, media_id: int, exif_data: Dict):
+        """
+        添加一条 EXIF 更新（缺失字段写入 NULL）
+
+        Args:
+            media_id: Media ID
+            exif_data: extract_exif 返回的字典（可含 location）
+        """
+        self._pending.append(
+            tuple(exif_data.get(key) for key in EXIF_COLUMN_MAPPING) + (media_id,)
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """提交所有待写入的更新"""
+        if not self._pending:
+            return
+
+        assignments = ', '.join(f"{column} = ?" for column in EXIF_COLUMN_MAPPING.values())
+        with self.db.transaction() as conn:
+            conn.executemany(
+                f"UPDATE media SET {assignments} WHERE id = ?",
+                self._pending
+            )
+
+        self.written += len(self._pending)
+        self._pending = []
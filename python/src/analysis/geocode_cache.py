@@ -0,0 +1,242 @@
+"""
+GPS 反查持久化缓存
+
+功能：
+1. 按 geohash 前缀分桶缓存反查结果（SQLite，跨进程 / 跨运行共享）
+2. 可配置精度（geohash 位数）和过期时间（TTL）
+3. 从 media 表已有的 exif_gps_lat / exif_gps_lng / exif_location 批量预热
+
+geohash 精度参考（单元格大小）：
+    5 位 ≈ 4.9km × 4.9km
+    6 位 ≈ 1.2km × 0.6km
+    7 位 ≈ 153m × 153m（默认）
+
+默认位置: python/data/geocode_cache.db
+"""
+
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# 缓存未命中标记（区别于"已查询但无结果"的 None）
+MISS = object()
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 7) -> str:
+    """
+    计算 geohash
+
+    Args:
+        latitude: 纬度
+        longitude: 经度
+        precision: geohash 位数
+
+    Returns:
+        str: geohash 字符串
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            rng, value = lng_range, longitude
+        else:
+            rng, value = lat_range, latitude
+
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+class GeocodeCache:
+    """GPS 反查持久化缓存（geohash 前缀 -> 地址）"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        precision: int = 7,
+        ttl_days: Optional[float] = 90
+    ):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 文件（默认 python/data/geocode_cache.db）
+            precision: geohash 位数（越小命中率越高、地址越粗）
+            ttl_days: 过期天数（None 或 0 为永不过期）
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            db_path = project_root / 'data' / 'geocode_cache.db'
+
+        self.db_path = Path(db_path)
+        self.precision = precision
+        self.ttl_days = ttl_days
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'GeocodeCache':
+        """按配置创建（archiver 和 migrate_exif 共用，保证使用同一个缓存）"""
+        advanced = config.get('advanced', {})
+        cache_path = advanced.get('geocode_cache_path')
+        return cls(
+            Path(cache_path) if cache_path else None,
+            precision=advanced.get('geocode_cache_precision', 7),
+            ttl_days=advanced.get('geocode_cache_ttl_days', 90)
+        )
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取连接（首次使用时创建数据库，避免构造时产生文件）"""
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                provider TEXT NOT NULL,
+                geohash TEXT NOT NULL,
+                location TEXT,
+                updated_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (provider, geohash)
+            )
+        """)
+        self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        """关闭数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def key(self, latitude: float, longitude: float) -> str:
+        """坐标 → 缓存键（geohash 前缀）"""
+        return geohash_encode(latitude, longitude, self.precision)
+
+    def _cutoff(self) -> Optional[str]:
+        if not self.ttl_days:
+            return None
+        return (datetime.now() - timedelta(days=self.ttl_days)).isoformat()
+
+    def get(self, provider: str, latitude: float, longitude: float):
+        """
+        查询缓存
+
+        Args:
+            provider: 反查来源（如 'online'）
+            latitude: 纬度
+            longitude: 经度
+
+        Returns:
+            地址字符串；已查询但无结果时为 None；未命中或已过期时为 MISS
+        """
+        row = self._get_conn().execute(
+            "SELECT location, updated_at FROM geocode_cache WHERE provider = ? AND geohash = ?",
+            (provider, self.key(latitude, longitude))
+        ).fetchone()
+        if row is None:
+            return MISS
+
+        cutoff = self._cutoff()
+        if cutoff and row[1] < cutoff:
+            return MISS
+        return row[0]
+
+    def put(
+        self,
+        provider: str,
+        latitude: float,
+        longitude: float,
+        location: Optional[str]
+    ) -> None:
+        """保存（覆盖）反查结果，location 为 None 表示该位置无地址"""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO geocode_cache (provider, geohash, location, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (provider, self.key(latitude, longitude), location, datetime.now().isoformat())
+        )
+        conn.commit()
+
+    def warm_up(
+        self,
+        rows: Iterable[Tuple[float, float, str]],
+        provider: str
+    ) -> int:
+        """
+        批量预热（不覆盖已有记录）
+
+        Args:
+            rows: (纬度, 经度, 地址) 迭代器
+            provider: 反查来源
+
+        Returns:
+            int: 新增的缓存记录数
+        """
+        now = datetime.now().isoformat()
+        entries: Dict[str, str] = {}
+        for lat, lng, location in rows:
+            if lat is None or lng is None or not location:
+                continue
+            entries.setdefault(self.key(lat, lng), location)
+
+        conn = self._get_conn()
+        before = conn.total_changes
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO geocode_cache (provider, geohash, location, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                ((provider, geohash, location, now) for geohash, location in entries.items())
+            )
+        return conn.total_changes - before
+
+    def warm_up_from_media(self, db, provider: str) -> int:
+        """
+        从 media 表已有的 GPS 坐标和地址预热
+
+        只使用 exif_location_source 与 provider 相同的记录：离线数据集得到的
+        城市级地址不能冒充在线反查结果（来源未知的旧记录同样跳过）。
+
+        Args:
+            db: DatabaseConnection
+            provider: 反查来源
+
+        Returns:
+            int: 新增的缓存记录数
+        """
+        cursor = db.get_read_connection().execute("""
+            SELECT exif_gps_lat, exif_gps_lng, exif_location
+            FROM media
+            WHERE exif_gps_lat IS NOT NULL
+              AND exif_gps_lng IS NOT NULL
+              AND exif_location IS NOT NULL
+              AND exif_location_source = ?
+        """, (provider,))
+        added = self.warm_up(cursor, provider)
+        logger.info(f"GPS 反查缓存预热完成: 新增 {added} 条")
+        return added
@@ -0,0 +1,186 @@
+"""
+离线 GPS 反查模块
+
+功能：
+1. 从内置地点数据集（data/places.csv）构建最近邻索引
+2. 单点 / 批量（NumPy 向量化）反查，无网络请求
+3. 支持自定义数据集（同格式 CSV，如由 GeoNames cities1000 转换）
+
+数据集格式（UTF-8 CSV，含表头）：
+    name,admin1,country,lat,lng
+    深圳市,广东省,中国,22.5431,114.0579
+
+索引：坐标转换为单位球面三维向量，最近邻即点积最大的地点。
+安装了 scipy 时使用 cKDTree，否则使用 NumPy 分块点积。
+
+精度说明：内置数据集只有约 235 个主要城市，结果是 max_distance_km（150km）内
+最近的城市名（"省 + 市"），而在线 Nominatim 返回区县级地址且格式不同。
+因此离线模式需在配置中显式开启（geocode_mode: offline）；需要更细粒度时
+请用 geocode_dataset 指定 GeoNames cities1000 等完整数据集。
+"""
+
+import csv
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+logger = logging.getLogger(__name__)
+
+
+# 内置数据集
+DEFAULT_DATASET = Path(__file__).parent / 'data' / 'places.csv'
+
+# 地球平均半径（公里）
+EARTH_RADIUS_KM = 6371.0
+
+# 批量查询时每块的查询点数（控制点积矩阵内存）
+QUERY_CHUNK_SIZE = 1024
+
+
+def _to_unit_vectors(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """经纬度（度）→ 单位球面三维向量"""
+    lat_rad = np.radians(lats)
+    lng_rad = np.radians(lngs)
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((
+        cos_lat * np.cos(lng_rad),
+        cos_lat * np.sin(lng_rad),
+        np.sin(lat_rad)
+    ))
+
+
+class OfflineGeocoder:
+    """离线反查地理位置（最近地点）"""
+
+    def __init__(
+        self,
+        dataset_path: Optional[Path] = None,
+        max_distance_km: float = 150.0
+    ):
+        """
+        初始化离线反查器
+
+        Args:
+            dataset_path: 地点数据集 CSV（默认使用内置数据集）
+            max_distance_km: 最近地点超过该距离时返回 None（如海上坐标）
+        """
+        self.dataset_path = Path(dataset_path) if dataset_path else DEFAULT_DATASET
+        self.max_distance_km = max_distance_km
+
+        self.labels: List[str] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._tree = None
+
+        self._load()
+
+    def _load(self):
+        """加载数据集并构建索引"""
+        lats = []
+        lngs = []
+
+        with open(self.dataset_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    lats.append(float(row['lat']))
+                    lngs.append(float(row['lng']))
+                except (KeyError, ValueError):
+                    continue
+                self.labels.append(self._format_label(row))
+
+        if not self.labels:
+            raise ValueError(f"地点数据集为空: {self.dataset_path}")
+
+        self._vectors = _to_unit_vectors(np.array(lats), np.array(lngs))
+        if HAS_SCIPY:
+            self._tree = cKDTree(self._vectors)
+
+        logger.debug(f"离线地点索引已加载: {len(self.labels)} 个地点")
+
+    @staticmethod
+    def _format_label(row: dict) -> str:
+        """
+        生成地址文本
+
+        中国地点：省份 + 城市（直辖市只显示城市），例如 "广东省深圳市"
+        其他国家：国家 + 城市，例如 "日本东京"
+        """
+        name = (row.get('name') or '').strip()
+        admin1 = (row.get('admin1') or '').strip()
+        country = (row.get('country') or '').strip()
+
+        if country == '中国':
+            return name if admin1 in ('', name) else f"{admin1}{name}"
+        return f"{country}{name}"
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        单点反查
+
+        Args:
+            latitude: 纬度
+            longitude: 经度
+
+        Returns:
+            str: 最近地点地址，超出 max_distance_km 时返回 None
+        """
+        return self.lookup_many([latitude], [longitude])[0]
+
+    def lookup_many(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float]
+    ) -> List[Optional[str]]:
+        """
+        批量反查（向量化）
+
+        Args:
+            latitudes: 纬度列表
+            longitudes: 经度列表
+
+        Returns:
+            list: 与输入一一对应的地址（超出距离阈值为 None）
+        """
+        if len(latitudes) == 0:
+            return []
+
+        queries = _to_unit_vectors(
+            np.asarray(latitudes, dtype=float),
+            np.asarray(longitudes, dtype=float)
+        )
+        indices, chord = self._nearest(queries)
+
+        # 弦长 → 大圆距离
+        distances_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+        return [
+            self.labels[idx] if dist <= self.max_distance_km else None
+            for idx, dist in zip(indices.tolist(), distances_km.tolist())
+        ]
+
+    def _nearest(self, queries: np.ndarray):
+        """最近邻查询，返回 (地点索引, 弦长)"""
+        if self._tree is not None:
+            chord, indices = self._tree.query(queries)
+            return np.asarray(indices), np.asarray(chord)
+
+        indices = np.empty(len(queries), dtype=np.int64)
+        best_dot = np.empty(len(queries))
+        for start in range(0, len(queries), QUERY_CHUNK_SIZE):
+            chunk = queries[start:start + QUERY_CHUNK_SIZE]
+            dots = chunk @ self._vectors.T
+            idx = np.argmax(dots, axis=1)
+            indices[start:start + len(chunk)] = idx
+            best_dot[start:start + len(chunk)] = dots[np.arange(len(chunk)), idx]
+
+        # 单位向量：|a - b|^2 = 2 - 2 a·b
+        chord = np.sqrt(np.clip(2 - 2 * best_dot, 0, None))
+        return indices, chord
+
@@ -175,7 +175,7 @@ class TimeAnalyzer:
 
         try:
             # 查询数据
-            conn = self.db_connection.get_connection()
+            conn = self.db_connection.get_read_connection()
 
             if author_name:
                 query = """
@@ -282,7 +282,7 @@ class TimeAnalyzer:
             return {}
 
         try:
-            conn = self.db_connection.get_connection()
+            conn = self.db_connection.get_read_connection()
 
             # 构建查询
             if author_name:
@@ -27,6 +27,7 @@ class ConfigManager:
             'archive_path': './论坛存档',
             'analysis_path': './分析报告',
             'database_path': './python/data/forum_data.db',
+            'database_profile': 'default',
             'download': {
                 'images': True,
                 'videos': True,
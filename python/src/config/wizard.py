@@ -116,6 +116,7 @@ class ConfigWizard:
             'archive_path': archive_path,
             'analysis_path': './分析报告',
             'database_path': './python/data/forum_data.db',
+            'database_profile': 'default',
             'download': {
                 'images': download_images,
                 'videos': download_videos,
@@ -6,6 +6,7 @@
 3. 数据持久化到JSON文件
 """
 import json
+import re
 import hashlib
 from pathlib import Path
 from typing import List, Dict, Set, Optional
@@ -35,6 +36,23 @@ def generate_url_hash(url: str) -> str:
     return hash_obj.hexdigest()[:8]
 
 
+def extract_thread_id(url: str) -> Optional[int]:
+    """从帖子URL中提取主题ID（论坛按发帖顺序递增）
+
+    Args:
+        url: 帖子URL
+
+    Returns:
+        主题ID，无法识别时返回None
+
+    Example:
+        >>> extract_thread_id("https://t66y.com/htm_data/2602/7/7139669.html")
+        7139669
+    """
+    match = re.search(r'(?:/|tid=)(\d+)(?:\.html?)?(?:[?#&]|$)', url)
+    return int(match.group(1)) if match else None
+
+
 class PostTracker:
     """帖子URL追踪器
 
@@ -45,10 +63,14 @@ class PostTracker:
             "作者名": {
                 "hashes": ["hash1", "hash2", ...],
                 "last_check": "2026-02-13 18:30:00",
-                "total_count": 80
+                "total_count": 80,
+                "high_water": 7139669
             }
         }
 
+    high_water 为已归档帖子中最大的主题ID，增量检测时列表页中不超过它的
+    帖子视为旧帖，用于决定何时停止翻页。
+
     存储位置：
         python/data/archived_posts.json
     """
@@ -129,6 +151,7 @@ class PostTracker:
             self.data[author_name]['hashes'].append(hash_value)
             self.data[author_name]['total_count'] = len(self.data[author_name]['hashes'])
 
+        self._update_high_water(author_name, [url])
         self._save()
 
     def add_archived_posts_batch(self, author_name: str, urls: List[str]):
@@ -157,8 +180,31 @@ class PostTracker:
         self.data[author_name]['hashes'].extend(new_hashes)
         self.data[author_name]['total_count'] = len(self.data[author_name]['hashes'])
 
+        self._update_high_water(author_name, urls)
         self._save()
 
+    def get_high_water(self, author_name: str) -> Optional[int]:
+        """获取作者已归档帖子中最大的主题ID
+
+        Args:
+            author_name: 作者名
+
+        Returns:
+            主题ID，没有记录时返回None
+        """
+        return self.data.get(author_name, {}).get('high_water')
+
+    def _update_high_water(self, author_name: str, urls: List[str]):
+        """用已归档的URL推进高水位（不保存）"""
+        thread_ids = [tid for tid in map(extract_thread_id, urls) if tid is not None]
+        if not thread_ids:
+            return
+
+        current = self.data[author_name].get('high_water')
+        newest = max(thread_ids)
+        if current is None or newest > current:
+            self.data[author_name]['high_water'] = newest
+
     def check_new_posts(self, author_name: str, forum_urls: List[str]) -> Dict:
         """检测新帖子
 
@@ -10,6 +10,8 @@ Phase 3: 数据库 + 基础统计
 - query.py: 查询辅助函数
 - sync.py: 数据同步工具
 - integrity.py: 数据完整性检查
+- camera_stats.py: 相机统计物化表（触发器增量维护）
+- search_index.py: 帖子全文索引（FTS5 + jieba 预分词）
 """
 
 # 核心模块
@@ -37,6 +39,7 @@ from .query import (
 # 同步工具
 from .sync import (
     sync_archived_post,
+    sync_archived_posts,
     sync_delete_author,
     sync_config_to_db,
     sync_all_from_filesystem,
@@ -45,6 +48,19 @@ from .sync import (
     enable_database
 )
 
+# 相机统计物化表
+from .camera_stats import (
+    ensure_camera_stats,
+    refresh_dirty_camera_stats,
+    rebuild_camera_stats
+)
+
+# 全文索引
+from .search_index import (
+    ensure_search_index,
+    rebuild_search_index
+)
+
 # 完整性检查
 from .integrity import (
     check_all,
@@ -79,6 +95,7 @@ __all__ = [
 
     # 同步
     'sync_archived_post',
+    'sync_archived_posts',
     'sync_delete_author',
     'sync_config_to_db',
     'sync_all_from_filesystem',
@@ -86,6 +103,15 @@ __all__ = [
     'is_database_enabled',
     'enable_database',
 
+    # 相机统计
+    'ensure_camera_stats',
+    'refresh_dirty_camera_stats',
+    'rebuild_camera_stats',
+
+    # 全文索引
+    'ensure_search_index',
+    'rebuild_search_index',
+
     # 完整性
     'check_all',
     'fix_statistics',
@@ -0,0 +1,278 @@
+"""
+相机统计物化表维护
+
+功能：
+1. 创建物化表和触发器（schema_camera_stats.sql）
+2. 增量刷新：只重算 mv_camera_dirty 队列中的相机
+3. 完整重建：清空并从 media 表重新计算全部汇总行
+
+物化表与视图的对应关系：
+    mv_camera_stats        ← v_camera_stats
+    mv_camera_author_usage ← v_camera_author_usage
+    mv_camera_daily_usage  ← v_camera_daily_usage
+    mv_author_camera_summary ← v_author_camera_summary（按受影响作者重算）
+
+使用方法：
+    python -m src.database.camera_stats          # 完整重建
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from .connection import DatabaseConnection, execute_script, get_default_connection
+
+
+# 按相机汇总的物化表（按 mv_camera_dirty 队列重算）
+CAMERA_TABLES = (
+    'mv_camera_stats',
+    'mv_camera_author_usage',
+    'mv_camera_daily_usage',
+)
+
+MATERIALIZED_TABLES = CAMERA_TABLES + ('mv_author_camera_summary',)
+
+# 只重算队列中的相机
+_DIRTY_FILTER = "AND (m.exif_make, m.exif_model) IN (SELECT make, model FROM mv_camera_dirty)"
+
+# 队列中相机涉及的作者（重算前后各取一次，覆盖作者换相机、帖子换作者）
+_DIRTY_AUTHORS_SQL = """
+    SELECT DISTINCT author_id FROM mv_camera_author_usage
+    WHERE (make, model) IN (SELECT make, model FROM mv_camera_dirty)
+"""
+
+# 只重算指定作者（参数为作者 ID 的 JSON 数组）
+_AUTHOR_FILTER = "AND a.id IN (SELECT value FROM json_each(?))"
+
+# 作者相机汇总（与 schema_camera_usage.sql 中 v_author_camera_summary 的定义一致）
+_AUTHOR_SUMMARY_SQL = """
+    INSERT INTO mv_author_camera_summary (
+        author_id, author_name, camera_count, camera_list,
+        most_used_camera, total_photos, total_posts_with_exif
+    )
+    SELECT
+        a.id,
+        a.name,
+        COUNT(DISTINCT m.exif_make || '-' || m.exif_model),
+        GROUP_CONCAT(DISTINCT m.exif_make || ' ' || m.exif_model),
+        (
+            SELECT m2.exif_make || ' ' || m2.exif_model
+            FROM media m2
+            JOIN posts p2 ON m2.post_id = p2.id
+            WHERE p2.author_id = a.id
+              AND m2.type = 'image'
+              AND m2.exif_make IS NOT NULL
+              AND m2.exif_model IS NOT NULL
+            GROUP BY m2.exif_make, m2.exif_model
+            ORDER BY COUNT(*) DESC
+            LIMIT 1
+        ),
+        COUNT(DISTINCT m.id),
+        COUNT(DISTINCT p.id)
+    FROM authors a
+    LEFT JOIN posts p ON a.id = p.author_id
+    LEFT JOIN media m ON p.id = m.post_id AND m.type = 'image'
+    WHERE m.exif_make IS NOT NULL
+      AND m.exif_model IS NOT NULL
+      {filter}
+    GROUP BY a.id
+"""
+
+# 汇总 SQL（与 schema_v2.sql / schema_camera_usage.sql 中的视图定义一致）
+_REBUILD_SQL = (
+    """
+    INSERT INTO mv_camera_stats (
+        make, model, photo_count, post_count, first_use, last_use,
+        avg_iso, avg_aperture, avg_focal_length
+    )
+    SELECT
+        m.exif_make,
+        m.exif_model,
+        COUNT(*),
+        COUNT(DISTINCT m.post_id),
+        MIN(m.exif_datetime),
+        MAX(m.exif_datetime),
+        ROUND(AVG(m.exif_iso), 0),
+        ROUND(AVG(m.exif_aperture), 1),
+        ROUND(AVG(m.exif_focal_length), 0)
+    FROM media m
+    WHERE m.type = 'image'
+      AND m.exif_make IS NOT NULL
+      AND m.exif_model IS NOT NULL
+      {filter}
+    GROUP BY m.exif_make, m.exif_model
+    """,
+    """
+    INSERT INTO mv_camera_author_usage (
+        make, model, camera_full, author_id, author_name,
+        photo_count, post_count, first_use_date, last_use_date,
+        avg_iso, avg_aperture, avg_focal_length
+    )
+    SELECT
+        m.exif_make,
+        m.exif_model,
+        m.exif_make || ' ' || m.exif_model,
+        a.id,
+        a.name,
+        COUNT(DISTINCT m.id),
+        COUNT(DISTINCT p.id),
+        MIN(p.publish_date),
+        MAX(p.publish_date),
+        ROUND(AVG(m.exif_iso), 0),
+        ROUND(AVG(m.exif_aperture), 1),
+        ROUND(AVG(m.exif_focal_length), 0)
+    FROM media m
+    JOIN posts p ON m.post_id = p.id
+    JOIN authors a ON p.author_id = a.id
+    WHERE m.type = 'image'
+      AND m.exif_make IS NOT NULL
+      AND m.exif_model IS NOT NULL
+      {filter}
+    GROUP BY m.exif_make, m.exif_model, a.id
+    """,
+    """
+    INSERT INTO mv_camera_daily_usage (
+        make, model, camera_full, date, year, month,
+        photo_count, post_count, authors
+    )
+    SELECT
+        m.exif_make,
+        m.exif_model,
+        m.exif_make || ' ' || m.exif_model,
+        DATE(p.publish_date),
+        p.publish_year,
+        p.publish_month,
+        COUNT(DISTINCT m.id),
+        COUNT(DISTINCT p.id),
+        GROUP_CONCAT(DISTINCT a.name)
+    FROM media m
+    JOIN posts p ON m.post_id = p.id
+    JOIN authors a ON p.author_id = a.id
+    WHERE m.type = 'image'
+      AND m.exif_make IS NOT NULL
+      AND m.exif_model IS NOT NULL
+      {filter}
+    GROUP BY m.exif_make, m.exif_model, DATE(p.publish_date)
+    """,
+)
+
+
+def _missing_tables(conn) -> bool:
+    """是否有物化表或队列表尚未创建"""
+    names = MATERIALIZED_TABLES + ('mv_camera_dirty',)
+    count = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+        f"AND name IN ({', '.join('?' * len(names))})",
+        names
+    ).fetchone()[0]
+    return count < len(names)
+
+
+def ensure_camera_stats(db: DatabaseConnection) -> None:
+    """
+    创建物化表和触发器（有表缺失时完整重建）
+
+    逐条执行建表语句，不会提交调用方已打开的事务。
+
+    Args:
+        db: 数据库连接
+    """
+    schema_file = Path(__file__).parent / 'schema_camera_stats.sql'
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        script = f.read()
+
+    with db.transaction() as conn:
+        missing = _missing_tables(conn)
+        execute_script(conn, script)
+        if missing:
+            rebuild_camera_stats(db)
+
+
+def refresh_dirty_camera_stats(db: DatabaseConnection) -> int:
+    """
+    增量刷新：重算队列中相机的汇总行
+
+    物化表不存在时先创建（并完整重建）。
+
+    Args:
+        db: 数据库连接
+
+    Returns:
+        int: 重算的相机数量
+    """
+    conn = db.get_connection()
+    if _missing_tables(conn):
+        ensure_camera_stats(db)
+        return 0
+
+    dirty = conn.execute("SELECT COUNT(*) FROM mv_camera_dirty").fetchone()[0]
+    if not dirty:
+        return 0
+
+    with db.transaction() as conn:
+        authors = {row[0] for row in conn.execute(_DIRTY_AUTHORS_SQL)}
+        for table in CAMERA_TABLES:
+            conn.execute(
+                f"DELETE FROM {table} "
+                f"WHERE (make, model) IN (SELECT make, model FROM mv_camera_dirty)"
+            )
+        for sql in _REBUILD_SQL:
+            conn.execute(sql.format(filter=_DIRTY_FILTER))
+        authors.update(row[0] for row in conn.execute(_DIRTY_AUTHORS_SQL))
+
+        author_ids = json.dumps(sorted(authors))
+        conn.execute(
+            "DELETE FROM mv_author_camera_summary "
+            "WHERE author_id IN (SELECT value FROM json_each(?))",
+            (author_ids,)
+        )
+        conn.execute(_AUTHOR_SUMMARY_SQL.format(filter=_AUTHOR_FILTER), (author_ids,))
+        conn.execute("DELETE FROM mv_camera_dirty")
+
+    return dirty
+
+
+def rebuild_camera_stats(db: DatabaseConnection) -> None:
+    """
+    完整重建所有相机统计物化表
+
+    Args:
+        db: 数据库连接
+    """
+    with db.transaction() as conn:
+        for table in MATERIALIZED_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        for sql in _REBUILD_SQL:
+            conn.execute(sql.format(filter=''))
+        conn.execute(_AUTHOR_SUMMARY_SQL.format(filter=''))
+        conn.execute("DELETE FROM mv_camera_dirty")
+
+
+def main():
+    """主函数：完整重建相机统计"""
+    from rich.console import Console
+    console = Console()
+
+    db = get_default_connection()
+
+    console.print("[cyan]正在重建相机统计物化表...[/cyan]")
+    start_time = time.time()
+
+    try:
+        ensure_camera_stats(db)
+        rebuild_camera_stats(db)
+    except Exception as e:
+        console.print(f"[red]❌ 重建失败: {e}[/red]")
+        sys.exit(1)
+
+    conn = db.get_connection()
+    camera_count = conn.execute("SELECT COUNT(*) FROM mv_camera_stats").fetchone()[0]
+    console.print(
+        f"[green]✅ 重建完成: {camera_count} 个相机型号，"
+        f"耗时 {time.time() - start_time:.1f} 秒[/green]"
+    )
+
+
+if __name__ == '__main__':
+    main()
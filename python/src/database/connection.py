@@ -2,15 +2,95 @@
 数据库连接管理模块
 
 提供单例模式的数据库连接管理，负责：
-- 创建和管理 SQLite 数据库连接
+- 创建和管理 SQLite 数据库连接（读写分离）
 - 初始化数据库结构（执行 schema.sql）
 - 配置 SQLite 优化参数
+
+连接模型（WAL 模式下读写互不阻塞）：
+- 写连接：全进程唯一，get_connection() / transaction() 获取，
+  transaction() 持有写锁，多线程写入串行化
+- 读连接：每个线程一个只读连接，get_read_connection() 获取，
+  菜单查询、分析统计可以与归档任务并行执行
 """
 
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+
+# Phase 4 EXIF 扩展列（schema_v2.sql）
+MEDIA_EXIF_COLUMNS = (
+    ('exif_make', 'TEXT'),
+    ('exif_model', 'TEXT'),
+    ('exif_datetime', 'TEXT'),
+    ('exif_iso', 'INTEGER'),
+    ('exif_aperture', 'REAL'),
+    ('exif_shutter_speed', 'TEXT'),
+    ('exif_focal_length', 'REAL'),
+    ('exif_gps_lat', 'REAL'),
+    ('exif_gps_lng', 'REAL'),
+    ('exif_location', 'TEXT'),
+    ('exif_location_source', 'TEXT'),   # 地址来源：online / offline（反查缓存预热只信任同来源）
+)
+
+
+# 连接调优方案（每次建立连接时应用，cache_size / temp_store 等参数按连接生效）
+#   cache_size 为负数时单位是 KiB
+#   optimize_on_close: 关闭写连接前执行 PRAGMA optimize（更新查询规划统计）
+TUNING_PROFILES = {
+    # 默认：与 schema.sql 中的设置一致（约 40MB 缓存），加 256MB 内存映射
+    'default': {
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'cache_size': -40000,
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': 30000,
+        'wal_autocheckpoint': 1000,
+        'optimize_on_close': True,
+    },
+    # 低内存设备（树莓派等）
+    'low_memory': {
+        'synchronous': 'NORMAL',
+        'temp_store': 'FILE',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'busy_timeout': 30000,
+        'wal_autocheckpoint': 1000,
+        'optimize_on_close': False,
+    },
+    # 大库（百万级媒体记录）：更大缓存和内存映射，减少 checkpoint 次数
+    'large': {
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'cache_size': -200000,
+        'mmap_size': 1024 * 1024 * 1024,
+        'busy_timeout': 60000,
+        'wal_autocheckpoint': 10000,
+        'optimize_on_close': True,
+    },
+}
+
+
+def execute_script(conn: sqlite3.Connection, script: str) -> None:
+    """
+    逐条执行 SQL 脚本（不提交事务）
+
+    sqlite3 的 executescript() 会先提交当前事务，
+    在 transaction() 内执行建表脚本时使用本函数。
+
+    Args:
+        conn: 数据库连接
+        script: SQL 脚本
+    """
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ''
 
 
 class DatabaseConnection:
@@ -20,12 +100,19 @@ class DatabaseConnection:
     使用示例:
         db = DatabaseConnection.get_instance()
         db.initialize_database()
-        conn = db.get_connection()
+
+        # 写入（串行化，退出时提交，异常时回滚）
+        with db.transaction() as conn:
+            conn.execute("UPDATE ...")
+
+        # 只读查询（当前线程的只读连接）
+        rows = db.get_read_connection().execute("SELECT ...").fetchall()
     """
 
     _instance: Optional['DatabaseConnection'] = None
     _connection: Optional[sqlite3.Connection] = None
     _db_path: Optional[str] = None
+    _tuning_profile: str = 'default'
 
     def __new__(cls, db_path: Optional[str] = None):
         """
@@ -36,6 +123,10 @@ class DatabaseConnection:
         """
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._write_lock = threading.RLock()
+            cls._instance._local = threading.local()
+            cls._instance._readers = []
+            cls._instance._readers_lock = threading.Lock()
         return cls._instance
 
     def __init__(self, db_path: Optional[str] = None):
@@ -49,8 +140,10 @@ class DatabaseConnection:
         if self._db_path is not None and db_path is None:
             return
 
-        # 如果提供了新路径，更新路径
+        # 如果提供了新路径，关闭旧路径的连接并更新路径
         if db_path is not None:
+            if db_path != self._db_path:
+                self.close()
             self._db_path = db_path
 
     @classmethod
@@ -77,45 +170,143 @@ class DatabaseConnection:
 
     def get_connection(self) -> sqlite3.Connection:
         """
-        获取数据库连接（懒加载）
+        获取写连接（懒加载，全进程共享）
+
+        多线程写入请使用 transaction()，以持有写锁。
 
         Returns:
             sqlite3.Connection 对象
         """
         if self._connection is None:
-            if self._db_path is None:
-                raise ValueError("数据库路径未设置")
+            with self._write_lock:
+                if self._connection is None:
+                    if self._db_path is None:
+                        raise ValueError("数据库路径未设置")
+
+                    # 确保数据库目录存在
+                    db_dir = os.path.dirname(self._db_path)
+                    if db_dir and not os.path.exists(db_dir):
+                        os.makedirs(db_dir, exist_ok=True)
+
+                    # 创建连接（允许调度器等其他线程使用）
+                    connection = sqlite3.connect(
+                        self._db_path,
+                        timeout=self._busy_timeout_seconds(),
+                        check_same_thread=False
+                    )
+
+                    # 配置连接
+                    self._configure_connection(connection)
+                    connection.execute("PRAGMA journal_mode = WAL")
+                    self._connection = connection
+
+                    # 已有数据库：补齐后续版本新增的结构（新数据库由 initialize_database 创建）
+                    try:
+                        self._upgrade_schema(connection)
+                    except Exception:
+                        self._connection = None
+                        connection.close()
+                        raise
 
-            # 确保数据库目录存在
-            db_dir = os.path.dirname(self._db_path)
-            if db_dir and not os.path.exists(db_dir):
-                os.makedirs(db_dir, exist_ok=True)
+        return self._connection
 
-            # 创建连接
-            self._connection = sqlite3.connect(self._db_path)
+    def get_read_connection(self) -> sqlite3.Connection:
+        """
+        获取当前线程的只读连接（懒加载，每个线程一个）
 
-            # 配置连接
-            self._configure_connection()
+        WAL 模式下读连接不会被写事务阻塞，只能看到已提交的数据。
 
-        return self._connection
+        Returns:
+            sqlite3.Connection 对象
+        """
+        reader = getattr(self._local, 'reader', None)
+        if reader is not None:
+            return reader
+
+        # 写连接负责创建数据库文件并切换到 WAL 模式
+        self.get_connection()
+
+        uri = Path(os.path.abspath(self._db_path)).as_uri() + '?mode=ro'
+        reader = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self._busy_timeout_seconds(),
+            check_same_thread=False
+        )
+        self._configure_connection(reader)
+        reader.execute("PRAGMA query_only = ON")
+
+        self._local.reader = reader
+        with self._readers_lock:
+            self._readers.append(reader)
+        return reader
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        写事务（持有写锁，退出时提交，异常时回滚）
+
+        同一线程内可以嵌套，只有最外层提交。
+
+        使用示例:
+            with db.transaction() as conn:
+                conn.execute("INSERT ...")
+        """
+        with self._write_lock:
+            conn = self.get_connection()
+            depth = getattr(self._local, 'tx_depth', 0)
+            self._local.tx_depth = depth + 1
+            try:
+                if depth:
+                    yield conn
+                else:
+                    with conn:
+                        yield conn
+            finally:
+                self._local.tx_depth = depth
+
+    @classmethod
+    def set_tuning_profile(cls, profile: str):
+        """
+        设置连接调优方案（应在建立连接前调用，已有连接会被关闭并按新方案重建）
+
+        Args:
+            profile: TUNING_PROFILES 中的方案名
+        """
+        if profile not in TUNING_PROFILES:
+            raise ValueError(
+                f"未知的数据库调优方案: {profile}（可选: {', '.join(TUNING_PROFILES)}）"
+            )
+        if profile == cls._tuning_profile:
+            return
+
+        cls._tuning_profile = profile
+        if cls._instance is not None:
+            cls._instance.close()
+
+    def _busy_timeout_seconds(self) -> float:
+        return TUNING_PROFILES[self._tuning_profile]['busy_timeout'] / 1000
 
-    def _configure_connection(self):
+    def _configure_connection(self, connection: sqlite3.Connection):
         """
-        配置数据库连接参数
+        配置数据库连接参数（读写连接都会调用）
 
         配置项：
         - Row factory: 使查询结果可以通过列名访问
         - Foreign keys: 启用外键约束
-        - WAL mode: 写入优化（已在 schema.sql 中配置）
+        - 调优方案: synchronous、temp_store、cache_size、mmap_size、
+          busy_timeout、wal_autocheckpoint（均按连接生效）
         """
-        if self._connection is None:
-            return
-
         # 设置 row_factory，使查询结果可以通过列名访问
-        self._connection.row_factory = sqlite3.Row
+        connection.row_factory = sqlite3.Row
 
         # 启用外键约束
-        self._connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA foreign_keys = ON")
+
+        profile = TUNING_PROFILES[self._tuning_profile]
+        for pragma in ('synchronous', 'temp_store', 'cache_size', 'mmap_size',
+                       'busy_timeout', 'wal_autocheckpoint'):
+            connection.execute(f"PRAGMA {pragma} = {profile[pragma]}")
 
     def initialize_database(self) -> bool:
         """
@@ -141,7 +332,7 @@ class DatabaseConnection:
                 schema_sql = f.read()
 
             conn.executescript(schema_sql)
-            conn.commit()
+            self._upgrade_schema(conn)
 
             return True
 
@@ -149,6 +340,50 @@ class DatabaseConnection:
             print(f"数据库初始化失败: {e}")
             return False
 
+    def _upgrade_schema(self, conn: sqlite3.Connection):
+        """
+        升级已有数据库的结构（幂等，每次打开写连接和初始化时执行）
+
+        数据库尚未初始化（没有 authors 表）时跳过。
+
+        Args:
+            conn: 写连接
+        """
+        if not self._has_table(conn, 'authors'):
+            return
+
+        # schema.sql 中 media 表不含 EXIF 列（Phase 4 扩展），补齐后写入路径才可用
+        self._ensure_media_exif_columns(conn)
+        conn.commit()
+
+        # 相机统计物化表和增量维护触发器（缺表时完整重建）
+        from .camera_stats import ensure_camera_stats
+        ensure_camera_stats(self)
+
+        # 帖子全文索引（首次创建时为已有帖子建立索引）
+        from .search_index import ensure_search_index
+        ensure_search_index(self)
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def _ensure_media_exif_columns(self, conn: sqlite3.Connection):
+        """
+        补齐 media 表的 EXIF 列（与 schema_v2.sql 中的定义一致）
+
+        Args:
+            conn: 数据库连接
+        """
+        existing = {
+            row[1] for row in conn.execute("PRAGMA table_info(media)").fetchall()
+        }
+        for column, col_type in MEDIA_EXIF_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE media ADD COLUMN {column} {col_type}")
+
     def is_initialized(self) -> bool:
         """
         检查数据库是否已初始化
@@ -159,26 +394,37 @@ class DatabaseConnection:
             bool: 数据库是否已初始化
         """
         try:
-            conn = self.get_connection()
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='authors'"
-            )
-            result = cursor.fetchone()
-            return result is not None
+            return self._has_table(self.get_connection(), 'authors')
         except Exception:
             return False
 
     def close(self):
         """
-        关闭数据库连接
+        关闭数据库连接（写连接和所有线程的读连接）
+
+        持有写锁执行：其他线程正在进行的 transaction() 结束后才会关闭。
+        读连接不加锁，调用方必须先停止所有线程对本连接的使用（查询、归档任务等），
+        再调用 close()。
         """
-        if self._connection is not None:
-            try:
-                self._connection.close()
-            except Exception as e:
-                print(f"关闭数据库连接失败: {e}")
-            finally:
-                self._connection = None
+        with self._write_lock:
+            with self._readers_lock:
+                readers, self._readers = self._readers, []
+            self._local = threading.local()
+            for reader in readers:
+                try:
+                    reader.close()
+                except Exception as e:
+                    print(f"关闭数据库连接失败: {e}")
+
+            if self._connection is not None:
+                try:
+                    if TUNING_PROFILES[self._tuning_profile]['optimize_on_close']:
+                        self._connection.execute("PRAGMA optimize")
+                    self._connection.close()
+                except Exception as e:
+                    print(f"关闭数据库连接失败: {e}")
+                finally:
+                    self._connection = None
 
     def get_db_path(self) -> Optional[str]:
         """
@@ -225,6 +471,13 @@ class DatabaseConnection:
             )
             trigger_count = cursor.fetchone()[0]
 
+            # 当前生效的连接参数（写连接）
+            pragmas = {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ('journal_mode', 'synchronous', 'temp_store', 'cache_size',
+                             'mmap_size', 'busy_timeout', 'wal_autocheckpoint', 'foreign_keys')
+            }
+
             # 获取数据库文件大小
             db_size = 0
             if self._db_path and os.path.exists(self._db_path):
@@ -238,7 +491,9 @@ class DatabaseConnection:
                 'view_count': view_count,
                 'trigger_count': trigger_count,
                 'file_size_bytes': db_size,
-                'file_size_mb': round(db_size / (1024 * 1024), 2)
+                'file_size_mb': round(db_size / (1024 * 1024), 2),
+                'tuning_profile': self._tuning_profile,
+                'pragmas': pragmas
             }
         except Exception as e:
             return {
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from .connection import DatabaseConnection
 from .models import Author, Post, Media
+from ..utils.post_scanner import iter_post_dirs
 
 
 def _get_db() -> DatabaseConnection:
@@ -109,7 +110,8 @@ def check_all(
 
     if archive_dir.exists():
         for author_dir in archive_dir.iterdir():
-            if not author_dir.is_dir():
+            # 跳过文件和隐藏目录（如 .media_store 媒体库）
+            if not author_dir.is_dir() or author_dir.name.startswith('.'):
                 continue
 
             author_name = author_dir.name
@@ -124,31 +126,22 @@ def check_all(
                 })
                 continue
 
-            # 遍历帖子
-            for year_dir in author_dir.iterdir():
-                if not year_dir.is_dir():
-                    continue
-                for month_dir in year_dir.iterdir():
-                    if not month_dir.is_dir():
-                        continue
-                    for post_dir in month_dir.iterdir():
-                        if not post_dir.is_dir():
-                            continue
-
-                        # 检查帖子是否在数据库中
-                        post_url = f"file://{post_dir}"
-                        if not Post.exists(post_url):
-                            result['issues'].append({
-                                'type': 'post_missing_in_db',
-                                'path': str(post_dir),
-                                'author_name': author_name,
-                                'severity': 'medium'
-                            })
-
-                            if fix:
-                                # 可以选择导入这个帖子
-                                # 这里暂不实现自动导入，因为需要完整的元数据提取
-                                pass
+            # 遍历帖子（作者/年/月/帖子）
+            for post_dir in iter_post_dirs(author_dir):
+                # 检查帖子是否在数据库中
+                post_url = f"file://{post_dir}"
+                if not Post.exists(post_url):
+                    result['issues'].append({
+                        'type': 'post_missing_in_db',
+                        'path': post_dir,
+                        'author_name': author_name,
+                        'severity': 'medium'
+                    })
+
+                    if fix:
+                        # 可以选择导入这个帖子
+                        # 这里暂不实现自动导入，因为需要完整的元数据提取
+                        pass
 
     # 检查 3: 统计字段是否准确
     print("[3/4] 检查统计字段...")
@@ -278,41 +271,41 @@ def fix_statistics(db: Optional[DatabaseConnection] = None) -> int:
     # 设置模型使用的数据库
     Author._db = db
 
-    conn = db.get_connection()
     fixed_count = 0
 
     try:
-        # 获取所有作者
-        all_authors = Author.get_all()
-
-        for author in all_authors:
-            # 重新计算统计
-            cursor = conn.execute("""
-                SELECT
-                    COUNT(*) as post_count,
-                    COALESCE(SUM(image_count), 0) as image_count,
-                    COALESCE(SUM(video_count), 0) as video_count,
-                    COALESCE(SUM(file_size_bytes), 0) as total_size
-                FROM posts
-                WHERE author_id = ?
-            """, (author.id,))
-
-            row = cursor.fetchone()
-
-            # 更新作者统计
-            conn.execute("""
-                UPDATE authors SET
-                    total_posts = ?,
-                    total_images = ?,
-                    total_videos = ?,
-                    total_size_bytes = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (row[0], row[1], row[2], row[3], author.id))
-
-            fixed_count += 1
-
-        conn.commit()
+        # 所有作者的统计在一个写事务中更新
+        with db.transaction() as conn:
+            # 获取所有作者
+            all_authors = Author.get_all()
+
+            for author in all_authors:
+                # 重新计算统计
+                cursor = conn.execute("""
+                    SELECT
+                        COUNT(*) as post_count,
+                        COALESCE(SUM(image_count), 0) as image_count,
+                        COALESCE(SUM(video_count), 0) as video_count,
+                        COALESCE(SUM(file_size_bytes), 0) as total_size
+                    FROM posts
+                    WHERE author_id = ?
+                """, (author.id,))
+
+                row = cursor.fetchone()
+
+                # 更新作者统计
+                conn.execute("""
+                    UPDATE authors SET
+                        total_posts = ?,
+                        total_images = ?,
+                        total_videos = ?,
+                        total_size_bytes = ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (row[0], row[1], row[2], row[3], author.id))
+
+                fixed_count += 1
+
         print(f"✓ 修复了 {fixed_count} 个作者的统计字段")
 
     except Exception as e:
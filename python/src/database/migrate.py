@@ -7,13 +7,26 @@
 - extract_post_metadata(): 从帖子目录提取元数据
 - import_all_data(): 全量导入所有历史数据
 - import_author_data(): 导入单个作者的数据
+
+并行导入:
+    os.scandir 遍历目录 → 进程池解析元数据（HTML、媒体扫描、全文索引分词）
+    → 单一写入线程批量插入。每个作者导入完成后写入检查点，
+    中断后重新运行会跳过已完成的作者和已导入的帖子。
+
+增量同步:
+    post_manifest 记录每个帖子目录的 mtime / inode / content.html 大小和哈希。
+    再次导入时先 stat 比对，只解析新增或变化的目录。
 """
 
 import os
 import json
+import queue
 import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 import time
 
@@ -47,35 +60,92 @@ except ImportError:
         def __exit__(self, *args):
             self.close()
 
+from .camera_stats import refresh_dirty_camera_stats
 from .connection import DatabaseConnection
 from .models import Author, Post, Media
+from .search_index import has_search_index, prepare_document, write_document
+from ..utils.post_scanner import iter_post_dirs, scan_post_dir
+
+
+# 批量导入时每多少篇帖子提交一次事务
+IMPORT_BATCH_SIZE = 50
+
+# 少于该数量时直接在当前进程解析（进程间通信开销大于收益）
+MIN_PARALLEL_POSTS = 16
+
+# 每次分发给 worker 的帖子数
+PARSE_CHUNKSIZE = 8
+
+# 帖子目录清单表（增量同步：stat 未变化的目录不再解析）
+MANIFEST_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS post_manifest (
+    path TEXT PRIMARY KEY,                       -- 帖子目录
+    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+    mtime_ns INTEGER NOT NULL,                   -- 目录、content.html、photo/、video/ 的最大 mtime
+    inode INTEGER NOT NULL,                      -- 目录 inode（整个目录被替换时变化）
+    size INTEGER NOT NULL,                       -- content.html 大小
+    content_hash TEXT,                           -- content.html 的 MD5
+    scanned_at TEXT DEFAULT CURRENT_TIMESTAMP    -- 最后解析时间
+);
+CREATE INDEX IF NOT EXISTS idx_post_manifest_post ON post_manifest(post_id);
+"""
 
+# 清单中帖子的处理方式
+SCAN_NEW = 'new'            # 数据库中没有：完整解析并插入
+SCAN_CHANGED = 'changed'    # stat 变化：重新解析并更新
+SCAN_BASELINE = 'baseline'  # 已在数据库中但没有清单记录：只记录清单，不重新解析
+
+# 导入检查点表（记录本轮导入中已完成的作者，整轮完成后清除）
+CHECKPOINT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+    archive_path TEXT NOT NULL,                  -- 归档目录（绝对路径）
+    author_name TEXT NOT NULL,                   -- 已完成的作者
+    posts_added INTEGER DEFAULT 0,               -- 该作者新增帖子数
+    completed_at TEXT DEFAULT CURRENT_TIMESTAMP, -- 完成时间
+    PRIMARY KEY (archive_path, author_name)
+)
+"""
 
 # =============================================================================
 # 辅助函数
 # =============================================================================
 
-def _get_directory_size(path: Path) -> int:
+def _stat_post_dir(post_dir: str) -> Optional[Tuple[int, int, int]]:
     """
-    递归计算目录大小
+    帖子目录的 stat 签名（不读取文件内容）
 
-    Args:
-        path: 目录路径
+    目录自身的 mtime 不反映其中文件的原地修改，因此同时取 content.html、
+    photo/ 和 video/ 的 mtime。
 
     Returns:
-        总大小（字节）
+        (最大 mtime_ns, 目录 inode, content.html 大小)，目录不存在时返回 None
     """
-    total_size = 0
     try:
-        for entry in path.rglob('*'):
-            if entry.is_file():
-                try:
-                    total_size += entry.stat().st_size
-                except (OSError, PermissionError):
-                    pass
-    except Exception:
-        pass
-    return total_size
+        st = os.stat(post_dir)
+    except OSError:
+        return None
+
+    mtime_ns = st.st_mtime_ns
+    size = 0
+    for name in ('content.html', 'photo', 'video'):
+        try:
+            child = os.stat(os.path.join(post_dir, name))
+        except OSError:
+            continue
+        mtime_ns = max(mtime_ns, child.st_mtime_ns)
+        if name == 'content.html':
+            size = child.st_size
+
+    return mtime_ns, st.st_ino, size
+
+
+def _hash_file(path: str) -> Optional[str]:
+    """文件内容 MD5（不存在时返回 None）"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+    except OSError:
+        return None
 
 
 def _calculate_url_hash(url: str) -> str:
@@ -170,36 +240,6 @@ def _parse_html_metadata(html_path: Path) -> Dict:
     return metadata
 
 
-def _scan_media_files(post_dir: Path) -> Tuple[List[str], List[str]]:
-    """
-    扫描帖子目录中的图片和视频文件
-
-    Args:
-        post_dir: 帖子目录路径
-
-    Returns:
-        (图片文件列表, 视频文件列表)
-    """
-    images = []
-    videos = []
-
-    # 扫描 photo 目录
-    photo_dir = post_dir / 'photo'
-    if photo_dir.exists() and photo_dir.is_dir():
-        for img_file in photo_dir.iterdir():
-            if img_file.is_file():
-                images.append(str(img_file.relative_to(post_dir)))
-
-    # 扫描 video 目录
-    video_dir = post_dir / 'video'
-    if video_dir.exists() and video_dir.is_dir():
-        for vid_file in video_dir.iterdir():
-            if vid_file.is_file():
-                videos.append(str(vid_file.relative_to(post_dir)))
-
-    return sorted(images), sorted(videos)
-
-
 # =============================================================================
 # 核心函数
 # =============================================================================
@@ -257,11 +297,9 @@ def extract_post_metadata(post_dir: Path, author_name: str = None) -> Optional[D
         if html_metadata['title']:
             title = html_metadata['title']
 
-        # 扫描媒体文件
-        images, videos = _scan_media_files(post_dir)
-
-        # 计算目录大小
-        file_size_bytes = _get_directory_size(post_dir)
+        # 扫描目录（一次遍历得到媒体文件、目录大小和标记文件）
+        scan = scan_post_dir(post_dir)
+        images, videos = scan.images, scan.videos
 
         # 获取归档日期（使用目录的修改时间）
         archived_date = datetime.fromtimestamp(
@@ -288,10 +326,11 @@ def extract_post_metadata(post_dir: Path, author_name: str = None) -> Optional[D
             'video_count': len(videos),
             'images': images,
             'videos': videos,
-            'file_size_bytes': file_size_bytes,
+            'media_sizes': {rel_path: scan.size_of(rel_path) for rel_path in images + videos},
+            'file_size_bytes': scan.total_size,
             'archived_date': archived_date,
             'file_path': str(post_dir),
-            'has_content': html_path.exists()
+            'has_content': scan.has_content
         }
 
         return metadata
@@ -301,30 +340,348 @@ def extract_post_metadata(post_dir: Path, author_name: str = None) -> Optional[D
         return None
 
 
-def import_author_data(
-    author_name: str,
-    archive_path: str,
-    config: Dict,
-    db: DatabaseConnection,
-    show_progress: bool = True
-) -> Dict:
+# =============================================================================
+# 并行导入
+# =============================================================================
+
+def _parse_post_worker(task: Dict) -> Tuple[str, Optional[Dict], Optional[str]]:
     """
-    导入单个作者的数据
+    worker 进程：解析单篇帖子（模块级函数，可被 pickle）
 
     Args:
-        author_name: 作者名
-        archive_path: 归档目录路径
-        config: 配置字典
-        db: 数据库连接
-        show_progress: 是否显示进度条
+        task: {'post_dir', 'author_name', 'post_url', 'mode', 'signature', 'with_document'}
 
     Returns:
-        导入结果统计
+        (帖子目录, 元数据, 错误信息)，成功时错误信息为 None
     """
+    post_dir = task['post_dir']
+    try:
+        if task['mode'] == SCAN_BASELINE:
+            metadata = {'file_path': post_dir}
+        else:
+            metadata = extract_post_metadata(Path(post_dir), task['author_name'])
+            if metadata is None:
+                return post_dir, None, f"无法提取元数据: {post_dir}"
+
+            # jieba 分词也在 worker 中完成，写入线程只负责插入
+            if task['with_document']:
+                metadata['document'] = prepare_document(metadata['title'], Path(post_dir))
+
+        metadata['post_url'] = task['post_url']
+        metadata['mode'] = task['mode']
+        metadata['signature'] = task['signature']
+        metadata['content_hash'] = _hash_file(os.path.join(post_dir, 'content.html'))
+        return post_dir, metadata, None
+
+    except Exception as e:
+        return post_dir, None, f"导入帖子失败 ({post_dir}): {e}"
+
+
+class PostParser:
+    """帖子元数据并行解析器（进程池）"""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        初始化解析器
+
+        Args:
+            workers: worker 进程数（默认 CPU 核数 - 1，<= 1 时在当前进程解析）
+        """
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) - 1)
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def parse_many(
+        self,
+        tasks: List[Dict]
+    ) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+        """
+        批量解析帖子（按输入顺序返回结果）
+
+        Args:
+            tasks: _parse_post_worker 的参数列表
+
+        Yields:
+            (帖子目录, 元数据, 错误信息)
+        """
+        if self.workers <= 1 or len(tasks) < MIN_PARALLEL_POSTS:
+            for task in tasks:
+                yield _parse_post_worker(task)
+            return
+
+        if self._executor is None:
+            # spawn：导入写入线程已在运行，fork 可能让子进程继承被占用的锁而死锁
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        yield from self._executor.map(_parse_post_worker, tasks, chunksize=PARSE_CHUNKSIZE)
+
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _ImportWriter(threading.Thread):
+    """单一写入线程：从队列取解析结果，每 IMPORT_BATCH_SIZE 篇一个事务"""
+
+    def __init__(self, db: DatabaseConnection, author_id: int, result: Dict,
+                 batch_size: int = IMPORT_BATCH_SIZE):
+        super().__init__(name='import-writer', daemon=True)
+        self.db = db
+        self.author_id = author_id
+        self.result = result
+        self.batch_size = batch_size
+        # 有界队列：写入跟不上时让解析端等待，避免结果堆积在内存中
+        self.queue: queue.Queue = queue.Queue(maxsize=batch_size * 4)
+
+    def run(self):
+        batch = []
+        while True:
+            metadata = self.queue.get()
+            if metadata is None:
+                break
+            batch.append(metadata)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+        self._write_batch(batch)
+
+    def finish(self):
+        """通知写入线程结束并等待剩余批次提交"""
+        self.queue.put(None)
+        self.join()
+
+    def _write_batch(self, batch: List[Dict]):
+        """在一个事务中写入一批帖子（及其媒体和全文索引）
+
+        每篇帖子一个 SAVEPOINT：单篇失败时只回滚该帖子已写入的部分，
+        不会把半篇帖子随整批一起提交。
+        """
+        if not batch:
+            return
+
+        counts = {'posts_added': 0, 'posts_updated': 0, 'media_added': 0}
+        try:
+            with self.db.transaction() as conn:
+                # 事务外的 SAVEPOINT 会自行开启事务并在 RELEASE 时提交，先显式开启保证整批一次提交
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                for metadata in batch:
+                    conn.execute("SAVEPOINT import_post")
+                    try:
+                        media_added = self._write_post(conn, metadata)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO import_post")
+                        conn.execute("RELEASE import_post")
+                        error_msg = f"导入帖子失败 ({metadata['file_path']}): {e}"
+                        self.result['errors'].append(error_msg)
+                        print(error_msg)
+                        continue
+
+                    conn.execute("RELEASE import_post")
+                    counts['media_added'] += media_added
+                    if metadata['mode'] == SCAN_NEW:
+                        counts['posts_added'] += 1
+                    elif metadata['mode'] == SCAN_CHANGED:
+                        counts['posts_updated'] += 1
+        except Exception as e:
+            error_msg = f"提交导入批次失败 ({len(batch)} 篇): {e}"
+            self.result['errors'].append(error_msg)
+            print(error_msg)
+            return
+
+        for key, value in counts.items():
+            self.result[key] += value
+
+    def _write_post(self, conn, metadata: Dict) -> int:
+        """写入一篇帖子及其清单记录，返回新增媒体数"""
+        post_url = metadata['post_url']
+
+        if metadata['mode'] == SCAN_BASELINE:
+            post_id = conn.execute("SELECT id FROM posts WHERE url = ?", (post_url,)).fetchone()[0]
+            self._write_manifest(conn, post_id, metadata)
+            return 0
+
+        post_id = Post.upsert(
+            author_id=self.author_id,
+            url=post_url,
+            url_hash=_calculate_url_hash(post_url),
+            title=metadata['title'],
+            file_path=metadata['file_path'],
+            archived_date=metadata['archived_date'],
+            publish_date=metadata['publish_date'],
+            image_count=metadata['image_count'],
+            video_count=metadata['video_count'],
+            content_length=metadata['content_length'],
+            word_count=metadata['word_count'],
+            file_size_bytes=metadata['file_size_bytes'],
+            is_complete=metadata['has_content']
+        )
+
+        media_added = self._write_media(conn, post_id, metadata)
+
+        if 'document' in metadata:
+            write_document(conn, post_id, metadata['document'])
+
+        self._write_manifest(conn, post_id, metadata)
+        return media_added
+
+    def _write_media(self, conn, post_id: int, metadata: Dict) -> int:
+        """
+        按文件路径比对媒体记录：插入新文件、删除已消失的文件、更新大小
+
+        已有记录原地保留（不删除重建），migrate_exif 写入的 EXIF 列不会丢失。
+        """
+        existing = {
+            row[0]: row[1] for row in conn.execute(
+                "SELECT file_path, id FROM media WHERE post_id = ?", (post_id,)
+            )
+        }
+
+        post_dir = Path(metadata['file_path'])
+        new_rows = []
+        size_updates = []
+        seen = set()
+        for media_type, rel_paths in (('image', metadata['images']), ('video', metadata['videos'])):
+            for rel_path in rel_paths:
+                full_path = post_dir / rel_path
+                file_size = metadata['media_sizes'].get(rel_path, 0)
+                seen.add(str(full_path))
+                if str(full_path) in existing:
+                    size_updates.append((file_size, existing[str(full_path)]))
+                    continue
+                new_rows.append({
+                    'post_id': post_id,
+                    'type': media_type,
+                    'url': f"file://{full_path}",
+                    'file_name': full_path.name,
+                    'file_path': str(full_path),
+                    'file_size_bytes': file_size,
+                    'download_date': metadata['archived_date']
+                })
+
+        stale = [(media_id,) for path, media_id in existing.items() if path not in seen]
+        if stale:
+            conn.executemany("DELETE FROM media WHERE id = ?", stale)
+        if size_updates:
+            conn.executemany("UPDATE media SET file_size_bytes = ? WHERE id = ?", size_updates)
+
+        # 大小来自解析时的 scandir，executemany 批量插入
+        return Media.bulk_create(new_rows)
+
+    def _write_manifest(self, conn, post_id: int, metadata: Dict):
+        """记录帖子目录的 stat 签名和内容哈希"""
+        mtime_ns, inode, size = metadata['signature']
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO post_manifest (
+                path, post_id, mtime_ns, inode, size, content_hash, scanned_at
+            ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            (metadata['file_path'], post_id, mtime_ns, inode, size, metadata['content_hash'])
+        )
+
+
+def _checkpoint_key(archive_path: str) -> str:
+    """检查点使用归档目录的绝对路径作为键"""
+    return str(Path(archive_path).resolve())
+
+
+def _ensure_import_tables(db: DatabaseConnection):
+    """创建帖子清单表和导入检查点表"""
+    with db.transaction() as conn:
+        conn.executescript(MANIFEST_TABLE_SQL + CHECKPOINT_TABLE_SQL)
+
+
+def _load_checkpoints(db: DatabaseConnection, archive_path: str) -> Set[str]:
+    """读取本轮导入中已完成的作者"""
+    rows = db.get_connection().execute(
+        "SELECT author_name FROM import_checkpoints WHERE archive_path = ?",
+        (_checkpoint_key(archive_path),)
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _save_checkpoint(db: DatabaseConnection, archive_path: str, author_name: str, posts_added: int):
+    """记录作者导入完成"""
+    with db.transaction() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO import_checkpoints (archive_path, author_name, posts_added) "
+            "VALUES (?, ?, ?)",
+            (_checkpoint_key(archive_path), author_name, posts_added)
+        )
+
+
+def _clear_checkpoints(db: DatabaseConnection, archive_path: str):
+    """整轮导入完成（或强制重建）后清除检查点"""
+    with db.transaction() as conn:
+        conn.execute(
+            "DELETE FROM import_checkpoints WHERE archive_path = ?",
+            (_checkpoint_key(archive_path),)
+        )
+
+
+def _resolve_import_workers(config: Dict, workers: Optional[int]) -> Optional[int]:
+    """参数优先，其次 advanced.import_workers（null 表示 CPU 核数 - 1）"""
+    if workers is not None:
+        return workers
+    return config.get('advanced', {}).get('import_workers')
+
+
+def _get_or_create_author(author_name: str, config: Dict) -> Author:
+    """获取作者，不存在时按 config 中的关注信息创建"""
+    author = Author.get_by_name(author_name)
+    if author is not None:
+        return author
+
+    # 从 config 中查找作者信息
+    author_config = next(
+        (a for a in config.get('followed_authors', []) if a['name'] == author_name),
+        None
+    )
+
+    if author_config:
+        return Author.create(
+            name=author_name,
+            added_date=author_config.get('added_date', datetime.now().strftime("%Y-%m-%d")),
+            url=author_config.get('url'),
+            forum_total_posts=author_config.get('forum_total_posts', 0),
+            tags=author_config.get('tags'),
+            notes=author_config.get('notes')
+        )
+
+    return Author.create(
+        name=author_name,
+        added_date=datetime.now().strftime("%Y-%m-%d")
+    )
+
+
+def _import_author(
+    author_name: str,
+    archive_path: str,
+    config: Dict,
+    db: DatabaseConnection,
+    parser: PostParser,
+    show_progress: bool
+) -> Dict:
+    """导入单个作者（共享解析进程池），返回结果统计"""
     result = {
         'author_name': author_name,
         'posts_added': 0,
+        'posts_updated': 0,
         'posts_skipped': 0,
+        'posts_missing': 0,
         'media_added': 0,
         'errors': []
     }
@@ -335,123 +692,84 @@ def import_author_data(
         Post._db = db
         Media._db = db
 
-        # 获取或创建作者
-        author = Author.get_by_name(author_name)
-
-        if author is None:
-            # 从 config 中查找作者信息
-            author_config = next(
-                (a for a in config.get('followed_authors', []) if a['name'] == author_name),
-                None
-            )
-
-            if author_config:
-                author = Author.create(
-                    name=author_name,
-                    added_date=author_config.get('added_date', datetime.now().strftime("%Y-%m-%d")),
-                    url=author_config.get('url'),
-                    forum_total_posts=author_config.get('forum_total_posts', 0),
-                    tags=author_config.get('tags'),
-                    notes=author_config.get('notes')
-                )
-            else:
-                author = Author.create(
-                    name=author_name,
-                    added_date=datetime.now().strftime("%Y-%m-%d")
-                )
+        author = _get_or_create_author(author_name, config)
 
         # 扫描作者目录
         author_dir = Path(archive_path) / author_name
         if not author_dir.exists():
             return result
 
-        # 收集所有帖子目录
-        post_dirs = []
-        for year_dir in author_dir.iterdir():
-            if not year_dir.is_dir():
-                continue
-            for month_dir in year_dir.iterdir():
-                if not month_dir.is_dir():
-                    continue
-                for post_dir in month_dir.iterdir():
-                    if post_dir.is_dir():
-                        post_dirs.append(post_dir)
+        # 已入库的帖子（目录 → URL，含归档时同步的真实 URL）和清单记录
+        conn = db.get_connection()
+        existing_urls = {}
+        for row in conn.execute(
+            "SELECT url, file_path FROM posts WHERE author_id = ?", (author.id,)
+        ).fetchall():
+            existing_urls[row['file_path']] = row['url']
+            if row['url'].startswith('file://'):
+                existing_urls[row['url'][len('file://'):]] = row['url']
+
+        manifest = {
+            row[0]: (row[1], row[2], row[3]) for row in conn.execute(
+                "SELECT m.path, m.mtime_ns, m.inode, m.size FROM post_manifest m "
+                "JOIN posts p ON p.id = m.post_id WHERE p.author_id = ?",
+                (author.id,)
+            )
+        }
 
-        # 导入每篇帖子
-        iterator = tqdm(post_dirs, desc=f"导入 {author_name}", disable=not show_progress)
+        # 全文索引已建立时同步写入
+        index_enabled = has_search_index(conn)
 
-        for post_dir in iterator:
-            try:
-                # 提取元数据
-                metadata = extract_post_metadata(post_dir, author_name)
-                if metadata is None:
-                    result['errors'].append(f"无法提取元数据: {post_dir}")
-                    continue
-
-                # 生成伪 URL（因为我们可能没有原始 URL）
-                # 使用文件路径作为唯一标识
-                post_url = f"file://{metadata['file_path']}"
-                url_hash = _calculate_url_hash(post_url)
+        # stat 比对：签名未变化的目录不再解析（中断后重新运行也只解析剩余帖子）
+        tasks = []
+        seen = set()
+        for post_dir in iter_post_dirs(author_dir):
+            seen.add(post_dir)
+            signature = _stat_post_dir(post_dir)
+            if signature is None:
+                continue
+            if manifest.get(post_dir) == signature:
+                result['posts_skipped'] += 1
+                continue
 
-                # 检查是否已存在
-                if Post.exists(post_url):
-                    result['posts_skipped'] += 1
+            post_url = existing_urls.get(post_dir)
+            if post_url is None:
+                mode = SCAN_NEW
+                post_url = f"file://{post_dir}"
+            elif post_dir in manifest:
+                mode = SCAN_CHANGED
+            else:
+                mode = SCAN_BASELINE
+                result['posts_skipped'] += 1
+
+            tasks.append({
+                'post_dir': post_dir,
+                'author_name': author_name,
+                'post_url': post_url,
+                'mode': mode,
+                'signature': signature,
+                'with_document': index_enabled
+            })
+
+        # 清单中有记录但目录已不存在（只报告，清理由完整性检查负责）
+        result['posts_missing'] = len(manifest.keys() - seen)
+
+        writer = _ImportWriter(db, author.id, result)
+        writer.start()
+        try:
+            iterator = tqdm(
+                parser.parse_many(tasks),
+                total=len(tasks),
+                desc=f"导入 {author_name}",
+                disable=not show_progress
+            )
+            for _, metadata, error in iterator:
+                if error:
+                    result['errors'].append(error)
                     continue
-
-                # 创建帖子
-                post = Post.create(
-                    author_id=author.id,
-                    url=post_url,
-                    url_hash=url_hash,
-                    title=metadata['title'],
-                    file_path=metadata['file_path'],
-                    archived_date=metadata['archived_date'],
-                    publish_date=metadata['publish_date'],
-                    image_count=metadata['image_count'],
-                    video_count=metadata['video_count'],
-                    content_length=metadata['content_length'],
-                    word_count=metadata['word_count'],
-                    file_size_bytes=metadata['file_size_bytes'],
-                    is_complete=metadata['has_content']
-                )
-
-                result['posts_added'] += 1
-
-                # 导入媒体文件
-                for img_path in metadata['images']:
-                    img_full_path = post_dir / img_path
-                    img_size = img_full_path.stat().st_size if img_full_path.exists() else 0
-
-                    Media.create(
-                        post_id=post.id,
-                        type='image',
-                        url=f"file://{img_full_path}",
-                        file_name=img_full_path.name,
-                        file_path=str(img_full_path),
-                        file_size_bytes=img_size,
-                        download_date=metadata['archived_date']
-                    )
-                    result['media_added'] += 1
-
-                for vid_path in metadata['videos']:
-                    vid_full_path = post_dir / vid_path
-                    vid_size = vid_full_path.stat().st_size if vid_full_path.exists() else 0
-
-                    Media.create(
-                        post_id=post.id,
-                        type='video',
-                        url=f"file://{vid_full_path}",
-                        file_name=vid_full_path.name,
-                        file_path=str(vid_full_path),
-                        file_size_bytes=vid_size,
-                        download_date=metadata['archived_date']
-                    )
-                    result['media_added'] += 1
-
-            except Exception as e:
-                error_msg = f"导入帖子失败 ({post_dir}): {e}"
-                result['errors'].append(error_msg)
-                print(error_msg)
+                writer.queue.put(metadata)
+        finally:
+            writer.finish()
 
     except Exception as e:
         error_msg = f"导入作者数据失败 ({author_name}): {e}"
@@ -461,12 +779,45 @@ def import_author_data(
     return result
 
 
+def import_author_data(
+    author_name: str,
+    archive_path: str,
+    config: Dict,
+    db: DatabaseConnection,
+    show_progress: bool = True,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    导入单个作者的数据
+
+    Args:
+        author_name: 作者名
+        archive_path: 归档目录路径
+        config: 配置字典
+        db: 数据库连接
+        show_progress: 是否显示进度条
+        workers: 解析进程数（默认 advanced.import_workers）
+
+    Returns:
+        导入结果统计
+    """
+    _ensure_import_tables(db)
+    with PostParser(_resolve_import_workers(config, workers)) as parser:
+        result = _import_author(author_name, archive_path, config, db, parser, show_progress)
+
+    # 导入的媒体由触发器把相机入队，这里一次性刷新统计物化表
+    refresh_dirty_camera_stats(db)
+    return result
+
+
 def import_all_data(
     archive_path: str,
     config: Dict,
     db: Optional[DatabaseConnection] = None,
     force_rebuild: bool = False,
-    show_progress: bool = True
+    show_progress: bool = True,
+    workers: Optional[int] = None,
+    resume: bool = True
 ) -> Dict:
     """
     导入所有历史数据
@@ -477,6 +828,8 @@ def import_all_data(
         db: 数据库连接（可选，默认使用默认连接）
         force_rebuild: 是否强制重建（清空数据库重新导入）
         show_progress: 是否显示进度条
+        workers: 解析进程数（默认 advanced.import_workers）
+        resume: 是否从上次中断的检查点继续（跳过已完成的作者）
 
     Returns:
         导入结果统计
@@ -492,27 +845,31 @@ def import_all_data(
     if not db.is_initialized():
         db.initialize_database()
 
+    _ensure_import_tables(db)
+
     # 设置模型使用的数据库
     Author._db = db
     Post._db = db
     Media._db = db
 
-    conn = db.get_connection()
-
     # 强制重建：清空数据库
     if force_rebuild:
         print("清空数据库...")
-        conn.execute("DELETE FROM media")
-        conn.execute("DELETE FROM posts")
-        conn.execute("DELETE FROM authors")
-        conn.execute("DELETE FROM sync_history")
-        conn.commit()
+        with db.transaction() as tx:
+            tx.execute("DELETE FROM media")
+            tx.execute("DELETE FROM posts")
+            tx.execute("DELETE FROM authors")
+            tx.execute("DELETE FROM sync_history")
+        _clear_checkpoints(db, archive_path)
 
     # 收集结果
     total_result = {
         'authors_added': 0,
+        'authors_resumed': 0,
         'posts_added': 0,
+        'posts_updated': 0,
         'posts_skipped': 0,
+        'posts_missing': 0,
         'media_added': 0,
         'errors': [],
         'duration_seconds': 0
@@ -525,62 +882,89 @@ def import_all_data(
         return total_result
 
     # 扫描所有作者目录
-    author_dirs = [d for d in archive_dir.iterdir() if d.is_dir()]
+    # 跳过隐藏目录（如 .media_store 媒体库）
+    with os.scandir(archive_dir) as entries:
+        author_names = sorted(
+            entry.name for entry in entries
+            if entry.is_dir() and not entry.name.startswith('.')
+        )
+
+    # 上次中断前已完成的作者
+    completed = _load_checkpoints(db, archive_path) if resume else set()
 
     if show_progress:
         print(f"\n开始导入历史数据...")
         print(f"归档路径: {archive_path}")
-        print(f"作者数量: {len(author_dirs)}")
+        print(f"作者数量: {len(author_names)}")
+        if completed:
+            print(f"从检查点继续: 跳过 {len(completed)} 个已完成的作者")
         print(f"{'=' * 60}\n")
 
-    # 导入每个作者
-    for author_dir in author_dirs:
-        author_name = author_dir.name
+    # 导入每个作者（共享一个解析进程池）
+    with PostParser(_resolve_import_workers(config, workers)) as parser:
+        for author_name in author_names:
+            if author_name in completed:
+                total_result['authors_resumed'] += 1
+                continue
 
-        print(f"\n正在导入作者: {author_name}")
+            print(f"\n正在导入作者: {author_name}")
 
-        result = import_author_data(
-            author_name=author_name,
-            archive_path=archive_path,
-            config=config,
-            db=db,
-            show_progress=show_progress
-        )
+            result = _import_author(author_name, archive_path, config, db, parser, show_progress)
+
+            total_result['authors_added'] += 1
+            total_result['posts_added'] += result['posts_added']
+            total_result['posts_updated'] += result['posts_updated']
+            total_result['posts_skipped'] += result['posts_skipped']
+            total_result['posts_missing'] += result['posts_missing']
+            total_result['media_added'] += result['media_added']
+            total_result['errors'].extend(result['errors'])
 
-        total_result['authors_added'] += 1
-        total_result['posts_added'] += result['posts_added']
-        total_result['posts_skipped'] += result['posts_skipped']
-        total_result['media_added'] += result['media_added']
-        total_result['errors'].extend(result['errors'])
+            # 有错误的作者不记检查点，继续时重试失败的帖子
+            if not result['errors']:
+                _save_checkpoint(db, archive_path, author_name, result['posts_added'])
+
+            print(
+                f"  ✓ 新增帖子: {result['posts_added']}, 更新: {result['posts_updated']}, "
+                f"跳过: {result['posts_skipped']}, 媒体: {result['media_added']}"
+            )
 
-        print(f"  ✓ 新增帖子: {result['posts_added']}, 跳过: {result['posts_skipped']}, 媒体: {result['media_added']}")
+    # 整轮完成，下次导入从头扫描
+    _clear_checkpoints(db, archive_path)
 
     # 记录同步历史
     duration = time.time() - start_time
     total_result['duration_seconds'] = round(duration, 2)
 
-    conn.execute(
-        """
-        INSERT INTO sync_history (
-            sync_type, posts_added, errors, duration_seconds, status
-        ) VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            'import',
-            total_result['posts_added'],
-            len(total_result['errors']),
-            duration,
-            'success' if len(total_result['errors']) == 0 else 'partial'
+    with db.transaction() as tx:
+        tx.execute(
+            """
+            INSERT INTO sync_history (
+                sync_type, posts_added, posts_updated, errors, duration_seconds, status
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                'import',
+                total_result['posts_added'],
+                total_result['posts_updated'],
+                len(total_result['errors']),
+                duration,
+                'success' if len(total_result['errors']) == 0 else 'partial'
+            )
         )
-    )
-    conn.commit()
+        # 整轮导入只刷新一次相机统计物化表（查询路径保持只读）
+        refresh_dirty_camera_stats(db)
 
     # 打印总结
     if show_progress:
         print(f"\n{'=' * 60}")
         print(f"✓ 导入完成!")
         print(f"  - 作者数: {total_result['authors_added']}")
-        print(f"  - 帖子数: {total_result['posts_added']} (跳过: {total_result['posts_skipped']})")
+        print(
+            f"  - 帖子数: {total_result['posts_added']} "
+            f"(更新: {total_result['posts_updated']}, 未变化: {total_result['posts_skipped']})"
+        )
+        if total_result['posts_missing']:
+            print(f"  - 目录已不存在: {total_result['posts_missing']}")
         print(f"  - 媒体数: {total_result['media_added']}")
         print(f"  - 用时: {duration:.2f} 秒")
         if total_result['errors']:
@@ -15,6 +15,10 @@ EXIF 数据批量迁移工具
     --limit N: 只处理前 N 张图片（用于测试）
     --no-gps: 跳过 GPS 反查（加快速度）
     --force: 强制重新提取已有 EXIF 数据的图片
+    --workers N: EXIF 提取进程数（默认 CPU 核数 - 1）
+    --batch-size N: 每批提交的记录数
+    --geocode-mode MODE: GPS 反查方式（online / offline，offline 只精确到城市）
+    --warm-geocode-cache: 运行前用已有地址预热反查缓存
 
 作者: Claude Sonnet 4.5
 日期: 2026-02-14
@@ -30,9 +34,13 @@ import time
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.config.manager import ConfigManager
 from src.database.connection import get_default_connection
 from src.database.models import Media
+from src.database.camera_stats import refresh_dirty_camera_stats
 from src.analysis import ExifAnalyzer
+from src.analysis.geocode_cache import GeocodeCache
+from src.analysis.exif_engine import ExifExtractionEngine, ExifBatchWriter
 from rich.console import Console
 from rich.progress import (
     Progress,
@@ -57,7 +65,12 @@ class ExifMigrator:
         self,
         dry_run: bool = False,
         skip_gps: bool = False,
-        force: bool = False
+        force: bool = False,
+        workers: Optional[int] = None,
+        batch_size: int = 500,
+        geocode_mode: str = 'online',
+        warm_geocode_cache: bool = False,
+        config: Optional[Dict] = None
     ):
         """
         初始化迁移器
@@ -66,13 +79,26 @@ class ExifMigrator:
             dry_run: 预览模式，不写入数据库
             skip_gps: 跳过 GPS 反查
             force: 强制重新提取
+            workers: EXIF 提取进程数（默认 CPU 核数 - 1）
+            batch_size: 每批提交的记录数
+            geocode_mode: GPS 反查方式，'online'（Nominatim）或 'offline'（内置数据集，仅城市级）
+            warm_geocode_cache: 运行前用 media 表已有的地址预热在线反查缓存
+            config: 配置字典（反查缓存路径 / 精度 / 过期天数，与 archiver 一致）
         """
         self.dry_run = dry_run
         self.skip_gps = skip_gps
         self.force = force
+        self.workers = workers
+        self.batch_size = batch_size
 
         self.db = get_default_connection()
-        self.exif_analyzer = ExifAnalyzer(self.db)
+        self.warm_geocode_cache = warm_geocode_cache
+        self.geocode_cache = GeocodeCache.from_config(config or {})
+        self.exif_analyzer = ExifAnalyzer(
+            self.db,
+            geocode_mode=geocode_mode,
+            geocode_cache=self.geocode_cache
+        )
 
         # 统计数据
         self.stats = {
@@ -133,6 +159,29 @@ class ExifMigrator:
         Returns:
             bool: 是否成功
         """
+        file_path = self._resolve_file_path(image)
+        if file_path is None:
+            return False
+
+        try:
+            exif_data = self.exif_analyzer.extract_exif(str(file_path))
+        except Exception as e:
+            console.print(f"[red]处理失败: {file_path.name} - {e}[/red]")
+            self.stats['failed'] += 1
+            return False
+
+        return self._handle_exif(image, exif_data)
+
+    def _resolve_file_path(self, image: Dict) -> Optional[Path]:
+        """
+        解析图片的实际文件路径（不存在时记为失败）
+
+        Args:
+            image: Media 记录字典
+
+        Returns:
+            Path: 文件路径，不存在时返回 None
+        """
         file_path = Path(image['file_path'])
 
         # 处理 .done 标记文件（数据库中可能存储了标记文件路径）
@@ -149,12 +198,23 @@ class ExifMigrator:
             else:
                 console.print(f"[yellow]文件不存在: {file_path.name}[/yellow]")
                 self.stats['failed'] += 1
-                return False
+                return None
 
-        try:
-            # 提取 EXIF
-            exif_data = self.exif_analyzer.extract_exif(str(file_path))
+        return file_path
 
+    def _handle_exif(self, image: Dict, exif_data: Dict, writer: Optional[ExifBatchWriter] = None) -> bool:
+        """
+        处理提取结果：GPS 反查、统计、写入数据库
+
+        Args:
+            image: Media 记录字典
+            exif_data: 提取的 EXIF 数据
+            writer: 批量写入器（为 None 时逐条更新）
+
+        Returns:
+            bool: 是否成功
+        """
+        try:
             if not exif_data:
                 self.stats['skipped'] += 1
                 return False
@@ -172,17 +232,21 @@ class ExifMigrator:
 
                 if location:
                     exif_data['location'] = location
+                    exif_data['location_source'] = self.exif_analyzer.geocode_mode
                     self.stats['has_location'] += 1
 
             # 更新数据库（如果不是预览模式）
             if not self.dry_run:
-                self._update_media_exif(image['id'], exif_data)
+                if writer is not None:
+                    writer.add(image['id'], exif_data)
+                else:
+                    self._update_media_exif(image['id'], exif_data)
 
             self.stats['success'] += 1
             return True
 
         except Exception as e:
-            console.print(f"[red]处理失败: {file_path.name} - {e}[/red]")
+            console.print(f"[red]处理失败: {image['file_name']} - {e}[/red]")
             self.stats['failed'] += 1
             return False
 
@@ -202,7 +266,8 @@ class ExifMigrator:
                 exif_focal_length=exif_data.get('focal_length'),
                 exif_gps_lat=exif_data.get('gps_lat'),
                 exif_gps_lng=exif_data.get('gps_lng'),
-                exif_location=exif_data.get('location')
+                exif_location=exif_data.get('location'),
+                exif_location_source=exif_data.get('location_source')
             )
 
     def run(self, limit: Optional[int] = None):
@@ -215,13 +280,22 @@ class ExifMigrator:
         # 显示配置
         config_table = Table(show_header=False, box=None)
         config_table.add_row("模式", "预览模式 (不写入数据库)" if self.dry_run else "正常模式")
-        config_table.add_row("GPS 反查", "跳过" if self.skip_gps else "启用")
+        config_table.add_row(
+            "GPS 反查",
+            "跳过" if self.skip_gps else f"启用（{self.exif_analyzer.geocode_mode}）"
+        )
         config_table.add_row("强制模式", "是" if self.force else "否")
+        config_table.add_row("提取进程", str(self.workers or "自动"))
         if limit:
             config_table.add_row("限制数量", str(limit))
 
         console.print(Panel(config_table, title="🔧 配置信息", border_style="cyan"))
 
+        # 预热在线反查缓存（已有地址的坐标不再请求 Nominatim）
+        if self.warm_geocode_cache and not self.skip_gps:
+            added = self.geocode_cache.warm_up_from_media(self.db, self.exif_analyzer.geocode_mode)
+            console.print(f"[cyan]GPS 反查缓存预热: 新增 {added} 条[/cyan]")
+
         # 获取待处理图片
         console.print("\n[cyan]正在扫描数据库...[/cyan]")
         images = self.get_images_to_process(limit)
@@ -251,10 +325,29 @@ class ExifMigrator:
                 total=len(images)
             )
 
+            # 主进程解析路径 → 进程池提取 EXIF → 主进程 GPS 反查 + 批量写入
+            by_id = {}
+            items = []
             for image in images:
-                self.process_single_image(image)
-                self.stats['processed'] += 1
-                progress.update(task, advance=1)
+                file_path = self._resolve_file_path(image)
+                if file_path is None:
+                    self.stats['processed'] += 1
+                    progress.update(task, advance=1)
+                    continue
+                by_id[image['id']] = image
+                items.append((image['id'], str(file_path)))
+
+            writer = ExifBatchWriter(self.db, batch_size=self.batch_size)
+            with ExifExtractionEngine(workers=self.workers) as engine:
+                for media_id, exif_data in engine.extract_many(items):
+                    self._handle_exif(by_id[media_id], exif_data, writer)
+                    self.stats['processed'] += 1
+                    progress.update(task, advance=1)
+
+            if not self.dry_run:
+                writer.flush()
+                # EXIF 变化的相机由触发器入队，这里一次性刷新统计物化表
+                refresh_dirty_camera_stats(self.db)
 
         elapsed_time = time.time() - start_time
 
@@ -319,6 +412,9 @@ def main():
   python -m src.database.migrate_exif --limit 100        # 只处理 100 张图片
   python -m src.database.migrate_exif --no-gps           # 跳过 GPS 反查（更快）
   python -m src.database.migrate_exif --force            # 强制重新提取所有图片
+  python -m src.database.migrate_exif --workers 8        # 使用 8 个进程提取
+  python -m src.database.migrate_exif --geocode-mode offline  # 使用内置数据集离线反查（仅城市级）
+  python -m src.database.migrate_exif --warm-geocode-cache   # 先用同来源的已有地址预热缓存
         """
     )
 
@@ -347,6 +443,34 @@ def main():
         help='强制重新提取已有 EXIF 数据的图片'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='EXIF 提取进程数（默认 CPU 核数 - 1，1 表示单进程）'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=500,
+        metavar='N',
+        help='每批提交的记录数（默认 500）'
+    )
+
+    parser.add_argument(
+        '--geocode-mode',
+        choices=['online', 'offline'],
+        help='GPS 反查方式（默认取 advanced.geocode_mode）：online 使用 Nominatim（区县级，限速 1 次/秒），'
+             'offline 使用内置地点数据集（无网络请求，但只精确到 150km 内最近的主要城市）'
+    )
+
+    parser.add_argument(
+        '--warm-geocode-cache',
+        action='store_true',
+        help='运行前用数据库中已有的 GPS 地址预热反查缓存'
+    )
+
     args = parser.parse_args()
 
     # 显示标题
@@ -357,10 +481,20 @@ def main():
     ))
 
     try:
+        try:
+            config = ConfigManager().load()
+        except FileNotFoundError:
+            config = {}
+
         migrator = ExifMigrator(
             dry_run=args.dry_run,
             skip_gps=args.no_gps,
-            force=args.force
+            force=args.force,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            geocode_mode=args.geocode_mode or config.get('advanced', {}).get('geocode_mode', 'online'),
+            warm_geocode_cache=args.warm_geocode_cache,
+            config=config
         )
 
         migrator.run(limit=args.limit)
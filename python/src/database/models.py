@@ -3,6 +3,9 @@
 
 提供轻量级的 ORM 接口，封装数据库 CRUD 操作。
 包含三个核心模型：Author（作者）、Post（帖子）、Media（媒体）
+
+写操作都经过 db.transaction()（持有写锁）；在外层事务中调用时不单独提交，
+随外层事务一起提交或回滚。
 """
 
 import json
@@ -11,6 +14,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from .connection import DatabaseConnection
+from .search_index import has_search_index, prepare_document, resolve_post_dir, write_document
 
 
 # =============================================================================
@@ -41,6 +45,33 @@ def _serialize_json_field(value: Optional[List[str]]) -> Optional[str]:
     return json.dumps(value, ensure_ascii=False)
 
 
+def _publish_fields(publish_date: Optional[str]) -> tuple:
+    """从 publish_date 提取冗余字段（年、月、小时、星期）"""
+    if publish_date:
+        try:
+            dt = datetime.strptime(publish_date, "%Y-%m-%d %H:%M:%S")
+            return dt.year, dt.month, dt.hour, dt.weekday()
+        except ValueError:
+            pass
+    return None, None, None, None
+
+
+# media 表写入列（Media.create / Media.bulk_create 共用）
+MEDIA_COLUMNS = (
+    'post_id', 'type', 'url', 'file_name', 'file_path', 'file_size_bytes',
+    'width', 'height', 'duration', 'is_downloaded', 'download_date',
+    'exif_make', 'exif_model', 'exif_datetime', 'exif_iso', 'exif_aperture',
+    'exif_shutter_speed', 'exif_focal_length', 'exif_gps_lat', 'exif_gps_lng', 'exif_location',
+    'exif_location_source'
+)
+
+# media 列默认值（bulk_create 中缺省的字段）
+_MEDIA_DEFAULTS = {
+    'file_size_bytes': 0,
+    'is_downloaded': True
+}
+
+
 # =============================================================================
 # Author 模型
 # =============================================================================
@@ -176,28 +207,54 @@ class Author:
             Author 对象
         """
         db = cls._get_db()
-        conn = db.get_connection()
-
-        cursor = conn.execute(
-            """
-            INSERT INTO authors (
-                name, added_date, url, forum_total_posts, tags, notes
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                name,
-                added_date,
-                url,
-                forum_total_posts,
-                _serialize_json_field(tags),
-                notes
+        with db.transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO authors (
+                    name, added_date, url, forum_total_posts, tags, notes
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    name,
+                    added_date,
+                    url,
+                    forum_total_posts,
+                    _serialize_json_field(tags),
+                    notes
+                )
             )
-        )
-        conn.commit()
 
         # 返回新创建的作者对象
         return cls.get_by_id(cursor.lastrowid)
 
+    @classmethod
+    def get_or_create_id(
+        cls,
+        name: str,
+        added_date: str,
+        url: Optional[str] = None
+    ) -> int:
+        """
+        获取作者 ID（不存在时创建），只返回 ID，不加载完整对象
+
+        Args:
+            name: 作者名
+            added_date: 关注日期（仅创建时使用）
+            url: 作者 URL（仅创建时使用）
+
+        Returns:
+            作者 ID
+        """
+        db = cls._get_db()
+        with db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO authors (name, added_date, url) VALUES (?, ?, ?)",
+                (name, added_date, url)
+            )
+
+            row = conn.execute("SELECT id FROM authors WHERE name = ?", (name,)).fetchone()
+            return row['id']
+
     def update(self, **kwargs):
         """
         更新作者信息
@@ -209,7 +266,6 @@ class Author:
             raise ValueError("无法更新未保存的作者")
 
         db = self._get_db()
-        conn = db.get_connection()
 
         # 构建更新语句
         update_fields = []
@@ -229,8 +285,8 @@ class Author:
         values.append(self.id)
 
         sql = f"UPDATE authors SET {', '.join(update_fields)} WHERE id = ?"
-        conn.execute(sql, values)
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute(sql, values)
 
         # 重新加载对象
         updated = self.get_by_id(self.id)
@@ -243,10 +299,8 @@ class Author:
             raise ValueError("无法删除未保存的作者")
 
         db = self._get_db()
-        conn = db.get_connection()
-
-        conn.execute("DELETE FROM authors WHERE id = ?", (self.id,))
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM authors WHERE id = ?", (self.id,))
 
         self.id = None
 
@@ -477,44 +531,99 @@ class Post:
             Post 对象
         """
         db = cls._get_db()
-        conn = db.get_connection()
 
         # 从 publish_date 提取冗余字段
-        publish_year = None
-        publish_month = None
-        publish_hour = None
-        publish_weekday = None
+        publish_year, publish_month, publish_hour, publish_weekday = _publish_fields(publish_date)
 
-        if publish_date:
-            try:
-                dt = datetime.strptime(publish_date, "%Y-%m-%d %H:%M:%S")
-                publish_year = dt.year
-                publish_month = dt.month
-                publish_hour = dt.hour
-                publish_weekday = dt.weekday()
-            except ValueError:
-                pass
+        # 全文索引文档（分词在事务外完成）
+        document = None
+        if has_search_index(db.get_connection()):
+            document = prepare_document(title, resolve_post_dir(file_path))
 
-        cursor = conn.execute(
-            """
-            INSERT INTO posts (
-                author_id, url, url_hash, title, publish_date,
-                publish_year, publish_month, publish_hour, publish_weekday,
-                content_length, word_count, image_count, video_count,
-                file_path, archived_date, file_size_bytes, is_complete
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                author_id, url, url_hash, title, publish_date,
-                publish_year, publish_month, publish_hour, publish_weekday,
-                content_length, word_count, image_count, video_count,
-                file_path, archived_date, file_size_bytes, is_complete
+        with db.transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO posts (
+                    author_id, url, url_hash, title, publish_date,
+                    publish_year, publish_month, publish_hour, publish_weekday,
+                    content_length, word_count, image_count, video_count,
+                    file_path, archived_date, file_size_bytes, is_complete
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    author_id, url, url_hash, title, publish_date,
+                    publish_year, publish_month, publish_hour, publish_weekday,
+                    content_length, word_count, image_count, video_count,
+                    file_path, archived_date, file_size_bytes, is_complete
+                )
             )
-        )
-        conn.commit()
+            if document is not None:
+                write_document(conn, cursor.lastrowid, document)
 
         return cls.get_by_id(cursor.lastrowid)
 
+    @classmethod
+    def upsert(
+        cls,
+        author_id: int,
+        url: str,
+        url_hash: str,
+        title: str,
+        file_path: str,
+        archived_date: str,
+        publish_date: Optional[str] = None,
+        image_count: int = 0,
+        video_count: int = 0,
+        content_length: int = 0,
+        word_count: int = 0,
+        file_size_bytes: int = 0,
+        is_complete: bool = True
+    ) -> int:
+        """
+        按 URL 插入或更新帖子（INSERT ... ON CONFLICT(url) DO UPDATE）
+
+        已存在时只更新标题、统计和完成状态，与原 Post.exists + update 路径一致。
+        不写全文索引：调用方（sync / migrate）在同一事务中批量写入索引文档。
+
+        Args:
+            参数同 Post.create
+
+        Returns:
+            帖子 ID
+        """
+        db = cls._get_db()
+        publish_year, publish_month, publish_hour, publish_weekday = _publish_fields(publish_date)
+
+        with db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO posts (
+                    author_id, url, url_hash, title, publish_date,
+                    publish_year, publish_month, publish_hour, publish_weekday,
+                    content_length, word_count, image_count, video_count,
+                    file_path, archived_date, file_size_bytes, is_complete
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title,
+                    image_count = excluded.image_count,
+                    video_count = excluded.video_count,
+                    content_length = excluded.content_length,
+                    word_count = excluded.word_count,
+                    file_size_bytes = excluded.file_size_bytes,
+                    is_complete = excluded.is_complete,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (
+                    author_id, url, url_hash, title, publish_date,
+                    publish_year, publish_month, publish_hour, publish_weekday,
+                    content_length, word_count, image_count, video_count,
+                    file_path, archived_date, file_size_bytes, is_complete
+                )
+            )
+
+            row = conn.execute("SELECT id FROM posts WHERE url = ?", (url,)).fetchone()
+            return row['id']
+
     @staticmethod
     def exists(url: str) -> bool:
         """检查帖子是否已存在"""
@@ -527,7 +636,6 @@ class Post:
             raise ValueError("无法更新未保存的帖子")
 
         db = self._get_db()
-        conn = db.get_connection()
 
         # 构建更新语句
         update_fields = []
@@ -543,9 +651,19 @@ class Post:
         update_fields.append("updated_at = CURRENT_TIMESTAMP")
         values.append(self.id)
 
+        # 标题或目录变化时重新生成全文索引文档（分词在事务外完成）
+        document = None
+        if ('title' in kwargs or 'file_path' in kwargs) and has_search_index(db.get_connection()):
+            document = prepare_document(
+                kwargs.get('title', self.title),
+                resolve_post_dir(kwargs.get('file_path', self.file_path))
+            )
+
         sql = f"UPDATE posts SET {', '.join(update_fields)} WHERE id = ?"
-        conn.execute(sql, values)
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute(sql, values)
+            if document is not None:
+                write_document(conn, self.id, document)
 
         # 重新加载对象
         updated = self.get_by_id(self.id)
@@ -558,10 +676,8 @@ class Post:
             raise ValueError("无法删除未保存的帖子")
 
         db = self._get_db()
-        conn = db.get_connection()
-
-        conn.execute("DELETE FROM posts WHERE id = ?", (self.id,))
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM posts WHERE id = ?", (self.id,))
 
         self.id = None
 
@@ -647,6 +763,7 @@ class Media:
     exif_gps_lat: Optional[float] = None
     exif_gps_lng: Optional[float] = None
     exif_location: Optional[str] = None
+    exif_location_source: Optional[str] = None
 
     _db: Optional[DatabaseConnection] = field(default=None, init=False, repr=False)
 
@@ -695,7 +812,8 @@ class Media:
             exif_focal_length=safe_get('exif_focal_length'),
             exif_gps_lat=safe_get('exif_gps_lat'),
             exif_gps_lng=safe_get('exif_gps_lng'),
-            exif_location=safe_get('exif_location')
+            exif_location=safe_get('exif_location'),
+            exif_location_source=safe_get('exif_location_source')
         )
 
     @classmethod
@@ -760,7 +878,8 @@ class Media:
         exif_focal_length: Optional[float] = None,
         exif_gps_lat: Optional[float] = None,
         exif_gps_lng: Optional[float] = None,
-        exif_location: Optional[str] = None
+        exif_location: Optional[str] = None,
+        exif_location_source: Optional[str] = None
     ) -> 'Media':
         """
         创建新媒体记录
@@ -787,40 +906,71 @@ class Media:
             exif_gps_lat: GPS 纬度
             exif_gps_lng: GPS 经度
             exif_location: 地理位置
+            exif_location_source: 地理位置来源（'online' / 'offline'）
 
         Returns:
             Media 对象
         """
         db = cls._get_db()
-        conn = db.get_connection()
-
-        cursor = conn.execute(
-            """
-            INSERT INTO media (
-                post_id, type, url, file_name, file_path, file_size_bytes,
-                width, height, duration, is_downloaded, download_date,
-                exif_make, exif_model, exif_datetime, exif_iso, exif_aperture,
-                exif_shutter_speed, exif_focal_length, exif_gps_lat, exif_gps_lng, exif_location
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                post_id, type, url, file_name, file_path, file_size_bytes,
-                width, height, duration, is_downloaded, download_date,
-                exif_make, exif_model, exif_datetime, exif_iso, exif_aperture,
-                exif_shutter_speed, exif_focal_length, exif_gps_lat, exif_gps_lng, exif_location
+        with db.transaction() as conn:
+            cursor = conn.execute(
+                f"""
+                INSERT INTO media ({', '.join(MEDIA_COLUMNS)})
+                VALUES ({', '.join('?' * len(MEDIA_COLUMNS))})
+                """,
+                (
+                    post_id, type, url, file_name, file_path, file_size_bytes,
+                    width, height, duration, is_downloaded, download_date,
+                    exif_make, exif_model, exif_datetime, exif_iso, exif_aperture,
+                    exif_shutter_speed, exif_focal_length, exif_gps_lat, exif_gps_lng, exif_location,
+                    exif_location_source
+                )
             )
-        )
-        conn.commit()
 
         return cls.get_by_id(cursor.lastrowid)
 
+    @classmethod
+    def bulk_create(cls, rows: List[Dict[str, Any]]) -> int:
+        """
+        批量创建媒体记录（executemany，一次提交）
+
+        Args:
+            rows: 字段字典列表（键为 MEDIA_COLUMNS 中的列名，缺省为 NULL/默认值）
+
+        Returns:
+            插入的记录数
+        """
+        if not rows:
+            return 0
+
+        db = cls._get_db()
+        with db.transaction() as conn:
+            conn.executemany(
+                f"""
+                INSERT INTO media ({', '.join(MEDIA_COLUMNS)})
+                VALUES ({', '.join('?' * len(MEDIA_COLUMNS))})
+                """,
+                [
+                    tuple(row.get(col, _MEDIA_DEFAULTS.get(col)) for col in MEDIA_COLUMNS)
+                    for row in rows
+                ]
+            )
+
+        return len(rows)
+
+    @classmethod
+    def delete_by_post(cls, post_id: int) -> None:
+        """删除帖子的所有媒体记录（重新同步前清理，避免重复）"""
+        db = cls._get_db()
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM media WHERE post_id = ?", (post_id,))
+
     def update(self, **kwargs):
         """更新媒体信息"""
         if self.id is None:
             raise ValueError("无法更新未保存的媒体")
 
         db = self._get_db()
-        conn = db.get_connection()
 
         update_fields = []
         values = []
@@ -834,8 +984,8 @@ class Media:
 
         values.append(self.id)
         sql = f"UPDATE media SET {', '.join(update_fields)} WHERE id = ?"
-        conn.execute(sql, values)
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute(sql, values)
 
         # 重新加载对象
         updated = self.get_by_id(self.id)
@@ -848,10 +998,8 @@ class Media:
             raise ValueError("无法删除未保存的媒体")
 
         db = self._get_db()
-        conn = db.get_connection()
-
-        conn.execute("DELETE FROM media WHERE id = ?", (self.id,))
-        conn.commit()
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM media WHERE id = ?", (self.id,))
 
         self.id = None
 
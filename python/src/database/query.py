@@ -8,6 +8,12 @@
 from typing import Dict, List, Optional
 from .connection import DatabaseConnection
 from .models import Author, Post, Media
+from .search_index import (
+    query_terms,
+    build_match_query,
+    make_snippet,
+    has_search_index
+)
 
 
 def _get_db() -> DatabaseConnection:
@@ -42,7 +48,7 @@ def get_global_stats(db: Optional[DatabaseConnection] = None) -> dict:
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 基础统计
@@ -148,7 +154,7 @@ def get_author_ranking(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     # 映射排序字段
     order_by_map = {
@@ -238,7 +244,7 @@ def get_monthly_stats(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 构建查询条件
@@ -320,7 +326,7 @@ def get_hourly_distribution(author_name: Optional[str] = None, db: Optional['Dat
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 初始化 24 小时的分布（全部为 0）
@@ -374,7 +380,7 @@ def get_weekday_distribution(author_name: Optional[str] = None, db: Optional['Da
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         distribution = {day: 0 for day in range(7)}
@@ -429,7 +435,7 @@ def get_author_detail_stats(author_name: str, db: Optional['DatabaseConnection']
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     # 设置模型使用的数据库
     Author._db = db
@@ -537,8 +543,11 @@ def search_posts(
     """
     搜索帖子
 
+    有关键词时使用全文索引（标题 + 正文），结果按相关度排序并带摘要；
+    否则按发布时间倒序。
+
     Args:
-        keyword: 关键词（在标题中搜索）
+        keyword: 关键词（搜索标题和正文）
         author_name: 作者名
         start_date: 开始日期
         end_date: 结束日期
@@ -548,17 +557,27 @@ def search_posts(
         offset: 偏移量
 
     Returns:
-        帖子列表
+        帖子列表（全文搜索时额外包含 snippet 摘要和 rank 相关度，越小越相关）
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         conditions = []
         params = []
-
-        if keyword:
+        terms = []
+        match_query = None
+
+        # 全文索引在数据库初始化/打开时建立；索引缺失时退回标题 LIKE 匹配
+        if keyword and has_search_index(conn):
+            terms = query_terms(keyword)
+            match_query = build_match_query(terms)
+
+        if match_query:
+            conditions.append("posts_fts MATCH ?")
+            params.append(match_query)
+        elif keyword:
             conditions.append("posts.title LIKE ?")
             params.append(f"%{keyword}%")
 
@@ -588,28 +607,49 @@ def search_posts(
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-        sql = f"""
-            SELECT
-                posts.id,
-                posts.title,
-                authors.name as author_name,
-                posts.publish_date,
-                posts.image_count,
-                posts.video_count,
-                posts.file_path
-            FROM posts
-            JOIN authors ON posts.author_id = authors.id
-            WHERE {where_clause}
-            ORDER BY posts.publish_date DESC
-            LIMIT ? OFFSET ?
-        """
+        if match_query:
+            # 标题命中权重高于正文
+            sql = f"""
+                SELECT
+                    posts.id,
+                    posts.title,
+                    authors.name as author_name,
+                    posts.publish_date,
+                    posts.image_count,
+                    posts.video_count,
+                    posts.file_path,
+                    posts_fts.text,
+                    bm25(posts_fts, 10.0, 1.0) as rank
+                FROM posts_fts
+                JOIN posts ON posts.id = posts_fts.rowid
+                JOIN authors ON posts.author_id = authors.id
+                WHERE {where_clause}
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+            """
+        else:
+            sql = f"""
+                SELECT
+                    posts.id,
+                    posts.title,
+                    authors.name as author_name,
+                    posts.publish_date,
+                    posts.image_count,
+                    posts.video_count,
+                    posts.file_path
+                FROM posts
+                JOIN authors ON posts.author_id = authors.id
+                WHERE {where_clause}
+                ORDER BY posts.publish_date DESC
+                LIMIT ? OFFSET ?
+            """
 
         params.extend([limit, offset])
         cursor = conn.execute(sql, params)
 
         results = []
         for row in cursor.fetchall():
-            results.append({
+            result = {
                 'id': row[0],
                 'title': row[1],
                 'author_name': row[2],
@@ -617,7 +657,11 @@ def search_posts(
                 'image_count': row[4],
                 'video_count': row[5],
                 'file_path': row[6]
-            })
+            }
+            if match_query:
+                result['snippet'] = make_snippet(row[7], terms)
+                result['rank'] = row[8]
+            results.append(result)
 
         return results
 
@@ -631,7 +675,7 @@ def get_camera_ranking(
     db: Optional['DatabaseConnection'] = None
 ) -> List[dict]:
     """
-    查询相机使用排行（基于 v_camera_stats 视图）
+    查询相机使用排行（读取 mv_camera_stats 物化表，由写入路径在事务末尾刷新）
 
     Args:
         limit: 返回前 N 个相机（默认 10）
@@ -642,12 +686,12 @@ def get_camera_ranking(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         cursor = conn.execute("""
             SELECT make, model, photo_count
-            FROM v_camera_stats
+            FROM mv_camera_stats
             ORDER BY photo_count DESC
             LIMIT ?
         """, (limit,))
@@ -700,7 +744,7 @@ def get_camera_usage_by_authors(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 构建动态 WHERE 条件
@@ -735,7 +779,7 @@ def get_camera_usage_by_authors(
                 avg_iso,
                 avg_aperture,
                 avg_focal_length
-            FROM v_camera_author_usage
+            FROM mv_camera_author_usage
             WHERE {where_clause}
             ORDER BY camera_full, photo_count DESC
             LIMIT ?
@@ -782,7 +826,7 @@ def get_camera_usage_timeline(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 构建动态 WHERE 条件
@@ -812,7 +856,7 @@ def get_camera_usage_timeline(
                 photo_count,
                 post_count,
                 authors
-            FROM v_camera_daily_usage
+            FROM mv_camera_daily_usage
             WHERE {where_clause}
             ORDER BY date DESC
         """, params)
@@ -857,7 +901,7 @@ def get_author_camera_usage(
     """
     if db is None:
         db = _get_db()
-    conn = db.get_connection()
+    conn = db.get_read_connection()
 
     try:
         # 查询作者的所有相机使用情况
@@ -870,7 +914,7 @@ def get_author_camera_usage(
                 post_count,
                 first_use_date,
                 last_use_date
-            FROM v_camera_author_usage
+            FROM mv_camera_author_usage
             WHERE author_name = ?
             ORDER BY photo_count DESC
         """, (author_name,))
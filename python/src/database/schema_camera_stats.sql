@@ -0,0 +1,152 @@
+-- ==================== 相机统计物化表 ====================
+-- 用途: 预先计算 v_camera_stats / v_camera_author_usage / v_camera_daily_usage /
+--       v_author_camera_summary 的结果，相机菜单直接读取汇总行，不再对整个 media 表做聚合
+-- 依赖: media 表 EXIF 字段（schema_v2.sql / DatabaseConnection 打开时补齐）
+--
+-- 增量维护:
+--   触发器把受影响的相机 (make, model) 写入 mv_camera_dirty 队列，
+--   camera_stats.refresh_dirty_camera_stats() 只重算这些相机的汇总行，
+--   以及使用过这些相机的作者的汇总行。
+--   完整重建: python -m src.database.camera_stats
+
+-- 按相机复合索引（重算单个相机时使用）
+CREATE INDEX IF NOT EXISTS idx_media_type_camera ON media(type, exif_make, exif_model);
+
+-- ==================== 表 1: 相机使用统计（对应 v_camera_stats） ====================
+
+CREATE TABLE IF NOT EXISTS mv_camera_stats (
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    photo_count INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    first_use TEXT,
+    last_use TEXT,
+    avg_iso REAL,
+    avg_aperture REAL,
+    avg_focal_length REAL,
+    PRIMARY KEY (make, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_mv_camera_stats_photo_count ON mv_camera_stats(photo_count DESC);
+
+-- ==================== 表 2: 相机与作者关联（对应 v_camera_author_usage） ====================
+
+CREATE TABLE IF NOT EXISTS mv_camera_author_usage (
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    camera_full TEXT NOT NULL,
+    author_id INTEGER NOT NULL,
+    author_name TEXT NOT NULL,
+    photo_count INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    first_use_date TEXT,
+    last_use_date TEXT,
+    avg_iso REAL,
+    avg_aperture REAL,
+    avg_focal_length REAL,
+    PRIMARY KEY (make, model, author_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_mv_camera_author_usage_author ON mv_camera_author_usage(author_name);
+
+-- ==================== 表 3: 相机使用时间线（对应 v_camera_daily_usage） ====================
+
+CREATE TABLE IF NOT EXISTS mv_camera_daily_usage (
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    camera_full TEXT NOT NULL,
+    date TEXT,
+    year INTEGER,
+    month INTEGER,
+    photo_count INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    authors TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_mv_camera_daily_usage_camera ON mv_camera_daily_usage(make, model, date);
+
+-- ==================== 表 4: 作者相机汇总（对应 v_author_camera_summary） ====================
+
+CREATE TABLE IF NOT EXISTS mv_author_camera_summary (
+    author_id INTEGER PRIMARY KEY,
+    author_name TEXT NOT NULL,
+    camera_count INTEGER NOT NULL,
+    camera_list TEXT,
+    most_used_camera TEXT,
+    total_photos INTEGER NOT NULL,
+    total_posts_with_exif INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_mv_author_camera_summary_photos ON mv_author_camera_summary(total_photos DESC);
+
+-- ==================== 待重算相机队列 ====================
+
+CREATE TABLE IF NOT EXISTS mv_camera_dirty (
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    PRIMARY KEY (make, model)
+);
+
+-- ==================== 触发器 ====================
+
+-- 新增图片
+CREATE TRIGGER IF NOT EXISTS trg_mv_camera_media_insert
+AFTER INSERT ON media
+WHEN NEW.type = 'image' AND NEW.exif_make IS NOT NULL AND NEW.exif_model IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model) VALUES (NEW.exif_make, NEW.exif_model);
+END;
+
+-- 删除图片（含删除帖子时的级联删除）
+CREATE TRIGGER IF NOT EXISTS trg_mv_camera_media_delete
+AFTER DELETE ON media
+WHEN OLD.type = 'image' AND OLD.exif_make IS NOT NULL AND OLD.exif_model IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model) VALUES (OLD.exif_make, OLD.exif_model);
+END;
+
+-- EXIF 更新（旧相机和新相机都需要重算）
+CREATE TRIGGER IF NOT EXISTS trg_mv_camera_media_update
+AFTER UPDATE OF type, post_id, exif_make, exif_model, exif_datetime,
+                exif_iso, exif_aperture, exif_focal_length ON media
+BEGIN
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model)
+    SELECT OLD.exif_make, OLD.exif_model
+    WHERE OLD.type = 'image' AND OLD.exif_make IS NOT NULL AND OLD.exif_model IS NOT NULL;
+
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model)
+    SELECT NEW.exif_make, NEW.exif_model
+    WHERE NEW.type = 'image' AND NEW.exif_make IS NOT NULL AND NEW.exif_model IS NOT NULL;
+END;
+
+-- 帖子发布时间或作者变化
+CREATE TRIGGER IF NOT EXISTS trg_mv_camera_post_update
+AFTER UPDATE OF author_id, publish_date, publish_year, publish_month ON posts
+WHEN OLD.author_id IS NOT NEW.author_id
+  OR OLD.publish_date IS NOT NEW.publish_date
+  OR OLD.publish_year IS NOT NEW.publish_year
+  OR OLD.publish_month IS NOT NEW.publish_month
+BEGIN
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model)
+    SELECT DISTINCT exif_make, exif_model
+    FROM media
+    WHERE post_id = NEW.id
+      AND type = 'image'
+      AND exif_make IS NOT NULL
+      AND exif_model IS NOT NULL;
+END;
+
+-- 作者改名
+CREATE TRIGGER IF NOT EXISTS trg_mv_camera_author_rename
+AFTER UPDATE OF name ON authors
+WHEN OLD.name IS NOT NEW.name
+BEGIN
+    INSERT OR IGNORE INTO mv_camera_dirty (make, model)
+    SELECT DISTINCT m.exif_make, m.exif_model
+    FROM media m
+    JOIN posts p ON m.post_id = p.id
+    WHERE p.author_id = NEW.id
+      AND m.type = 'image'
+      AND m.exif_make IS NOT NULL
+      AND m.exif_model IS NOT NULL;
+END;
@@ -0,0 +1,28 @@
+-- ==================== 帖子全文索引 ====================
+-- 用途: search_posts 的关键词搜索（标题 + content.html 正文）
+--
+-- 中文分词: SQLite 自带分词器不识别中文词边界，写入前先用 jieba
+--           (cut_for_search) 切词并以空格连接，再交给 unicode61 分词器。
+-- rowid 与 posts.id 一致。
+--
+-- 列说明:
+--   title: 分词后的标题
+--   body:  分词后的正文
+--   text:  原始正文（不索引，用于生成摘要）
+--
+-- 写入由 Python 维护（sync / migrate / Post.create / Post.update），
+-- 删除帖子时触发器同步删除。
+-- 完整重建: python -m src.database.search_index
+
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title,
+    body,
+    text UNINDEXED,
+    tokenize = 'unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_posts_fts_delete
+AFTER DELETE ON posts
+BEGIN
+    DELETE FROM posts_fts WHERE rowid = OLD.id;
+END;
@@ -21,6 +21,7 @@
 -- ALTER TABLE media ADD COLUMN exif_gps_lat REAL;
 -- ALTER TABLE media ADD COLUMN exif_gps_lng REAL;
 -- ALTER TABLE media ADD COLUMN exif_location TEXT;
+-- ALTER TABLE media ADD COLUMN exif_location_source TEXT;  -- online / offline
 
 -- ==================== 创建索引 ====================
 -- 优化查询性能
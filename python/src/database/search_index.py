@@ -0,0 +1,262 @@
+"""
+帖子全文索引（FTS5 + jieba 预分词）
+
+功能：
+1. 创建 posts_fts 全文索引（schema_search.sql）
+2. 从 content.html 提取正文，jieba 分词后写入索引
+3. 把用户关键词转换为 FTS5 MATCH 表达式，生成高亮摘要
+4. 完整重建索引
+
+使用方法：
+    python -m src.database.search_index          # 完整重建
+"""
+
+import re
+import sys
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import jieba
+
+from .connection import DatabaseConnection, execute_script, get_default_connection
+
+logger = logging.getLogger(__name__)
+
+
+# 摘要长度（字符）和高亮标记
+SNIPPET_LENGTH = 80
+HIGHLIGHT_START = '【'
+HIGHLIGHT_END = '】'
+
+# 重建索引时每批提交的帖子数
+REBUILD_BATCH_SIZE = 200
+
+
+def segment_for_index(text: str) -> str:
+    """
+    中文分词（搜索引擎模式），以空格连接供 unicode61 分词器使用
+
+    与 TextAnalyzer.segment_text 一样使用 jieba，但不过滤停用词和单字，
+    长词同时输出其中的短词（"北京大学" → "北京 大学 北京大学"），
+    保证按短词也能搜到。
+    """
+    if not text:
+        return ''
+    return ' '.join(word for word in jieba.cut_for_search(text) if word.strip())
+
+
+def query_terms(keyword: str) -> List[str]:
+    """
+    关键词分词（去掉纯标点）
+
+    Args:
+        keyword: 用户输入的关键词
+
+    Returns:
+        list: 查询词列表
+    """
+    terms = []
+    for word in jieba.cut(keyword or ''):
+        word = word.strip()
+        if word and any(ch.isalnum() for ch in word) and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def build_match_query(terms: List[str]) -> Optional[str]:
+    """
+    查询词 → FTS5 MATCH 表达式（所有词都必须出现）
+
+    Returns:
+        str: MATCH 表达式，没有有效查询词时返回 None
+    """
+    if not terms:
+        return None
+    return ' AND '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def make_snippet(text: str, terms: List[str], length: int = SNIPPET_LENGTH) -> str:
+    """
+    生成摘要：截取第一个命中词附近的文本，并高亮所有查询词
+
+    Args:
+        text: 原始正文
+        terms: 查询词
+        length: 摘要长度
+
+    Returns:
+        str: 摘要（未命中时为正文开头）
+    """
+    if not text:
+        return ''
+
+    lowered = text.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    first = min(positions) if positions else 0
+
+    start = max(0, first - length // 4)
+    end = min(len(text), start + length)
+    snippet = text[start:end]
+
+    if terms:
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        snippet = pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}", snippet)
+
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+
+
+def extract_post_text(html_path: Path) -> str:
+    """
+    从 content.html 提取正文纯文本（只取 <article>，不含页眉、图片列表和脚本）
+
+    Args:
+        html_path: content.html 路径
+
+    Returns:
+        str: 正文文本（文件不存在或解析失败时为空字符串）
+    """
+    try:
+        from bs4 import BeautifulSoup
+
+        with open(html_path, 'r', encoding='utf-8', errors='ignore') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+
+        root = soup.find('article') or soup.body or soup
+        for tag in root.find_all(['script', 'style']):
+            tag.decompose()
+        return re.sub(r'\s+', ' ', root.get_text(separator=' ', strip=True))
+
+    except (OSError, ImportError) as e:
+        logger.debug(f"读取帖子正文失败: {html_path} - {e}")
+        return ''
+
+
+def prepare_document(title: str, post_dir: Optional[Path]) -> Tuple[str, str, str]:
+    """
+    准备索引文档（分词在事务外完成）
+
+    Args:
+        title: 帖子标题
+        post_dir: 帖子目录（读取其中的 content.html）
+
+    Returns:
+        (分词后的标题, 分词后的正文, 原始正文)
+    """
+    text = extract_post_text(Path(post_dir) / 'content.html') if post_dir else ''
+    return segment_for_index(title or ''), segment_for_index(text), text
+
+
+def write_document(conn, post_id: int, document: Tuple[str, str, str]) -> None:
+    """写入（覆盖）一篇帖子的索引文档，不提交事务"""
+    conn.execute(
+        "INSERT OR REPLACE INTO posts_fts (rowid, title, body, text) VALUES (?, ?, ?, ?)",
+        (post_id,) + tuple(document)
+    )
+
+
+def has_search_index(conn) -> bool:
+    """全文索引是否已创建"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+    ).fetchone() is not None
+
+
+def ensure_search_index(db: DatabaseConnection) -> None:
+    """
+    创建全文索引（首次创建时为已有帖子建立索引）
+
+    打开已有数据库时由 DatabaseConnection 调用，查询路径不会触发建索引。
+
+    Args:
+        db: 数据库连接
+    """
+    conn = db.get_connection()
+    exists = has_search_index(conn)
+
+    schema_file = Path(__file__).parent / 'schema_search.sql'
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        script = f.read()
+    with db.transaction() as tx:
+        execute_script(tx, script)
+
+    if not exists:
+        post_count = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        if post_count:
+            logger.info(f"首次建立全文索引: {post_count} 篇帖子")
+            rebuild_search_index(db)
+
+
+def resolve_post_dir(file_path: Optional[str]) -> Optional[Path]:
+    """posts.file_path → 帖子目录（兼容相对 python/data 的旧路径）"""
+    if not file_path:
+        return None
+    path = Path(file_path)
+    if path.exists():
+        return path
+    data_dir = Path(__file__).parent.parent.parent / 'data'
+    return data_dir / file_path if (data_dir / file_path).exists() else None
+
+
+def rebuild_search_index(db: DatabaseConnection) -> int:
+    """
+    完整重建全文索引
+
+    Args:
+        db: 数据库连接
+
+    Returns:
+        int: 已索引的帖子数
+    """
+    conn = db.get_connection()
+    rows = conn.execute("SELECT id, title, file_path FROM posts").fetchall()
+
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM posts_fts")
+
+    indexed = 0
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        batch = rows[start:start + REBUILD_BATCH_SIZE]
+        documents: Dict[int, Tuple[str, str, str]] = {
+            row[0]: prepare_document(row[1], resolve_post_dir(row[2]))
+            for row in batch
+        }
+        with db.transaction() as conn:
+            for post_id, document in documents.items():
+                write_document(conn, post_id, document)
+        indexed += len(batch)
+
+    return indexed
+
+
+def main():
+    """主函数：完整重建全文索引"""
+    from rich.console import Console
+    console = Console()
+
+    db = get_default_connection()
+
+    console.print("[cyan]正在重建帖子全文索引...[/cyan]")
+    start_time = time.time()
+
+    try:
+        conn = db.get_connection()
+        if has_search_index(conn):
+            indexed = rebuild_search_index(db)
+        else:
+            ensure_search_index(db)
+            indexed = conn.execute("SELECT COUNT(*) FROM posts_fts").fetchone()[0]
+    except Exception as e:
+        console.print(f"[red]❌ 重建失败: {e}[/red]")
+        sys.exit(1)
+
+    console.print(
+        f"[green]✅ 重建完成: {indexed} 篇帖子，"
+        f"耗时 {time.time() - start_time:.1f} 秒[/green]"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -4,22 +4,28 @@
 负责在归档、删除、配置变更等操作时同步更新数据库。
 
 集成点:
-- archiver.py: 归档完成后调用 sync_archived_post()
+- archiver.py: 归档完成后调用 sync_archived_post()（批量场景用 sync_archived_posts()）
 - main_menu.py: 取消关注作者后调用 sync_delete_author()
 - config_manager.py: 配置变更后调用 sync_config_to_db()
 """
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import hashlib
 import logging
 
+from .camera_stats import refresh_dirty_camera_stats
 from .connection import DatabaseConnection
 from .models import Author, Post, Media
+from .search_index import has_search_index, prepare_document, write_document
+from ..utils.post_scanner import scan_post_dir
 
 # 延迟导入 ExifAnalyzer（避免循环依赖）
 _exif_analyzer = None
+_geocode_mode = 'online'
+_geocode_dataset = None
+_geocode_cache = None
 
 def _get_exif_analyzer():
     """获取 EXIF 分析器实例（单例模式）"""
@@ -27,13 +33,64 @@ def _get_exif_analyzer():
     if _exif_analyzer is None:
         try:
             from ..analysis import ExifAnalyzer
-            _exif_analyzer = ExifAnalyzer()
+            _exif_analyzer = ExifAnalyzer(
+                geocode_mode=_geocode_mode,
+                geocode_dataset=_geocode_dataset,
+                geocode_cache=_geocode_cache
+            )
         except ImportError:
             logging.warning("ExifAnalyzer 不可用，EXIF 提取功能将被禁用")
             _exif_analyzer = False
     return _exif_analyzer if _exif_analyzer is not False else None
 
 
+# EXIF 并行提取引擎（进程池常驻，跨帖子复用）
+_exif_engine = None
+_exif_workers = None
+
+
+def configure_exif(
+    workers: Optional[int] = None,
+    geocode_mode: str = 'online',
+    geocode_dataset: Optional[str] = None,
+    geocode_cache=None
+) -> None:
+    """
+    设置同步时的 EXIF 提取进程数和 GPS 反查方式（由 archiver 按配置调用）
+
+    Args:
+        workers: 进程数（None 为 CPU 核数 - 1，<= 1 为单进程）
+        geocode_mode: 'online'（Nominatim，区县级）或 'offline'（内置地点数据集，仅城市级）
+        geocode_dataset: 离线地点数据集路径（None 为内置数据集）
+        geocode_cache: 在线反查持久化缓存 GeocodeCache（None 为默认缓存）
+    """
+    global _exif_analyzer, _exif_engine, _exif_workers
+    global _geocode_mode, _geocode_dataset, _geocode_cache
+    _exif_workers = workers
+    _geocode_mode = geocode_mode
+    _geocode_dataset = geocode_dataset
+    _geocode_cache = geocode_cache
+    _exif_analyzer = None
+    shutdown_exif()
+
+
+def shutdown_exif() -> None:
+    """关闭 EXIF 提取进程池（下次同步时按需重建）"""
+    global _exif_engine
+    if _exif_engine is not None:
+        _exif_engine.close()
+        _exif_engine = None
+
+
+def _get_exif_engine():
+    """获取 EXIF 提取引擎（单例模式）"""
+    global _exif_engine
+    if _exif_engine is None:
+        from ..analysis.exif_engine import ExifExtractionEngine
+        _exif_engine = ExifExtractionEngine(workers=_exif_workers)
+    return _exif_engine
+
+
 def _get_db() -> DatabaseConnection:
     """获取数据库连接"""
     from .connection import get_default_connection
@@ -45,21 +102,6 @@ def _calculate_url_hash(url: str) -> str:
     return hashlib.md5(url.encode('utf-8')).hexdigest()[:8]
 
 
-def _get_directory_size(path: Path) -> int:
-    """递归计算目录大小"""
-    total_size = 0
-    try:
-        for entry in path.rglob('*'):
-            if entry.is_file():
-                try:
-                    total_size += entry.stat().st_size
-                except (OSError, PermissionError):
-                    pass
-    except Exception:
-        pass
-    return total_size
-
-
 # =============================================================================
 # 核心同步函数
 # =============================================================================
@@ -95,6 +137,37 @@ def sync_archived_post(
     Returns:
         bool: 同步是否成功
     """
+    synced = sync_archived_posts(
+        author_name,
+        [{'post_url': post_url, 'post_dir': post_dir, 'metadata': metadata}],
+        db=db
+    )
+    return synced == 1
+
+
+def sync_archived_posts(
+    author_name: str,
+    posts: List[Dict],
+    db: Optional[DatabaseConnection] = None
+) -> int:
+    """
+    批量同步归档帖子（整批一个事务）
+
+    EXIF 提取在事务外完成；写入阶段每篇帖子一次 upsert，媒体记录用
+    executemany 批量插入，整批只提交一次。
+
+    Args:
+        author_name: 作者名
+        posts: 帖子列表，每项为 {'post_url', 'post_dir', 'metadata'}
+            （metadata 格式同 sync_archived_post）
+        db: 数据库连接（可选）
+
+    Returns:
+        int: 成功同步的帖子数（失败时整批回滚，返回 0）
+    """
+    if not posts:
+        return 0
+
     try:
         # 获取数据库连接
         if db is None:
@@ -109,125 +182,72 @@ def sync_archived_post(
         Post._db = db
         Media._db = db
 
-        # 获取或创建作者
-        author = Author.get_by_name(author_name)
-        if author is None:
-            # 作者不存在，创建新作者
-            author = Author.create(
-                name=author_name,
-                added_date=datetime.now().strftime("%Y-%m-%d"),
-                url=f"https://t66y.com/@{author_name}"
-            )
-
         # 准备归档日期（Media 创建时需要）
         archived_date = datetime.now().strftime("%Y-%m-%d")
 
-        # 检查帖子是否已存在
-        if Post.exists(post_url):
-            # 帖子已存在，更新元数据
-            post = Post.get_by_url(post_url)
-            post.update(
-                title=metadata.get('title', post.title),
-                image_count=metadata.get('image_count', post.image_count),
-                video_count=metadata.get('video_count', post.video_count),
-                content_length=metadata.get('content_length', post.content_length),
-                word_count=metadata.get('word_count', post.word_count),
-                file_size_bytes=metadata.get('file_size_bytes', post.file_size_bytes),
-                is_complete=True
-            )
-            # 注意：不要直接返回，继续执行 Media 同步
-        else:
-            # 创建新帖子
-            url_hash = _calculate_url_hash(post_url)
-
-            post = Post.create(
-                author_id=author.id,
-                url=post_url,
-                url_hash=url_hash,
-                title=metadata.get('title', '未知标题'),
-                file_path=str(post_dir),
-                archived_date=archived_date,
-                publish_date=metadata.get('publish_date'),
-                image_count=metadata.get('image_count', 0),
-                video_count=metadata.get('video_count', 0),
-                content_length=metadata.get('content_length', 0),
-                word_count=metadata.get('word_count', 0),
-                file_size_bytes=metadata.get('file_size_bytes', 0),
-                is_complete=True
+        # 阶段一（事务外）：收集媒体记录、提取 EXIF、正文分词
+        conn = db.get_connection()
+        index_enabled = has_search_index(conn)
+        prepared = [
+            (
+                item,
+                _collect_media_rows(item['post_dir'], item['metadata'], archived_date),
+                prepare_document(item['metadata'].get('title', ''), item['post_dir'])
+                if index_enabled else None
             )
+            for item in posts
+        ]
 
-        # 同步媒体文件
-        exif_analyzer = _get_exif_analyzer()
-
-        for img_path in metadata.get('images', []):
-            img_full_path = post_dir / img_path
-            img_size = img_full_path.stat().st_size if img_full_path.exists() else 0
-
-            # 提取 EXIF 数据
-            exif_data = {}
-            if exif_analyzer and img_full_path.exists():
-                try:
-                    exif_data = exif_analyzer.extract_exif(str(img_full_path))
-
-                    # 如果有 GPS 信息，尝试反查地理位置
-                    if 'gps_lat' in exif_data and 'gps_lng' in exif_data:
-                        location = exif_analyzer.reverse_geocode(
-                            exif_data['gps_lat'],
-                            exif_data['gps_lng']
-                        )
-                        if location:
-                            exif_data['location'] = location
-                except Exception as e:
-                    logging.debug(f"提取 EXIF 失败: {img_full_path.name} - {e}")
-
-            Media.create(
-                post_id=post.id,
-                type='image',
-                url=metadata.get('image_urls', {}).get(img_path, f"file://{img_full_path}"),
-                file_name=img_full_path.name,
-                file_path=str(img_full_path),
-                file_size_bytes=img_size,
-                download_date=archived_date,
-                # EXIF 数据
-                exif_make=exif_data.get('make'),
-                exif_model=exif_data.get('model'),
-                exif_datetime=exif_data.get('datetime'),
-                exif_iso=exif_data.get('iso'),
-                exif_aperture=exif_data.get('aperture'),
-                exif_shutter_speed=exif_data.get('shutter_speed'),
-                exif_focal_length=exif_data.get('focal_length'),
-                exif_gps_lat=exif_data.get('gps_lat'),
-                exif_gps_lng=exif_data.get('gps_lng'),
-                exif_location=exif_data.get('location')
+        # 阶段二：单事务写入（持有写锁）
+        with db.transaction() as conn:
+            author_id = Author.get_or_create_id(
+                name=author_name,
+                added_date=archived_date,
+                url=f"https://t66y.com/@{author_name}"
             )
 
-        for vid_path in metadata.get('videos', []):
-            vid_full_path = post_dir / vid_path
-            vid_size = vid_full_path.stat().st_size if vid_full_path.exists() else 0
-
-            Media.create(
-                post_id=post.id,
-                type='video',
-                url=metadata.get('video_urls', {}).get(vid_path, f"file://{vid_full_path}"),
-                file_name=vid_full_path.name,
-                file_path=str(vid_full_path),
-                file_size_bytes=vid_size,
-                download_date=archived_date
+            for item, media_rows, document in prepared:
+                metadata = item['metadata']
+                post_id = Post.upsert(
+                    author_id=author_id,
+                    url=item['post_url'],
+                    url_hash=_calculate_url_hash(item['post_url']),
+                    title=metadata.get('title', '未知标题'),
+                    file_path=str(item['post_dir']),
+                    archived_date=archived_date,
+                    publish_date=metadata.get('publish_date'),
+                    image_count=metadata.get('image_count', 0),
+                    video_count=metadata.get('video_count', 0),
+                    content_length=metadata.get('content_length', 0),
+                    word_count=metadata.get('word_count', 0),
+                    file_size_bytes=metadata.get('file_size_bytes', 0),
+                    is_complete=True
+                )
+
+                # 重新同步时替换媒体记录，避免重复
+                Media.delete_by_post(post_id)
+                for row in media_rows:
+                    row['post_id'] = post_id
+                Media.bulk_create(media_rows)
+
+                # 全文索引（标题 + 正文）
+                if document is not None:
+                    write_document(conn, post_id, document)
+
+            # 记录同步历史
+            conn.execute(
+                """
+                INSERT INTO sync_history (
+                    sync_type, author_name, posts_added, status
+                ) VALUES (?, ?, ?, ?)
+                """,
+                ('archive', author_name, len(posts), 'success')
             )
 
-        # 记录同步历史
-        conn = db.get_connection()
-        conn.execute(
-            """
-            INSERT INTO sync_history (
-                sync_type, author_name, posts_added, status
-            ) VALUES (?, ?, ?, ?)
-            """,
-            ('archive', author_name, 1, 'success')
-        )
-        conn.commit()
+            # 同一事务内刷新受影响相机的统计物化表（查询路径保持只读）
+            refresh_dirty_camera_stats(db)
 
-        return True
+        return len(posts)
 
     except Exception as e:
         print(f"同步归档帖子失败: {e}")
@@ -235,20 +255,109 @@ def sync_archived_post(
         # 记录失败历史
         try:
             if db:
-                conn = db.get_connection()
-                conn.execute(
-                    """
-                    INSERT INTO sync_history (
-                        sync_type, author_name, errors, status, error_message
-                    ) VALUES (?, ?, ?, ?, ?)
-                    """,
-                    ('archive', author_name, 1, 'failed', str(e))
-                )
-                conn.commit()
+                with db.transaction() as conn:
+                    conn.execute(
+                        """
+                        INSERT INTO sync_history (
+                            sync_type, author_name, errors, status, error_message
+                        ) VALUES (?, ?, ?, ?, ?)
+                        """,
+                        ('archive', author_name, len(posts), 'failed', str(e))
+                    )
         except:
             pass
 
-        return False
+        return 0
+
+
+def _collect_media_rows(post_dir: Path, metadata: Dict, archived_date: str) -> List[Dict]:
+    """
+    收集帖子的媒体记录（含 EXIF 和地理位置），不写数据库
+
+    Args:
+        post_dir: 帖子目录路径
+        metadata: 帖子元数据
+        archived_date: 归档日期
+
+    Returns:
+        Media.bulk_create 所需的字段字典列表（不含 post_id）
+    """
+    exif_analyzer = _get_exif_analyzer()
+    rows = []
+
+    # 一次扫描得到所有文件大小（替代逐个 exists + stat）
+    scan = scan_post_dir(post_dir)
+
+    # 并行提取所有图片的 EXIF（进程池，只读 APP1 段）
+    exif_results = {}
+    if exif_analyzer:
+        image_items = [
+            (img_path, str(post_dir / img_path))
+            for img_path in metadata.get('images', [])
+            if Path(img_path).as_posix() in scan.files
+        ]
+        try:
+            exif_results = dict(_get_exif_engine().extract_many(image_items))
+        except Exception as e:
+            logging.debug(f"并行提取 EXIF 失败，跳过: {post_dir} - {e}")
+
+    # GPS 反查在主进程执行（离线模式下整帖一次批量查询）
+    gps_items = [
+        exif_data for exif_data in exif_results.values()
+        if 'gps_lat' in exif_data and 'gps_lng' in exif_data
+    ]
+    if gps_items:
+        try:
+            locations = exif_analyzer.reverse_geocode_many(
+                [(exif_data['gps_lat'], exif_data['gps_lng']) for exif_data in gps_items]
+            )
+            for exif_data, location in zip(gps_items, locations):
+                if location:
+                    exif_data['location'] = location
+                    exif_data['location_source'] = exif_analyzer.geocode_mode
+        except Exception as e:
+            logging.debug(f"GPS 反查失败: {post_dir} - {e}")
+
+    for img_path in metadata.get('images', []):
+        img_full_path = post_dir / img_path
+        img_size = scan.size_of(Path(img_path).as_posix())
+        exif_data = exif_results.get(img_path, {})
+
+        rows.append({
+            'type': 'image',
+            'url': metadata.get('image_urls', {}).get(img_path, f"file://{img_full_path}"),
+            'file_name': img_full_path.name,
+            'file_path': str(img_full_path),
+            'file_size_bytes': img_size,
+            'download_date': archived_date,
+            # EXIF 数据
+            'exif_make': exif_data.get('make'),
+            'exif_model': exif_data.get('model'),
+            'exif_datetime': exif_data.get('datetime'),
+            'exif_iso': exif_data.get('iso'),
+            'exif_aperture': exif_data.get('aperture'),
+            'exif_shutter_speed': exif_data.get('shutter_speed'),
+            'exif_focal_length': exif_data.get('focal_length'),
+            'exif_gps_lat': exif_data.get('gps_lat'),
+            'exif_gps_lng': exif_data.get('gps_lng'),
+            'exif_location': exif_data.get('location'),
+            'exif_location_source': exif_data.get('location_source')
+        })
+
+    for vid_path in metadata.get('videos', []):
+        vid_full_path = post_dir / vid_path
+        vid_size = scan.size_of(Path(vid_path).as_posix())
+
+        rows.append({
+            'type': 'video',
+            'url': metadata.get('video_urls', {}).get(vid_path, f"file://{vid_full_path}"),
+            'file_name': vid_full_path.name,
+            'file_path': str(vid_full_path),
+            'file_size_bytes': vid_size,
+            'download_date': archived_date
+        })
+
+    return rows
 
 
 def sync_delete_author(
@@ -283,20 +392,22 @@ def sync_delete_author(
         if author is None:
             return True  # 作者不存在，视为成功
 
-        # 删除作者（级联删除帖子和媒体）
-        author.delete()
+        with db.transaction() as conn:
+            # 删除作者（级联删除帖子和媒体）
+            author.delete()
+
+            # 记录同步历史
+            conn.execute(
+                """
+                INSERT INTO sync_history (
+                    sync_type, author_name, status
+                ) VALUES (?, ?, ?)
+                """,
+                ('delete_author', author_name, 'success')
+            )
 
-        # 记录同步历史
-        conn = db.get_connection()
-        conn.execute(
-            """
-            INSERT INTO sync_history (
-                sync_type, author_name, status
-            ) VALUES (?, ?, ?)
-            """,
-            ('delete_author', author_name, 'success')
-        )
-        conn.commit()
+            # 级联删除的媒体使相机统计失效
+            refresh_dirty_camera_stats(db)
 
         return True
 
@@ -399,7 +510,8 @@ def sync_all_from_filesystem(
     """
     从文件系统全量同步到数据库
 
-    这是 migrate.import_all_data() 的包装，用于统一接口
+    这是 migrate.import_all_data() 的包装，用于统一接口。
+    增量执行：按 post_manifest 比对目录 stat，只重新解析新增或变化的帖子。
 
     Args:
         archive_path: 归档目录路径
@@ -6,9 +6,15 @@ the Node.js bridge, using Playwright for browser automation.
 Modules:
     utils: Filename sanitization, URL hashing, archive utilities
     extractor: Post list and detail extraction
+    page_pool: Reusable Playwright page pool (lease per operation)
+    download_queue: Global download queue with per-host rate limits
+    file_writer: Streaming file writes off the event loop
+    segmented: Parallel multi-range downloads for large videos
+    media_store: Content-addressed media store (cross-post dedup)
+    media_cache: Persistent URL -> media fingerprint cache
     downloader: Concurrent media downloading with retry
     archiver: Main orchestration layer
 """
 
-__all__ = ['utils', 'extractor', 'downloader', 'archiver']
+__all__ = ['utils', 'page_pool', 'extractor', 'download_queue', 'file_writer', 'segmented', 'media_store', 'media_cache', 'downloader', 'archiver']
 __version__ = '1.0.0-phase2'
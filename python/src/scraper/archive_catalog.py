@@ -0,0 +1,144 @@
+"""Indexed archive catalog (archived post URLs + per-file completion state)
+
+The post directory name depends on the title and date, so checking the
+`.complete` marker requires loading the post page first. The catalog keys
+archived posts by URL, letting the archiver skip them before
+`extract_post_details` (zero page loads), and records completed media files
+so the downloader needs no `.done` probe for files it already knows.
+
+Marker files are still written; on a catalog miss callers fall back to them
+and backfill the catalog, so existing archives migrate on their own.
+
+Paths are stored resolved (absolute), so keys do not depend on the current
+directory when archive_path is relative.
+
+Default location: python/data/archive_catalog.db
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+class ArchiveCatalog:
+    """归档目录索引（帖子 URL → 帖子目录，媒体文件完成状态）"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize catalog
+
+        Args:
+            db_path: SQLite file (default: python/data/archive_catalog.db)
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            db_path = project_root / 'data' / 'archive_catalog.db'
+
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取连接（首次使用时创建数据库，避免构造时产生文件）"""
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS archived_posts (
+                url TEXT PRIMARY KEY,
+                author_name TEXT,
+                post_dir TEXT NOT NULL,
+                title TEXT,
+                archived_at TIMESTAMP NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_archived_posts_author
+                ON archived_posts(author_name);
+            CREATE TABLE IF NOT EXISTS completed_files (
+                path TEXT PRIMARY KEY,
+                completed_at TIMESTAMP NOT NULL
+            );
+        """)
+        self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        """关闭数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _path_key(path: Path) -> str:
+        """统一为绝对路径（相对 archive_path 时不受当前目录影响）"""
+        return str(Path(path).resolve())
+
+    def get_post_dir(self, url: str) -> Optional[Path]:
+        """已归档帖子的目录
+
+        Args:
+            url: Post URL
+
+        Returns:
+            Post directory (None if the URL is not cataloged)
+        """
+        row = self._get_conn().execute(
+            "SELECT post_dir FROM archived_posts WHERE url = ?", (url,)
+        ).fetchone()
+        return Path(row['post_dir']) if row else None
+
+    def is_archived(self, url: str) -> bool:
+        """帖子是否已归档（目录被删除时视为未归档并移除记录）"""
+        post_dir = self.get_post_dir(url)
+        if post_dir is None:
+            return False
+        if not post_dir.is_dir():
+            self.forget_post(url)
+            return False
+        return True
+
+    def mark_archived(self, url: str, post_dir: Path, author_name: Optional[str] = None,
+                      title: Optional[str] = None) -> None:
+        """记录帖子归档完成"""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO archived_posts "
+            "(url, author_name, post_dir, title, archived_at) VALUES (?, ?, ?, ?, ?)",
+            (url, author_name, self._path_key(post_dir), title, datetime.now().isoformat())
+        )
+        conn.commit()
+
+    def forget_post(self, url: str) -> None:
+        """移除帖子记录（下次会重新加载页面检查）"""
+        conn = self._get_conn()
+        conn.execute("DELETE FROM archived_posts WHERE url = ?", (url,))
+        conn.commit()
+
+    def is_file_complete(self, path: Path) -> bool:
+        """媒体文件是否已完整下载（文件被删除时移除记录）"""
+        row = self._get_conn().execute(
+            "SELECT 1 FROM completed_files WHERE path = ?", (self._path_key(path),)
+        ).fetchone()
+        if row is None:
+            return False
+        if not os.path.exists(path):
+            self.forget_file(path)
+            return False
+        return True
+
+    def mark_file_complete(self, path: Path) -> None:
+        """记录媒体文件下载完成"""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO completed_files (path, completed_at) VALUES (?, ?)",
+            (self._path_key(path), datetime.now().isoformat())
+        )
+        conn.commit()
+
+    def forget_file(self, path: Path) -> None:
+        """移除媒体文件记录"""
+        conn = self._get_conn()
+        conn.execute("DELETE FROM completed_files WHERE path = ?", (self._path_key(path),))
+        conn.commit()
@@ -9,6 +9,7 @@ Features:
 - Resume capability (post-level and file-level)
 - Progress tracking with .progress and .complete markers
 - Rate limiting to avoid anti-scraping measures
+- Optional pipeline mode (extraction overlaps with download/render)
 """
 
 import asyncio
@@ -22,6 +23,10 @@ from jinja2 import Environment, FileSystemLoader
 
 from .extractor import PostExtractor
 from .downloader import MediaDownloader
+from .media_store import MediaStore
+from .media_cache import MediaFingerprintCache
+from .archive_catalog import ArchiveCatalog
+from .download_queue import PRIORITY_NEW, PRIORITY_BACKFILL
 from .utils import (
     sanitize_filename,
     should_archive,
@@ -30,6 +35,7 @@ from .utils import (
     save_archive_progress
 )
 from ..utils.logger import setup_logger
+from ..utils.post_scanner import PostScan, scan_post_dir
 from ..data.post_tracker import PostTracker
 
 # Add parent to path for templates import
@@ -40,11 +46,12 @@ from templates.filters import clean_html_content, format_file_size
 class ForumArchiver:
     """论坛归档器（协调 Extractor + Downloader）"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, log_dir: Optional[Path] = None):
         """Initialize archiver
 
         Args:
             config: Configuration dictionary from config.yaml
+            log_dir: Directory for log files (default: <project>/logs)
         """
         self.config = config
 
@@ -57,24 +64,77 @@ class ForumArchiver:
         self.archive_dir = Path(config['storage']['archive_path'])
 
         # Setup logging
-        project_root = Path(__file__).parent.parent.parent.parent
-        log_dir = project_root / 'logs'
-        log_dir.mkdir(exist_ok=True)
+        if log_dir is None:
+            project_root = Path(__file__).parent.parent.parent.parent
+            log_dir = project_root / 'logs'
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
 
         self.logger = setup_logger('archiver', log_dir)
 
         # Initialize sub-components
         self.extractor = PostExtractor(self.base_url, log_dir, config)
+
+        # 可选：内容寻址媒体库（默认放在归档目录下，保证硬链接在同一文件系统）
+        self.media_store = None
+        if config.get('advanced', {}).get('media_store_enabled', False):
+            store_path = config.get('advanced', {}).get('media_store_path') or (
+                self.archive_dir / '.media_store'
+            )
+            self.media_store = MediaStore(Path(store_path), logger=self.logger)
+            self.logger.info(f"媒体库已启用: {store_path}")
+
+        # 媒体指纹缓存（条件请求重新验证已有文件）
+        self.media_cache = None
+        if config.get('advanced', {}).get('media_cache_enabled', True):
+            cache_path = config.get('advanced', {}).get('media_cache_path')
+            self.media_cache = MediaFingerprintCache(Path(cache_path) if cache_path else None)
+
+        # 归档目录索引（已归档的帖子在加载页面前跳过）
+        self.catalog = None
+        if config.get('advanced', {}).get('archive_catalog_enabled', True):
+            catalog_path = config.get('advanced', {}).get('archive_catalog_path')
+            self.catalog = ArchiveCatalog(Path(catalog_path) if catalog_path else None)
+
         self.downloader = MediaDownloader(
             max_concurrent=config.get('advanced', {}).get('max_concurrent', 5),
             retry_count=config.get('advanced', {}).get('download_retry', 3),
             timeout=config.get('advanced', {}).get('download_timeout', 30),
-            log_dir=log_dir
+            log_dir=log_dir,
+            per_host_limit=config.get('advanced', {}).get('download_per_host_limit'),
+            dns_cache_ttl=config.get('advanced', {}).get('download_dns_cache_ttl', 300),
+            keepalive_timeout=config.get('advanced', {}).get('download_keepalive_timeout', 30),
+            host_rate=config.get('advanced', {}).get('download_host_rate', 5.0),
+            host_burst=config.get('advanced', {}).get('download_host_burst', 10.0),
+            fsync_policy=config.get('advanced', {}).get('download_fsync', 'none'),
+            segment_threshold=config.get('advanced', {}).get('video_segment_threshold_mb', 16) * 1024 * 1024,
+            segment_count=config.get('advanced', {}).get('video_segments', 4),
+            media_store=self.media_store,
+            fingerprint_cache=self.media_cache,
+            revalidate=config.get('advanced', {}).get('download_revalidate', False),
+            catalog=self.catalog
         )
+        # 下载优先级：增量新帖优先于全量回填
+        self._download_priority = PRIORITY_BACKFILL
         self.tracker = PostTracker()  # Initialize post tracker for URL hash recording
 
-        # Rate limiting delay
-        self.rate_limit_delay = config.get('advanced', {}).get('rate_limit_delay', 0.5)
+        # 数据库同步时 EXIF 提取进程数和 GPS 反查方式
+        from ..database.sync import configure_exif
+        from ..analysis.geocode_cache import GeocodeCache
+        self.geocode_cache = GeocodeCache.from_config(config)
+        configure_exif(
+            workers=config.get('advanced', {}).get('exif_workers'),
+            geocode_mode=config.get('advanced', {}).get('geocode_mode', 'online'),
+            geocode_dataset=config.get('advanced', {}).get('geocode_dataset'),
+            geocode_cache=self.geocode_cache
+        )
+
+        # Pipeline mode (extraction overlaps with download/render)
+        advanced = config.get('advanced', {})
+        self.pipeline_enabled = advanced.get('pipeline_enabled', False)
+        self.pipeline_extract_workers = advanced.get('pipeline_extract_workers', 2)
+        self.pipeline_download_workers = advanced.get('pipeline_download_workers', 2)
+        self.pipeline_queue_size = advanced.get('pipeline_queue_size', 4)
 
         # Download settings
         self.download_images = config.get('storage', {}).get('download', {}).get('images', True)
@@ -125,14 +185,21 @@ class ForumArchiver:
         self.logger.info(f"=" * 60)
 
         try:
-            # 启动浏览器
+            # 启动浏览器和下载会话
             await self.extractor.start()
+            await self.downloader.start()
+
+            # 增量模式归档的是新帖，下载优先于全量回填
+            self._download_priority = (
+                PRIORITY_NEW if target_urls is not None else PRIORITY_BACKFILL
+            )
 
             # 阶段一：收集所有帖子 URL（带作者过滤）
             if target_urls is not None:
                 # 增量模式：使用指定的 URL 列表
                 post_urls = target_urls
-                forum_total = len(target_urls)
+                total_posts = len(post_urls)
+                forum_total = total_posts
                 self.logger.info("【增量模式】使用指定的帖子 URL 列表")
                 self.logger.info(f"目标帖子数: {forum_total} 篇")
             else:
@@ -155,8 +222,8 @@ class ForumArchiver:
                 forum_total = total_posts
                 self.logger.info(
                     f"作者 {author_name} 的主题帖总数: {forum_total} "
-                f"(只统计楼主原创帖，不含回复)"
-            )
+                    f"(只统计楼主原创帖，不含回复)"
+                )
 
             if total_posts == 0:
                 self.logger.warning(f"未找到任何帖子")
@@ -167,66 +234,24 @@ class ForumArchiver:
                     'failed': 0
                 }
 
-            # 阶段二：逐个处理帖子
+            # 阶段二：处理帖子（顺序模式 / 流水线模式）
             self.logger.info(f"【阶段 2】处理 {total_posts} 篇帖子...")
-            new_posts = 0
-            skipped_posts = 0
-            failed_posts = 0
-            archived_urls = []  # 记录成功归档的URL（用于batch记录）
-
-            for idx, post_url in enumerate(post_urls, 1):
-                self.logger.info(f"\n--- 帖子 {idx}/{total_posts} ---")
-
-                try:
-                    # 提取帖子详情
-                    post_data = await self.extractor.extract_post_details(post_url)
+            stats = {
+                'new': 0,
+                'skipped': 0,
+                'failed': 0,
+                'archived_urls': []  # 记录成功归档的URL（用于batch记录）
+            }
 
-                    if not post_data:
-                        self.logger.error(f"提取失败，跳过帖子: {post_url}")
-                        failed_posts += 1
-                        continue
-
-                    # 验证作者名是否匹配（忽略大小写和空格）
-                    actual_author = post_data['author'].strip()
-                    expected_author = author_name.strip()
-                    if actual_author.lower() != expected_author.lower():
-                        self.logger.warning(
-                            f"⚠ 作者不匹配，跳过: {post_data['title']} "
-                            f"(实际作者: {actual_author}, 期望: {expected_author})"
-                        )
-                        skipped_posts += 1
-                        continue
-
-                    # 计算目录路径
-                    post_dir = self._get_post_directory(author_name, post_data)
-
-                    # 增量检查
-                    if not should_archive(post_dir, post_url):
-                        self.logger.info(f"✓ 跳过已归档: {post_data['title']}")
-                        skipped_posts += 1
-                        # 已归档的URL也需要记录到tracker（确保数据完整）
-                        archived_urls.append(post_url)
-                        continue
-
-                    # 归档帖子
-                    success = await self._archive_post(post_dir, post_data)
-
-                    if success:
-                        new_posts += 1
-                        archived_urls.append(post_url)  # 记录成功归档的URL
-                        self.logger.info(f"✓ 归档成功: {post_data['title']}")
-                    else:
-                        failed_posts += 1
-                        self.logger.error(f"✗ 归档失败: {post_data['title']}")
-
-                    # 防反爬延迟
-                    if idx < total_posts:
-                        await asyncio.sleep(self.rate_limit_delay)
+            if self.pipeline_enabled:
+                await self._archive_posts_pipelined(author_name, post_urls, stats)
+            else:
+                await self._archive_posts_sequential(author_name, post_urls, stats)
 
-                except Exception as e:
-                    self.logger.error(f"处理帖子失败: {str(e)}")
-                    failed_posts += 1
-                    continue
+            new_posts = stats['new']
+            skipped_posts = stats['skipped']
+            failed_posts = stats['failed']
+            archived_urls = stats['archived_urls']
 
             # 批量记录已归档的URL到tracker（用于新帖检测）
             if archived_urls:
@@ -255,7 +280,201 @@ class ForumArchiver:
             raise
 
         finally:
+            await self.downloader.close()
             await self.extractor.close()
+            self._close_resources()
+
+    def _close_resources(self) -> None:
+        """关闭本次归档打开的 SQLite 句柄和 EXIF 进程池（下次使用时按需重新打开）"""
+        from ..database.sync import shutdown_exif
+        shutdown_exif()
+
+        for resource in (self.media_store, self.media_cache, self.catalog, self.geocode_cache):
+            if resource is None:
+                continue
+            try:
+                resource.close()
+            except Exception as e:
+                self.logger.warning(f"关闭 {type(resource).__name__} 失败: {str(e)}")
+
+    async def _archive_posts_sequential(
+        self,
+        author_name: str,
+        post_urls: List[str],
+        stats: Dict
+    ) -> None:
+        """顺序模式：逐篇提取 → 下载 → 生成 HTML
+
+        Args:
+            author_name: Author name
+            post_urls: Post URLs to process
+            stats: Statistics dict to update in place
+        """
+        total_posts = len(post_urls)
+
+        for idx, post_url in enumerate(post_urls, 1):
+            self.logger.info(f"\n--- 帖子 {idx}/{total_posts} ---")
+
+            if self._skip_cataloged(post_url, stats):
+                continue
+
+            try:
+                # 提取帖子详情
+                post_data = await self.extractor.extract_post_details(post_url)
+
+                # 防反爬间隔由 extractor 的自适应节流统一控制
+                await self._handle_post(author_name, post_url, post_data, stats)
+
+            except Exception as e:
+                self.logger.error(f"处理帖子失败: {str(e)}")
+                stats['failed'] += 1
+                continue
+
+    async def _archive_posts_pipelined(
+        self,
+        author_name: str,
+        post_urls: List[str],
+        stats: Dict
+    ) -> None:
+        """流水线模式：提取与下载/生成 HTML 并发进行
+
+        生产者：从页面池租用页面并发提取帖子详情（共享自适应节流），结果放入有界队列
+        消费者：从队列取出帖子，下载媒体并生成 content.html
+
+        总耗时接近最慢阶段的耗时，而不是各阶段耗时之和。
+
+        Args:
+            author_name: Author name
+            post_urls: Post URLs to process
+            stats: Statistics dict to update in place
+        """
+        total_posts = len(post_urls)
+        # 提取并发受页面池大小限制（每个提取任务租用一个页面）
+        extract_workers = max(1, min(
+            self.pipeline_extract_workers,
+            self.extractor.pool_size,
+            total_posts
+        ))
+        download_workers = max(1, self.pipeline_download_workers)
+
+        self.logger.info(
+            f"流水线模式: {extract_workers} 个提取页面, "
+            f"{download_workers} 个下载任务, 队列上限 {self.pipeline_queue_size}"
+        )
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        url_iter = iter(enumerate(post_urls, 1))
+
+        async def producer():
+            for idx, post_url in url_iter:
+                if self._skip_cataloged(post_url, stats):
+                    continue
+                try:
+                    self.logger.info(f"\n--- 提取帖子 {idx}/{total_posts} ---")
+                    post_data = await self.extractor.extract_post_details(post_url)
+                except Exception as e:
+                    self.logger.error(f"提取帖子失败: {str(e)}")
+                    post_data = None
+                await queue.put((idx, post_url, post_data))
+
+        async def consumer():
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    idx, post_url, post_data = item
+                    await self._handle_post(author_name, post_url, post_data, stats)
+                except Exception as e:
+                    self.logger.error(f"处理帖子失败: {str(e)}")
+                    stats['failed'] += 1
+                finally:
+                    queue.task_done()
+
+        consumers = [asyncio.create_task(consumer()) for _ in range(download_workers)]
+        try:
+            await asyncio.gather(*(producer() for _ in range(extract_workers)))
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for task in consumers:
+                task.cancel()
+
+    def _skip_cataloged(self, post_url: str, stats: Dict) -> bool:
+        """目录索引中已归档的帖子直接跳过（不加载页面）
+
+        Returns:
+            True if the post was skipped
+        """
+        if self.catalog is None or not self.catalog.is_archived(post_url):
+            return False
+
+        self.logger.info(f"✓ 跳过已归档（目录索引）: {post_url}")
+        stats['skipped'] += 1
+        stats['archived_urls'].append(post_url)
+        return True
+
+    async def _handle_post(
+        self,
+        author_name: str,
+        post_url: str,
+        post_data: Optional[Dict],
+        stats: Dict
+    ) -> bool:
+        """校验并归档一篇已提取的帖子，更新统计
+
+        Args:
+            author_name: Expected author name
+            post_url: Post URL
+            post_data: Extracted post data (None if extraction failed)
+            stats: Statistics dict to update in place
+
+        Returns:
+            True if an archive attempt was made
+        """
+        if not post_data:
+            self.logger.error(f"提取失败，跳过帖子: {post_url}")
+            stats['failed'] += 1
+            return False
+
+        # 验证作者名是否匹配（忽略大小写和空格）
+        actual_author = post_data['author'].strip()
+        expected_author = author_name.strip()
+        if actual_author.lower() != expected_author.lower():
+            self.logger.warning(
+                f"⚠ 作者不匹配，跳过: {post_data['title']} "
+                f"(实际作者: {actual_author}, 期望: {expected_author})"
+            )
+            stats['skipped'] += 1
+            return False
+
+        # 计算目录路径
+        post_dir = self._get_post_directory(author_name, post_data)
+
+        # 增量检查
+        if not should_archive(post_dir, post_url):
+            self.logger.info(f"✓ 跳过已归档: {post_data['title']}")
+            stats['skipped'] += 1
+            # 补录到目录索引，下次不再加载页面
+            if self.catalog is not None:
+                self.catalog.mark_archived(post_url, post_dir, author_name, post_data['title'])
+            # 已归档的URL也需要记录到tracker（确保数据完整）
+            stats['archived_urls'].append(post_url)
+            return False
+
+        # 归档帖子
+        success = await self._archive_post(post_dir, post_data)
+
+        if success:
+            stats['new'] += 1
+            stats['archived_urls'].append(post_url)  # 记录成功归档的URL
+            self.logger.info(f"✓ 归档成功: {post_data['title']}")
+        else:
+            stats['failed'] += 1
+            self.logger.error(f"✗ 归档失败: {post_data['title']}")
+
+        return True
 
     async def _archive_post(self, post_dir: Path, post_data: Dict) -> bool:
         """归档单个帖子（带断点续传）
@@ -284,7 +503,8 @@ class ForumArchiver:
                 results = await self.downloader.download_files(
                     post_data['images'],
                     photo_dir,
-                    prefix='img_'
+                    prefix='img_',
+                    priority=self._download_priority
                 )
 
                 progress['images_done'] = True
@@ -305,7 +525,8 @@ class ForumArchiver:
                 results = await self.downloader.download_files(
                     post_data['videos'],
                     video_dir,
-                    prefix='video_'
+                    prefix='video_',
+                    priority=self._download_priority
                 )
 
                 progress['videos_done'] = True
@@ -327,6 +548,10 @@ class ForumArchiver:
 
             # 所有步骤完成，标记完成并删除进度文件
             mark_complete(post_dir, post_data['url'])
+            if self.catalog is not None:
+                self.catalog.mark_archived(
+                    post_data['url'], post_dir, post_data.get('author'), post_data.get('title')
+                )
 
             progress_file = post_dir / '.progress'
             if progress_file.exists():
@@ -337,35 +562,10 @@ class ForumArchiver:
                 from ..database.sync import sync_archived_post
 
                 # 准备同步元数据
-                # 计算目录大小
-                dir_size = 0
-                try:
-                    for f in post_dir.rglob('*'):
-                        if f.is_file():
-                            dir_size += f.stat().st_size
-                except:
-                    pass
-
-                # 收集已下载的图片文件（相对路径）
-                image_files = []
-                photo_dir = post_dir / 'photo'
-                if photo_dir.exists():
-                    for img_file in sorted(photo_dir.glob('img_*.jpg')):
-                        image_files.append(f"photo/{img_file.name}")
-                    for img_file in sorted(photo_dir.glob('img_*.png')):
-                        image_files.append(f"photo/{img_file.name}")
-                    for img_file in sorted(photo_dir.glob('img_*.jpeg')):
-                        image_files.append(f"photo/{img_file.name}")
-                    for img_file in sorted(photo_dir.glob('img_*.webp')):
-                        image_files.append(f"photo/{img_file.name}")
-
-                # 收集已下载的视频文件（相对路径）
-                video_files = []
-                video_dir = post_dir / 'video'
-                if video_dir.exists():
-                    for vid_file in sorted(video_dir.glob('video_*')):
-                        if not vid_file.name.endswith('.done'):
-                            video_files.append(f"video/{vid_file.name}")
+                # 一次扫描得到目录大小和已下载的媒体文件（相对路径）
+                scan = await asyncio.to_thread(scan_post_dir, post_dir)
+                image_files = scan.images
+                video_files = scan.videos
 
                 sync_metadata = {
                     'title': post_data.get('title', ''),
@@ -375,10 +575,13 @@ class ForumArchiver:
                     'images': image_files,  # 使用实际文件相对路径
                     'videos': video_files,  # 使用实际文件相对路径
                     'content_length': len(post_data.get('content', '')),
-                    'file_size_bytes': dir_size
+                    'file_size_bytes': scan.total_size
                 }
 
-                sync_archived_post(
+                # 数据库写入、媒体整理和全文分词都是同步操作，放到线程中执行，
+                # 避免阻塞流水线中其他帖子的提取和下载
+                await asyncio.to_thread(
+                    sync_archived_post,
                     author_name=post_data.get('author', 'Unknown'),
                     post_url=post_data['url'],
                     post_dir=post_dir,
@@ -395,7 +598,8 @@ class ForumArchiver:
             self.logger.error(f"归档帖子失败: {str(e)}", exc_info=True)
             return False
 
-    def _prepare_media_list(self, media_urls: List[str], media_type: str, post_dir: Path, post_url: str = None) -> List[Dict]:
+    def _prepare_media_list(self, media_urls: List[str], media_type: str, post_dir: Path,
+                            post_url: str = None, scan: Optional[PostScan] = None) -> List[Dict]:
         """准备媒体文件列表（用于模板）
 
         Args:
@@ -403,6 +607,7 @@ class ForumArchiver:
             media_type: 'image' 或 'video'
             post_dir: 帖子目录
             post_url: 帖子 URL（用于查询 EXIF 数据）
+            scan: 帖子目录扫描结果（None 时重新扫描）
 
         Returns:
             [{'filename': 'img_1.jpg', 'url': '...', 'size': '1.2 MB', 'exif': {...}}, ...]
@@ -411,15 +616,17 @@ class ForumArchiver:
 
         # 确定子目录和文件前缀
         if media_type == 'image':
-            subdir = post_dir / 'photo'
+            subdir = 'photo'
             prefix = 'img_'
             extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
         else:  # video
-            subdir = post_dir / 'video'
+            subdir = 'video'
             prefix = 'video_'
             extensions = ['.mp4', '.avi', '.mkv', '.webm', '.mov']
 
-        if not subdir.exists():
+        if scan is None:
+            scan = scan_post_dir(post_dir)
+        if subdir not in scan.dirs:
             return []
 
         # 如果是图片，尝试从数据库加载 EXIF 数据
@@ -435,10 +642,10 @@ class ForumArchiver:
 
             # 方法1：按索引匹配（img_1.jpg, img_2.jpg...）
             for ext in extensions:
-                candidate = subdir / f"{prefix}{idx}{ext}"
-                if candidate.exists():
+                candidate = f"{subdir}/{prefix}{idx}{ext}"
+                if candidate in scan.files:
                     filename = f"{prefix}{idx}{ext}"
-                    file_size = candidate.stat().st_size
+                    file_size = scan.size_of(candidate)
                     break
 
             # 如果找不到，使用占位
@@ -531,8 +738,9 @@ class ForumArchiver:
             post_dir: 帖子目录
         """
         try:
-            # 准备模板数据
+            # 准备模板数据（图片和视频共用一次目录扫描）
             post_url = post_data.get('url', '')
+            scan = scan_post_dir(post_dir)
             template_data = {
                 'title': post_data.get('title', '无标题'),
                 'author': post_data.get('author', '未知作者'),
@@ -545,13 +753,15 @@ class ForumArchiver:
                     post_data.get('images', []),
                     'image',
                     post_dir,
-                    post_url
+                    post_url,
+                    scan
                 ),
                 'videos': self._prepare_media_list(
                     post_data.get('videos', []),
                     'video',
                     post_dir,
-                    post_url
+                    post_url,
+                    scan
                 )
             }
 
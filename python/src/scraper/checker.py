@@ -2,12 +2,16 @@
 
 用于快速检测作者是否有新帖，无需下载内容。
 使用PostTracker进行基于URL Hash的精确检测。
+
+列表页按发帖时间倒序，逐页扫描并在第一个全部为旧帖的页面停止：
+没有新帖的作者只需加载一页。
 """
 import asyncio
+from contextlib import aclosing
 from typing import List, Dict, Optional
 from pathlib import Path
 
-from ..data.post_tracker import PostTracker, generate_url_hash
+from ..data.post_tracker import PostTracker, generate_url_hash, extract_thread_id
 
 
 class PostChecker:
@@ -17,7 +21,7 @@ class PostChecker:
     1. 使用Playwright扫描论坛
     2. 收集作者的帖子URL
     3. 调用PostTracker检测新帖
-    4. 支持批量并发检测
+    4. 支持批量并发检测（每个作者从 PostExtractor 页面池租用独立页面）
     """
 
     def __init__(self, config: dict, extractor=None):
@@ -42,7 +46,7 @@ class PostChecker:
             log_dir = project_root / 'logs'
             log_dir.mkdir(exist_ok=True)
 
-            self.extractor = PostExtractor(self.base_url, log_dir)
+            self.extractor = PostExtractor(self.base_url, log_dir, self.config)
             await self.extractor.start()
 
     async def close(self):
@@ -56,12 +60,12 @@ class PostChecker:
         author_url: str,
         max_pages: Optional[int] = 3
     ) -> Dict:
-        """检测单个作者的新帖子（方案C实现）
+        """检测单个作者的新帖子（方案C实现，遇到全是旧帖的页面即停止）
 
         Args:
             author_name: 作者名
             author_url: 作者URL（用于构造搜索URL）
-            max_pages: 最多扫描的页数（None=全部，建议设置如3页）
+            max_pages: 最多扫描的页数（None=不限，直到遇到旧帖页或没有下一页）
 
         Returns:
             {
@@ -69,36 +73,11 @@ class PostChecker:
                 'new_count': 5,
                 'new_urls': ['url1', 'url2', ...],
                 'total_forum': 120,
-                'total_archived': 80
+                'total_archived': 80,
+                'pages_scanned': 1
             }
         """
-        if not self.extractor:
-            raise RuntimeError("检测器未启动，请先调用 start()")
-
-        # 1. 获取已归档的hash集合（O(1)查找）
-        archived_hashes = self.tracker.get_archived_hashes(author_name)
-
-        # 2. 从论坛收集帖子URL（限制扫描深度）
-        try:
-            forum_urls = await self.extractor.collect_post_urls(
-                author_url,
-                max_pages=max_pages
-            )
-        except Exception as e:
-            # 扫描失败，返回错误信息
-            return {
-                'has_new': False,
-                'new_count': 0,
-                'new_urls': [],
-                'total_forum': 0,
-                'total_archived': len(archived_hashes),
-                'error': str(e)
-            }
-
-        # 3. 使用tracker检测新帖
-        result = self.tracker.check_new_posts(author_name, forum_urls)
-
-        return result
+        return await self._scan_new_posts(author_name, author_url, max_pages, stop_on_old=1)
 
     async def batch_check_authors(
         self,
@@ -111,7 +90,7 @@ class PostChecker:
         Args:
             authors: 作者列表，每个作者是一个字典 {'name': '...', 'url': '...'}
             max_pages: 每个作者最多扫描页数（减少扫描时间）
-            max_concurrent: 最大并发数（避免过载）
+            max_concurrent: 最大并发数（避免过载，实际并发还受页面池大小限制）
 
         Returns:
             {
@@ -151,65 +130,80 @@ class PostChecker:
         self,
         author_name: str,
         author_url: str,
-        stop_on_old: int = 2
+        stop_on_old: int = 1,
+        max_pages: Optional[int] = 5
     ) -> Dict:
-        """增量检测：遇到已归档帖子就提前停止（性能优化）
+        """增量检测：连续遇到 stop_on_old 页旧帖就停止
 
         Args:
             author_name: 作者名
             author_url: 作者URL
             stop_on_old: 连续遇到多少页旧帖就停止扫描
+            max_pages: 最多扫描的页数（None=不限）
 
         Returns:
             检测结果字典（同check_new_posts）
         """
+        return await self._scan_new_posts(author_name, author_url, max_pages, stop_on_old)
+
+    async def _scan_new_posts(
+        self,
+        author_name: str,
+        author_url: str,
+        max_pages: Optional[int],
+        stop_on_old: int
+    ) -> Dict:
+        """逐页扫描列表，遇到旧帖页提前停止
+
+        旧帖：URL hash 已归档，或主题ID不超过作者的高水位（已归档的最大主题ID）。
+        新帖仍按 hash 判定，扫描到的页面中未归档的帖子都会返回。
+        """
         if not self.extractor:
             raise RuntimeError("检测器未启动，请先调用 start()")
 
         archived_hashes = self.tracker.get_archived_hashes(author_name)
-        all_forum_urls = []
+        high_water = self.tracker.get_high_water(author_name)
+
+        def is_old(url: str) -> bool:
+            if generate_url_hash(url) in archived_hashes:
+                return True
+            thread_id = extract_thread_id(url)
+            return high_water is not None and thread_id is not None and thread_id <= high_water
+
+        forum_urls = []
+        pages_scanned = 0
         consecutive_old_pages = 0
-        page = 1
 
         try:
-            # 逐页扫描，遇到旧帖就停止
-            while page <= 5:  # 最多5页
-                page_urls = await self.extractor.collect_post_urls(
-                    author_url,
-                    max_pages=1  # 一页一页扫描
-                )
-
-                if not page_urls:
-                    break
-
-                # 检查本页是否有新帖
-                page_has_new = False
-                for url in page_urls:
-                    hash_value = generate_url_hash(url)
-                    if hash_value not in archived_hashes:
-                        page_has_new = True
-                    all_forum_urls.append(url)
-
-                if not page_has_new:
-                    consecutive_old_pages += 1
-                    if consecutive_old_pages >= stop_on_old:
-                        # 连续N页都是旧帖，停止扫描
+            pages = self.extractor.iter_listing_pages(author_url)
+            async with aclosing(pages):
+                async for page_urls in pages:
+                    pages_scanned += 1
+                    forum_urls.extend(page_urls)
+
+                    if all(is_old(url) for url in page_urls):
+                        consecutive_old_pages += 1
+                        if consecutive_old_pages >= stop_on_old:
+                            break
+                    else:
+                        consecutive_old_pages = 0
+
+                    if max_pages and pages_scanned >= max_pages:
                         break
-                else:
-                    consecutive_old_pages = 0
-
-                page += 1
 
         except Exception as e:
+            # 扫描失败，返回错误信息
             return {
                 'has_new': False,
                 'new_count': 0,
                 'new_urls': [],
-                'total_forum': len(all_forum_urls),
+                'total_forum': len(forum_urls),
                 'total_archived': len(archived_hashes),
+                'pages_scanned': pages_scanned,
                 'error': str(e)
             }
 
         # 使用tracker检测新帖
-        result = self.tracker.check_new_posts(author_name, all_forum_urls)
+        result = self.tracker.check_new_posts(author_name, forum_urls)
+        result['pages_scanned'] = pages_scanned
         return result
@@ -0,0 +1,266 @@
+"""Global download queue with per-host concurrency and rate limits
+
+Posts submit media jobs to one long-lived queue instead of awaiting their
+own short-lived batch, so transfers keep flowing across post boundaries.
+
+Features:
+- One lane per destination host (own priority heap and token bucket)
+- Per-host concurrency cap and token-bucket rate limit
+- Global concurrency cap across all hosts (one shared worker pool)
+- Priorities: new posts before backfill, images before videos. Priority is
+  global: a free worker takes the highest-priority job across all hosts
+  whose host is under its cap and has a token, so a new post on one host
+  never waits behind backfill on another.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# 帖子优先级（数值越小越先下载）
+PRIORITY_NEW = 0
+PRIORITY_BACKFILL = 1
+
+# 媒体优先级：图片先于视频
+MEDIA_PRIORITY = {
+    'image': 0,
+    'video': 1
+}
+
+
+class TokenBucket:
+    """令牌桶限速器"""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize token bucket
+
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """取出一个令牌（不足时等待）"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                wait = self.try_acquire()
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def try_acquire(self) -> float:
+        """不等待地取出一个令牌
+
+        Returns:
+            0 表示已取得令牌，否则为下一个令牌可用前需要等待的秒数
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+@dataclass(order=True)
+class DownloadJob:
+    """下载任务（按 sort_key 排序）"""
+
+    sort_key: tuple
+    url: str = field(compare=False)
+    output_path: Path = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _HostLane:
+    """单个主机的下载通道"""
+
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        self.jobs: List[DownloadJob] = []   # 按 sort_key 排序的堆
+        self.bucket = TokenBucket(rate, burst)
+        self.active = 0
+
+
+class DownloadQueue:
+    """全局下载队列（跨帖子调度，按主机限流）"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Path], Awaitable[bool]],
+        max_concurrent: int,
+        per_host_limit: int,
+        host_rate: float = 5.0,
+        host_burst: float = 10.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize download queue
+
+        Args:
+            fetch: Coroutine function that downloads one URL to a path
+            max_concurrent: Maximum transfers in flight across all hosts
+            per_host_limit: Maximum transfers in flight per host
+            host_rate: Requests per second allowed per host (<= 0 = unlimited)
+            host_burst: Token bucket capacity per host
+            logger: Logger (optional)
+        """
+        self.fetch = fetch
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_host_limit = max(1, per_host_limit)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lanes: Dict[str, _HostLane] = {}
+        self._seq = itertools.count()
+
+    async def start(self) -> None:
+        """启动队列（创建全局 worker）"""
+        if not self._workers:
+            self._wakeup = asyncio.Event()
+            self._workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(self.max_concurrent)
+            ]
+
+    async def close(self) -> None:
+        """停止所有 worker，未完成的任务返回失败"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for lane in self._lanes.values():
+            for job in lane.jobs:
+                if not job.future.done():
+                    job.future.set_result(False)
+
+        self._lanes.clear()
+        self._wakeup = None
+
+    def submit(
+        self,
+        url: str,
+        output_path: Path,
+        priority: int = PRIORITY_BACKFILL,
+        media_type: str = 'image'
+    ) -> asyncio.Future:
+        """提交下载任务
+
+        Args:
+            url: File URL
+            output_path: Output file path
+            priority: PRIORITY_NEW or PRIORITY_BACKFILL
+            media_type: 'image' or 'video'
+
+        Returns:
+            Future resolving to True/False (download success)
+        """
+        if not self._workers:
+            raise RuntimeError("下载队列未启动，请先调用 start()")
+
+        future = asyncio.get_running_loop().create_future()
+        job = DownloadJob(
+            sort_key=(priority, MEDIA_PRIORITY.get(media_type, 0), next(self._seq)),
+            url=url,
+            output_path=output_path,
+            future=future
+        )
+        heapq.heappush(self._get_lane(url).jobs, job)
+        self._wakeup.set()
+        return future
+
+    def pending_count(self) -> int:
+        """排队中的任务数"""
+        return sum(len(lane.jobs) for lane in self._lanes.values())
+
+    def _get_lane(self, url: str) -> _HostLane:
+        """获取（或创建）URL 所属主机的通道"""
+        host = urlparse(url).netloc.lower()
+        lane = self._lanes.get(host)
+        if lane is None:
+            lane = _HostLane(host, self.host_rate, self.host_burst)
+            self._lanes[host] = lane
+            self.logger.debug(f"新建下载通道: {host}")
+        return lane
+
+    def _next_job(self) -> Tuple[Optional[_HostLane], Optional[DownloadJob], Optional[float]]:
+        """选出下一个可以开始的任务
+
+        按各主机队首任务的优先级从高到低尝试：主机未达并发上限且取得令牌即可开始。
+        优先级最高的主机被限速时，其他主机的任务照常开始。
+
+        Returns:
+            (通道, 任务, None)；没有可开始的任务时为 (None, None, 最近一个令牌的等待秒数)
+        """
+        lanes = sorted(
+            (lane for lane in self._lanes.values()
+             if lane.jobs and lane.active < self.per_host_limit),
+            key=lambda lane: lane.jobs[0].sort_key
+        )
+        retry_in = None
+        for lane in lanes:
+            wait = lane.bucket.try_acquire()
+            if wait > 0:
+                retry_in = wait if retry_in is None else min(retry_in, wait)
+                continue
+            lane.active += 1
+            return lane, heapq.heappop(lane.jobs), None
+        return None, None, retry_in
+
+    async def _worker(self) -> None:
+        """全局 worker：取所有主机中优先级最高的可开始任务 → 下载"""
+        while True:
+            lane, job, retry_in = self._next_job()
+            if job is None:
+                # 等待新任务、有任务结束（主机空出并发槽）或令牌恢复
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), retry_in)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                if job.future.done():
+                    continue
+
+                result = await self.fetch(job.url, job.output_path)
+
+                if not job.future.done():
+                    job.future.set_result(result)
+
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.set_result(False)
+                raise
+            except Exception as e:
+                self.logger.error(f"下载任务异常 {job.url}: {str(e)}")
+                if not job.future.done():
+                    job.future.set_result(False)
+            finally:
+                lane.active -= 1
+                self._wakeup.set()
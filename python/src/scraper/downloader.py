@@ -1,11 +1,17 @@
 """Media downloader with concurrent download, retry, and resume support
 
 Features:
-- Concurrent downloads with semaphore control
+- Shared ClientSession with pooled keep-alive connections and DNS cache
+- Global cross-post download queue with per-host concurrency/rate limits
+- Concurrent downloads with semaphore control (standalone use)
 - Automatic retry on failure
 - Resume capability (HTTP Range requests)
+- Parallel segmented (multi-range) downloads for large videos
+- Optional content-addressed media store (cross-post deduplication)
+- Persistent fingerprint cache with conditional requests (304 skips body)
+- Streaming writes off the event loop with adaptive chunk size
 - Progress bar with tqdm
-- File completion markers
+- File completion markers (indexed in the archive catalog when enabled)
 """
 
 import asyncio
@@ -16,6 +22,12 @@ from tqdm.asyncio import tqdm
 import os
 
 from ..utils.logger import setup_logger
+from .download_queue import DownloadQueue, PRIORITY_BACKFILL
+from .file_writer import StreamingFileWriter, choose_chunk_size
+from .segmented import SegmentedDownload
+from .media_store import MediaStore, file_sha256
+from .media_cache import MediaFingerprintCache
+from .archive_catalog import ArchiveCatalog
 
 
 class MediaDownloader:
@@ -26,7 +38,19 @@ class MediaDownloader:
         max_concurrent: int,
         retry_count: int,
         timeout: int,
-        log_dir: Path
+        log_dir: Path,
+        per_host_limit: Optional[int] = None,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: int = 30,
+        host_rate: float = 5.0,
+        host_burst: float = 10.0,
+        fsync_policy: str = 'none',
+        segment_threshold: int = 16 * 1024 * 1024,
+        segment_count: int = 4,
+        media_store: Optional[MediaStore] = None,
+        fingerprint_cache: Optional[MediaFingerprintCache] = None,
+        revalidate: bool = False,
+        catalog: Optional[ArchiveCatalog] = None
     ):
         """Initialize downloader
 
@@ -35,25 +59,106 @@ class MediaDownloader:
             retry_count: Number of retry attempts on failure
             timeout: Request timeout in seconds
             log_dir: Directory for log files
+            per_host_limit: Max pooled connections per host (default: max_concurrent)
+            dns_cache_ttl: DNS cache TTL in seconds
+            keepalive_timeout: Idle keep-alive time for pooled connections in seconds
+            host_rate: Requests per second allowed per host (<= 0 = unlimited)
+            host_burst: Token bucket capacity per host
+            fsync_policy: 'none', 'close' or 'always' (see StreamingFileWriter)
+            segment_threshold: Videos at least this large (bytes) use parallel ranges
+            segment_count: Number of parallel ranges per video (<= 1 disables)
+            media_store: Content-addressed store for deduplication (optional)
+            fingerprint_cache: URL -> ETag/Last-Modified/size/hash cache (optional)
+            revalidate: Revalidate completed files with conditional requests
+            catalog: Archive catalog recording completed files (optional)
         """
         self.max_concurrent = max_concurrent
         self.retry_count = retry_count
         self.timeout = timeout
         self.logger = setup_logger('downloader', log_dir)
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.fsync_policy = fsync_policy
+        self.segment_threshold = segment_threshold
+        self.segment_count = segment_count
+        self.store = media_store
+        self.fingerprints = fingerprint_cache
+        self.revalidate = revalidate
+        self.catalog = catalog
+
+        # 共享会话（连接池 + keep-alive + DNS 缓存），由 start()/close() 管理
+        self.per_host_limit = per_host_limit or max_concurrent
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # 全局下载队列（start() 后启用，跨帖子调度 + 按主机限流）
+        self.queue = DownloadQueue(
+            self._fetch_file,
+            max_concurrent=max_concurrent,
+            per_host_limit=self.per_host_limit,
+            host_rate=host_rate,
+            host_burst=host_burst,
+            logger=self.logger
+        )
+        self._queue_started = False
+
+    async def start(self) -> None:
+        """创建共享 ClientSession 并启动下载队列（随归档器生命周期启动）"""
+        if not self._queue_started:
+            await self.queue.start()
+            self._queue_started = True
+
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrent,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self.logger.debug(
+            f"下载会话已创建: 连接上限 {self.max_concurrent}, "
+            f"单主机上限 {self.per_host_limit}"
+        )
+
+    async def close(self) -> None:
+        """停止下载队列并关闭共享 ClientSession"""
+        if self._queue_started:
+            await self.queue.close()
+            self._queue_started = False
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享会话（未启动时自动创建）"""
+        if self.session is None or self.session.closed:
+            await self.start()
+        return self.session
 
     async def download_files(
         self,
         urls: List[str],
         output_dir: Path,
-        prefix: str = ''
+        prefix: str = '',
+        priority: int = PRIORITY_BACKFILL
     ) -> List[bool]:
         """批量下载文件
 
+        已调用 start() 时任务提交到全局下载队列（与其他帖子的任务一起调度），
+        否则在本批次内按信号量并发下载。
+
         Args:
             urls: List of URLs to download
             output_dir: Output directory
             prefix: Filename prefix (e.g., 'img_', 'video_')
+            priority: Post priority (PRIORITY_NEW / PRIORITY_BACKFILL)
 
         Returns:
             List of success/failure booleans
@@ -62,6 +167,7 @@ class MediaDownloader:
             return []
 
         output_dir.mkdir(parents=True, exist_ok=True)
+        media_type = 'video' if prefix.startswith('video') else 'image'
 
         tasks = []
         for idx, url in enumerate(urls, 1):
@@ -69,7 +175,12 @@ class MediaDownloader:
             ext = self._get_extension(url)
             filename = f"{prefix}{idx}{ext}"
             output_path = output_dir / filename
-            tasks.append(self._download_single(url, output_path))
+            if self._queue_started:
+                tasks.append(self.queue.submit(
+                    url, output_path, priority=priority, media_type=media_type
+                ))
+            else:
+                tasks.append(self._download_single(url, output_path))
 
         # 使用 tqdm 显示进度
         self.logger.info(f"开始下载 {len(urls)} 个文件到 {output_dir}")
@@ -93,7 +204,7 @@ class MediaDownloader:
         return results
 
     async def _download_single(self, url: str, output_path: Path) -> bool:
-        """下载单个文件（带重试和断点续传）
+        """下载单个文件（信号量限制并发，未使用下载队列时）
 
         Args:
             url: File URL
@@ -103,155 +214,334 @@ class MediaDownloader:
             True if successful, False otherwise
         """
         async with self.semaphore:
-            # 检查文件是否已完整下载
-            if self._is_download_complete(output_path):
-                self.logger.debug(f"文件已存在，跳过: {output_path.name}")
-                return True
+            return await self._fetch_file(url, output_path)
+
+    async def _fetch_file(self, url: str, output_path: Path) -> bool:
+        """下载单个文件（启用媒体库时先查 URL 索引，下载成功后入库）
+
+        Args:
+            url: File URL
+            output_path: Output file path
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.store is None:
+            return await self._fetch_remote(url, output_path)
 
-            # 获取已下载的大小（断点续传）
-            downloaded_size = 0
-            temp_path = output_path.with_suffix(output_path.suffix + '.downloading')
+        if not self._is_download_complete(output_path):
+            try:
+                if await self.store.materialize(url, output_path):
+                    self._mark_download_complete(output_path)
+                    return True
+            except Exception as e:
+                self.logger.warning(f"媒体库链接失败 {output_path.name}: {str(e)}")
+
+        success = await self._fetch_remote(url, output_path)
 
-            if temp_path.exists():
-                downloaded_size = temp_path.stat().st_size
-                self.logger.info(
-                    f"继续下载 {output_path.name}，已下载 {downloaded_size} 字节"
+        if success and self.store.lookup_hash(url) is None:
+            try:
+                fingerprint = self.fingerprints.get(url) if self.fingerprints else None
+                await self.store.ingest(
+                    url, output_path,
+                    sha256=fingerprint['sha256'] if fingerprint else None
                 )
+            except Exception as e:
+                self.logger.warning(f"媒体库入库失败 {output_path.name}: {str(e)}")
 
-            for attempt in range(self.retry_count):
-                try:
-                    timeout = aiohttp.ClientTimeout(total=self.timeout)
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        # 设置 Range 头实现断点续传
-                        headers = {}
-                        if downloaded_size > 0:
-                            headers['Range'] = f'bytes={downloaded_size}-'
-
-                        async with session.get(url, headers=headers) as response:
-                            # 206 表示部分内容（断点续传），200 表示完整下载
-                            if response.status in (200, 206):
-                                # ========== 新增：内容类型验证 ==========
-                                content_type = response.headers.get('Content-Type', '').lower()
-
-                                # 检查是否是 HTML 错误页面
-                                if 'text/html' in content_type:
-                                    self.logger.warning(
-                                        f"下载失败 {url}: 返回 HTML 页面而不是媒体文件 "
-                                        f"(Content-Type: {content_type})"
-                                    )
-                                    # 清理临时文件
-                                    if temp_path.exists():
-                                        temp_path.unlink()
-                                    return False
-
-                                # 验证是否是预期的媒体类型
-                                expected_types = [
-                                    'image/', 'video/', 'application/octet-stream'
-                                ]
-                                if not any(t in content_type for t in expected_types):
-                                    self.logger.warning(
-                                        f"下载失败 {url}: 意外的 Content-Type: {content_type}"
-                                    )
-                                    if temp_path.exists():
-                                        temp_path.unlink()
-                                    return False
-
-                                # ========== 新增：文件大小验证 ==========
-                                content_length = response.headers.get('Content-Length')
-                                if content_length:
-                                    file_size = int(content_length)
-                                    # 如果文件小于 1KB，可能是错误页面
-                                    if file_size < 1024:
-                                        self.logger.warning(
-                                            f"下载失败 {url}: 文件太小 ({file_size} 字节)，"
-                                            f"可能是错误页面"
-                                        )
-                                        if temp_path.exists():
-                                            temp_path.unlink()
-                                        return False
-
-                                # ========== 原有下载逻辑 ==========
-                                # 206 表示服务器支持断点续传，追加写入
-                                mode = 'ab' if response.status == 206 else 'wb'
-
-                                with open(temp_path, mode) as f:
-                                    async for chunk in response.content.iter_chunked(8192):
-                                        f.write(chunk)
-
-                                # ========== 新增：下载后验证 ==========
-                                # 检查最终文件大小
-                                if temp_path.exists():
-                                    final_size = temp_path.stat().st_size
-                                    if final_size < 1024:
-                                        self.logger.warning(
-                                            f"下载失败 {url}: 最终文件太小 ({final_size} 字节)"
-                                        )
-                                        temp_path.unlink()
-                                        return False
-
-                                    # 验证文件魔数
-                                    if not self._verify_file_type(temp_path, output_path.suffix):
-                                        self.logger.warning(
-                                            f"下载失败 {url}: 文件格式验证失败"
-                                        )
-                                        temp_path.unlink()
-                                        return False
-
-                                # 下载完成，重命名临时文件
-                                temp_path.rename(output_path)
-
-                                # 创建完成标记
-                                self._mark_download_complete(output_path)
-
-                                self.logger.debug(f"下载成功: {output_path.name}")
-                                return True
-
-                            elif response.status == 416:
-                                # 416 Range Not Satisfiable - 文件可能已经完整
+        return success
+
+    async def _fetch_remote(self, url: str, output_path: Path) -> bool:
+        """从网络下载单个文件（带重试和断点续传）
+
+        Args:
+            url: File URL
+            output_path: Output file path
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # 本地文件与缓存指纹一致时，用条件请求重新验证（304 不传输响应体）
+        conditional = {}
+        fingerprint = self._local_fingerprint(url, output_path)
+        if fingerprint:
+            conditional = MediaFingerprintCache.conditional_headers(fingerprint)
+
+        # 检查文件是否已完整下载
+        if self._is_download_complete(output_path) and not (self.revalidate and conditional):
+            self.logger.debug(f"文件已存在，跳过: {output_path.name}")
+            return True
+
+        # 获取已下载的大小（断点续传）
+        downloaded_size = 0
+        temp_path = output_path.with_suffix(output_path.suffix + '.downloading')
+
+        # 大视频优先尝试分段并行下载（不适用时返回 None，走单连接下载）
+        if (
+            not conditional
+            and output_path.name.startswith('video_')
+            and self.segment_count > 1
+        ):
+            result = await self._fetch_segmented(url, output_path, temp_path)
+            if result is not None:
+                return result
+
+        if temp_path.exists():
+            downloaded_size = temp_path.stat().st_size
+            self.logger.info(
+                f"继续下载 {output_path.name}，已下载 {downloaded_size} 字节"
+            )
+
+        for attempt in range(self.retry_count):
+            try:
+                session = await self._get_session()
+                # 设置 Range 头实现断点续传
+                headers = {}
+                if downloaded_size > 0:
+                    headers['Range'] = f'bytes={downloaded_size}-'
+                else:
+                    headers.update(conditional)
+
+                async with session.get(url, headers=headers) as response:
+                    # 206 表示部分内容（断点续传），200 表示完整下载
+                    if response.status in (200, 206):
+                        # ========== 新增：内容类型验证 ==========
+                        content_type = response.headers.get('Content-Type', '').lower()
+
+                        # 检查是否是 HTML 错误页面
+                        if 'text/html' in content_type:
+                            self.logger.warning(
+                                f"下载失败 {url}: 返回 HTML 页面而不是媒体文件 "
+                                f"(Content-Type: {content_type})"
+                            )
+                            # 清理临时文件
+                            if temp_path.exists():
+                                temp_path.unlink()
+                            return False
+
+                        # 验证是否是预期的媒体类型
+                        expected_types = [
+                            'image/', 'video/', 'application/octet-stream'
+                        ]
+                        if not any(t in content_type for t in expected_types):
+                            self.logger.warning(
+                                f"下载失败 {url}: 意外的 Content-Type: {content_type}"
+                            )
+                            if temp_path.exists():
+                                temp_path.unlink()
+                            return False
+
+                        # ========== 新增：文件大小验证 ==========
+                        content_length = response.headers.get('Content-Length')
+                        file_size = None
+                        if content_length:
+                            file_size = int(content_length)
+                            # 如果文件小于 1KB，可能是错误页面
+                            if file_size < 1024:
+                                self.logger.warning(
+                                    f"下载失败 {url}: 文件太小 ({file_size} 字节)，"
+                                    f"可能是错误页面"
+                                )
                                 if temp_path.exists():
-                                    temp_path.rename(output_path)
-                                    self._mark_download_complete(output_path)
-                                    self.logger.debug(
-                                        f"下载完成（Range 416）: {output_path.name}"
-                                    )
-                                    return True
-                                else:
-                                    self.logger.warning(
-                                        f"下载失败 {url}: HTTP 416 (无临时文件)"
-                                    )
-                                    return False
-
-                            else:
+                                    temp_path.unlink()
+                                return False
+
+                        # ========== 原有下载逻辑 ==========
+                        # 206 表示服务器支持断点续传，追加写入
+                        mode = 'ab' if response.status == 206 else 'wb'
+
+                        # 磁盘写入放到线程中执行，避免大视频阻塞事件循环
+                        chunk_size = choose_chunk_size(file_size)
+                        async with StreamingFileWriter(
+                            temp_path, mode, fsync=self.fsync_policy
+                        ) as writer:
+                            async for chunk in response.content.iter_chunked(chunk_size):
+                                await writer.write(chunk)
+
+                        # ========== 新增：下载后验证 ==========
+                        # 检查最终文件大小
+                        if temp_path.exists():
+                            final_size = temp_path.stat().st_size
+                            if final_size < 1024:
                                 self.logger.warning(
-                                    f"下载失败 {url}: HTTP {response.status}"
+                                    f"下载失败 {url}: 最终文件太小 ({final_size} 字节)"
                                 )
+                                temp_path.unlink()
+                                return False
 
-                except asyncio.TimeoutError:
-                    if attempt < self.retry_count - 1:
-                        self.logger.warning(
-                            f"下载超时，重试 {attempt+1}/{self.retry_count}: {url}"
-                        )
-                        # 更新已下载大小
+                            # 验证文件魔数
+                            if not self._verify_file_type(temp_path, output_path.suffix):
+                                self.logger.warning(
+                                    f"下载失败 {url}: 文件格式验证失败"
+                                )
+                                temp_path.unlink()
+                                return False
+
+                        # 下载完成，重命名临时文件（重新验证时覆盖旧文件）
+                        temp_path.replace(output_path)
+
+                        # 创建完成标记
+                        self._mark_download_complete(output_path)
+                        await self._record_fingerprint(url, output_path, response.headers)
+
+                        self.logger.debug(f"下载成功: {output_path.name}")
+                        return True
+
+                    elif response.status == 416:
+                        # 416 Range Not Satisfiable - 文件可能已经完整
                         if temp_path.exists():
-                            downloaded_size = temp_path.stat().st_size
-                        await asyncio.sleep(1 * (attempt + 1))  # 指数退避
-                    else:
-                        self.logger.error(f"下载超时（已达最大重试次数）: {url}")
+                            temp_path.rename(output_path)
+                            self._mark_download_complete(output_path)
+                            self.logger.debug(
+                                f"下载完成（Range 416）: {output_path.name}"
+                            )
+                            return True
+                        else:
+                            self.logger.warning(
+                                f"下载失败 {url}: HTTP 416 (无临时文件)"
+                            )
+                            return False
+
+                    elif response.status == 304 and conditional:
+                        # 304 Not Modified - 本地文件仍然有效
+                        self._mark_download_complete(output_path)
+                        self.fingerprints.touch(url)
+                        self.logger.debug(f"未修改（304），跳过: {output_path.name}")
+                        return True
 
-                except Exception as e:
-                    if attempt < self.retry_count - 1:
+                    else:
                         self.logger.warning(
-                            f"下载失败，重试 {attempt+1}/{self.retry_count}: {url} - {str(e)}"
+                            f"下载失败 {url}: HTTP {response.status}"
                         )
-                        # 更新已下载大小
-                        if temp_path.exists():
-                            downloaded_size = temp_path.stat().st_size
-                        await asyncio.sleep(1 * (attempt + 1))
-                    else:
-                        self.logger.error(f"下载失败（已达最大重试次数）: {url} - {str(e)}")
 
+            except asyncio.TimeoutError:
+                if attempt < self.retry_count - 1:
+                    self.logger.warning(
+                        f"下载超时，重试 {attempt+1}/{self.retry_count}: {url}"
+                    )
+                    # 更新已下载大小
+                    if temp_path.exists():
+                        downloaded_size = temp_path.stat().st_size
+                    await asyncio.sleep(1 * (attempt + 1))  # 指数退避
+                else:
+                    self.logger.error(f"下载超时（已达最大重试次数）: {url}")
+
+            except Exception as e:
+                if attempt < self.retry_count - 1:
+                    self.logger.warning(
+                        f"下载失败，重试 {attempt+1}/{self.retry_count}: {url} - {str(e)}"
+                    )
+                    # 更新已下载大小
+                    if temp_path.exists():
+                        downloaded_size = temp_path.stat().st_size
+                    await asyncio.sleep(1 * (attempt + 1))
+                else:
+                    self.logger.error(f"下载失败（已达最大重试次数）: {url} - {str(e)}")
+
+        return False
+
+    async def _fetch_segmented(
+        self,
+        url: str,
+        output_path: Path,
+        temp_path: Path
+    ) -> Optional[bool]:
+        """分段并行下载大文件
+
+        HEAD 探测到 Accept-Ranges 且大小超过阈值时，按字节区间并行下载到
+        预分配文件；进度保存在 .segments 文件中，崩溃后只续传未完成的分段。
+
+        Args:
+            url: File URL
+            output_path: Output file path
+            temp_path: Temporary `.downloading` path
+
+        Returns:
+            True/False for the segmented result, None if not applicable
+        """
+        state_path = temp_path.with_suffix('.segments')
+
+        # 已有单连接续传的临时文件，保持原有续传方式
+        if temp_path.exists() and not state_path.exists():
+            return None
+
+        session = await self._get_session()
+        probe = None
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                if response.status == 200:
+                    probe = response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug(f"HEAD 探测失败 {url}: {str(e)}")
+
+        size = int(probe.get('Content-Length', 0) or 0) if probe else 0
+        usable = (
+            probe is not None
+            and probe.get('Accept-Ranges', '').lower() == 'bytes'
+            and 'text/html' not in probe.get('Content-Type', '').lower()
+            and size >= self.segment_threshold
+        )
+
+        download = SegmentedDownload(
+            session, url, temp_path, size,
+            etag=probe.get('ETag') if probe else None,
+            segment_count=self.segment_count,
+            retry_count=self.retry_count,
+            fsync_policy=self.fsync_policy,
+            logger=self.logger
+        )
+
+        if not usable:
+            if state_path.exists():
+                # 预分配的临时文件不能用于单连接续传，清理后重新下载
+                download.discard()
+            return None
+
+        self.logger.info(
+            f"分段下载 {output_path.name}: {size} 字节, {self.segment_count} 段"
+        )
+        if not await download.run():
+            self.logger.warning(f"分段下载未完成，下次继续: {url}")
+            return False
+
+        if not self._verify_file_type(temp_path, output_path.suffix):
+            self.logger.warning(f"下载失败 {url}: 文件格式验证失败")
+            download.discard()
             return False
 
+        temp_path.replace(output_path)
+        self._mark_download_complete(output_path)
+        await self._record_fingerprint(url, output_path, probe)
+        self.logger.debug(f"下载成功（分段）: {output_path.name}")
+        return True
+
+    def _local_fingerprint(self, url: str, output_path: Path) -> Optional[dict]:
+        """获取与本地文件大小一致的缓存指纹（不一致时返回 None）"""
+        if self.fingerprints is None or not output_path.exists():
+            return None
+
+        fingerprint = self.fingerprints.get(url)
+        if fingerprint and fingerprint['size'] == output_path.stat().st_size:
+            return fingerprint
+        return None
+
+    async def _record_fingerprint(self, url: str, path: Path, headers) -> None:
+        """记录下载完成文件的指纹（哈希在线程中计算）"""
+        if self.fingerprints is None:
+            return
+
+        try:
+            sha256 = await asyncio.to_thread(file_sha256, path)
+            self.fingerprints.put(
+                url,
+                etag=headers.get('ETag'),
+                last_modified=headers.get('Last-Modified'),
+                size=path.stat().st_size,
+                sha256=sha256
+            )
+        except Exception as e:
+            self.logger.warning(f"记录媒体指纹失败 {path.name}: {str(e)}")
+
     def _is_download_complete(self, file_path: Path) -> bool:
         """检查文件是否已完整下载
 
@@ -261,12 +551,20 @@ class MediaDownloader:
         Returns:
             True if file exists and has completion marker
         """
+        # 目录索引命中时只需确认文件存在，不再检查标记文件
+        if self.catalog is not None and self.catalog.is_file_complete(file_path):
+            return True
+
         if not file_path.exists():
             return False
 
-        # 检查完成标记文件
+        # 检查完成标记文件（命中时补录到目录索引）
         marker_file = file_path.with_suffix(file_path.suffix + '.done')
-        return marker_file.exists()
+        if not marker_file.exists():
+            return False
+        if self.catalog is not None:
+            self.catalog.mark_file_complete(file_path)
+        return True
 
     def _mark_download_complete(self, file_path: Path) -> None:
         """标记文件下载完成
@@ -276,6 +574,8 @@ class MediaDownloader:
         """
         marker_file = file_path.with_suffix(file_path.suffix + '.done')
         marker_file.touch()
+        if self.catalog is not None:
+            self.catalog.mark_file_complete(file_path)
 
     def _get_extension(self, url: str) -> str:
         """从 URL 中提取文件扩展名
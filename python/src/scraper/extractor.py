@@ -4,13 +4,22 @@ Two-phase extraction:
 1. Collect all post URLs from author pages (with pagination)
 2. Extract detailed content from each post
 
+Every operation leases its own page from a PagePool, so concurrent callers
+(batch author checks, pipelined extraction) do not share one tab.
+
+With `advanced.fetch_mode: http` pages are downloaded over aiohttp and parsed
+by page_parser instead; Chromium is only launched to borrow cookies when the
+forum serves an anti-bot challenge.
+
+Requests in both modes are paced by one AdaptiveThrottle (see navigator), and
+browser navigations wait only for the selector the caller needs.
+
 CRITICAL: Uses Python Playwright API (snake_case), not Node.js API!
 """
 
 import asyncio
-import re
-from typing import List, Dict, Optional
-from datetime import datetime
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional
 from pathlib import Path
 
 from playwright.async_api import async_playwright, Page, Browser, Playwright
@@ -18,6 +27,24 @@ from bs4 import BeautifulSoup
 
 from ..utils.logger import setup_logger
 from .utils import parse_relative_url
+from .page_pool import PagePool
+from .resource_policy import ResourcePolicy
+from .navigator import AdaptiveNavigator, AdaptiveThrottle, ThrottledError
+from .http_fetcher import HttpPageFetcher
+from .page_parser import (
+    LISTING_ROW_SELECTOR,
+    LISTING_LINK_SELECTOR,
+    NEXT_PAGE_SELECTOR,
+    POST_READY_SELECTOR,
+    EXTRACTION_SCRIPT,
+    EXTRACTION_SELECTORS,
+    normalize_extracted,
+    parse_listing_html,
+    parse_post_html,
+)
+
+# 抓取方式
+FETCH_MODES = ('browser', 'http')
 
 
 class PostExtractor:
@@ -35,35 +62,105 @@ class PostExtractor:
         self.logger = setup_logger('extractor', log_dir)
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        self.pool: Optional[PagePool] = None
 
         # 从配置读取超时和等待策略
         self.config = config or {}
         self.page_timeout = self.config.get('advanced', {}).get('page_load_timeout', 60) * 1000  # 转为毫秒
         self.wait_until = self.config.get('advanced', {}).get('wait_until', 'domcontentloaded')
 
-        self.logger.info(f"页面超时: {self.page_timeout}ms, 等待策略: {self.wait_until}")
+        # 页面池（每个操作租用一个页面，支持并发导航）
+        self.pool_size = self.config.get('advanced', {}).get('page_pool_size', 2)
+        self.page_max_navigations = self.config.get('advanced', {}).get('page_max_navigations', 100)
+
+        # 抓取方式：browser（Playwright）或 http（aiohttp + 静态解析）
+        self.fetch_mode = self.config.get('advanced', {}).get('fetch_mode', 'browser')
+        if self.fetch_mode not in FETCH_MODES:
+            self.logger.warning(f"未知的抓取方式 {self.fetch_mode}，使用 browser")
+            self.fetch_mode = 'browser'
+        self.http: Optional[HttpPageFetcher] = None
+        self._browser_lock = asyncio.Lock()
+
+        # 自适应导航：等待所需选择器，按延迟和 429/503 调整请求间隔（两种抓取方式共用）
+        self.throttle = AdaptiveThrottle.from_config(self.config, logger=self.logger)
+        self.max_retries = self.config.get('advanced', {}).get('adaptive_max_retries', 2)
+        self.navigator: Optional[AdaptiveNavigator] = None
+
+        self.logger.info(
+            f"页面超时: {self.page_timeout}ms, 等待策略: {self.wait_until}, 抓取方式: {self.fetch_mode}"
+        )
 
     async def start(self):
-        """启动浏览器"""
-        try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=True)
-            self.page = await self.browser.new_page()
-            self.logger.info("浏览器启动成功")
-        except Exception as e:
-            self.logger.error(f"浏览器启动失败: {str(e)}")
-            raise
+        """启动浏览器（http 模式只创建 HTTP 会话，浏览器按需启动）"""
+        if self.fetch_mode == 'http':
+            self.http = HttpPageFetcher(
+                max_connections=self.config.get('advanced', {}).get('http_max_connections', 8),
+                timeout=self.page_timeout // 1000,
+                cookie_source=self._borrow_browser_cookies,
+                throttle=self.throttle,
+                max_retries=self.max_retries,
+                logger=self.logger
+            )
+            await self.http.start()
+            self.logger.info("HTTP 抓取会话已创建")
+            return
+
+        await self._ensure_browser()
+
+    async def _ensure_browser(self):
+        """启动浏览器和页面池（已启动时直接返回）"""
+        async with self._browser_lock:
+            if self.pool is not None:
+                return
+            try:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self.pool = PagePool(
+                    self.browser,
+                    size=self.pool_size,
+                    max_navigations=self.page_max_navigations,
+                    resource_policy=ResourcePolicy.from_config(self.config, self.base_url),
+                    logger=self.logger
+                )
+                await self.pool.start()
+                self.navigator = AdaptiveNavigator(
+                    self.pool,
+                    self.throttle,
+                    timeout=self.page_timeout,
+                    wait_until=self.wait_until,
+                    max_retries=self.max_retries,
+                    logger=self.logger
+                )
+                self.logger.info("浏览器启动成功")
+            except Exception as e:
+                self.logger.error(f"浏览器启动失败: {str(e)}")
+                raise
+
+    async def _borrow_browser_cookies(self, url: str):
+        """用浏览器打开页面通过反爬检查，返回 cookie 和 User-Agent（供 HTTP 模式使用）"""
+        await self._ensure_browser()
+        async with self.pool.lease() as page:
+            await self.navigator.goto(page, url)
+            cookies = await page.context.cookies()
+            user_agent = await page.evaluate('navigator.userAgent')
+        return cookies, user_agent
 
     async def close(self):
         """关闭浏览器"""
         try:
-            if self.page:
-                await self.page.close()
+            if self.http:
+                await self.http.close()
+                self.http = None
+            if self.pool:
+                await self.pool.close()
+                self.pool = None
+                self.navigator = None
             if self.browser:
                 await self.browser.close()
+                self.browser = None
             if self.playwright:
                 await self.playwright.stop()
+                self.playwright = None
             self.logger.info("浏览器已关闭")
         except Exception as e:
             self.logger.error(f"浏览器关闭失败: {str(e)}")
@@ -86,6 +183,51 @@ class PostExtractor:
         Returns:
             List of post URLs
         """
+        if self.fetch_mode == 'http':
+            return await self._collect_post_urls(
+                self._iter_listing_pages_http(author_url, author_name),
+                author_url, max_pages, max_posts
+            )
+
+        async with self.pool.lease() as page:
+            return await self._collect_post_urls(
+                self._iter_listing_pages(page, author_url, author_name),
+                author_url, max_pages, max_posts
+            )
+
+    async def iter_listing_pages(
+        self,
+        author_url: str,
+        author_name: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        """逐页产出列表页中的帖子 URL（调用方决定何时停止翻页）
+
+        Args:
+            author_url: Author's post list URL
+            author_name: Expected author name for filtering (optional)
+
+        Yields:
+            每一页的帖子 URL 列表（按页面顺序）
+        """
+        if self.fetch_mode == 'http':
+            async with aclosing(self._iter_listing_pages_http(author_url, author_name)) as pages:
+                async for page_post_urls in pages:
+                    yield page_post_urls
+            return
+
+        async with self.pool.lease() as page:
+            async with aclosing(self._iter_listing_pages(page, author_url, author_name)) as pages:
+                async for page_post_urls in pages:
+                    yield page_post_urls
+
+    async def _collect_post_urls(
+        self,
+        listing_pages: AsyncIterator[List[str]],
+        author_url: str,
+        max_pages: Optional[int],
+        max_posts: Optional[int]
+    ) -> List[str]:
+        """从逐页迭代器中收集帖子 URL（达到限制时停止翻页）"""
         self.logger.info(f"开始收集帖子列表: {author_url}")
 
         # 显示限制信息
@@ -95,6 +237,43 @@ class PostExtractor:
             self.logger.info(f"限制: 最多收集 {max_pages} 页")
 
         post_urls = []
+        page_num = 0
+
+        async with aclosing(listing_pages) as pages:
+            async for page_post_urls in pages:
+                page_num += 1
+
+                # 添加本页的帖子URL（可能需要截断以满足max_posts限制）
+                if max_posts:
+                    remaining = max_posts - len(post_urls)
+                    page_post_urls = page_post_urls[:remaining]
+
+                post_urls.extend(page_post_urls)
+                self.logger.info(
+                    f"第 {page_num} 页: 收集 {len(page_post_urls)} 篇帖子 "
+                    f"（累计 {len(post_urls)} 篇）"
+                )
+
+                # 如果已达到帖子数限制，退出
+                if max_posts and len(post_urls) >= max_posts:
+                    self.logger.info(f"已达到帖子数限制: {len(post_urls)} 篇")
+                    break
+
+                # 检查是否已达到页数限制
+                if max_pages and page_num >= max_pages:
+                    self.logger.info(f"已达到页数限制 ({max_pages} 页)，停止收集")
+                    break
+
+        self.logger.info(f"收集完成，共 {len(post_urls)} 篇帖子")
+        return post_urls
+
+    async def _iter_listing_pages(
+        self,
+        page: Page,
+        author_url: str,
+        author_name: Optional[str]
+    ) -> AsyncIterator[List[str]]:
+        """在租用的页面上逐页翻页，产出每页的帖子 URL（无更多帖子或没有下一页时结束）"""
         page_num = 1
 
         # 检测 URL 类型：@作者名 页面不需要作者过滤
@@ -103,37 +282,21 @@ class PostExtractor:
             self.logger.info("检测到作者主页格式，跳过作者过滤")
 
         while True:
-            # 检查帖子数限制（优先）
-            if max_posts and len(post_urls) >= max_posts:
-                self.logger.info(f"已达到帖子数限制: {len(post_urls)} 篇")
-                break
-
-            # 检查页数限制
-            if max_pages and page_num > max_pages:
-                self.logger.info(f"已达到页数限制: {page_num-1} 页")
-                break
-
-            # 构造分页 URL
-            if page_num > 1:
-                # Assume pagination format: &page=N
-                separator = '&' if '?' in author_url else '?'
-                current_url = f"{author_url}{separator}page={page_num}"
-            else:
-                current_url = author_url
+            current_url = self._listing_page_url(author_url, page_num)
 
             try:
                 self.logger.info(f"正在抓取第 {page_num} 页...")
-                await self.page.goto(current_url, wait_until=self.wait_until, timeout=self.page_timeout)
+                await self.navigator.goto(page, current_url, wait_for=LISTING_ROW_SELECTOR)
 
                 # 找所有包含帖子链接的行
-                all_rows = await self.page.query_selector_all('table tbody tr')
+                all_rows = await page.query_selector_all(LISTING_ROW_SELECTOR)
 
                 page_post_urls = []
                 filtered_count = 0
 
                 for row in all_rows:
                     # 检查这行是否包含帖子链接
-                    link = await row.query_selector('a[href*="htm_data"]')
+                    link = await row.query_selector(LISTING_LINK_SELECTOR)
                     if not link:
                         continue
 
@@ -155,271 +318,146 @@ class PostExtractor:
                     # 获取帖子 URL
                     href = await link.get_attribute('href')
                     if href:
-                        full_url = parse_relative_url(self.base_url, href)
-                        page_post_urls.append(full_url)
-
-                        # 如果有帖子数限制，检查是否已达到
-                        if max_posts and (len(post_urls) + len(page_post_urls)) >= max_posts:
-                            break  # 达到限制，停止添加
+                        page_post_urls.append(parse_relative_url(self.base_url, href))
 
                 if filtered_count > 0:
                     self.logger.info(f"  过滤掉 {filtered_count} 个其他作者的帖子")
 
                 if not page_post_urls:
                     self.logger.info(f"第 {page_num} 页无更多匹配的帖子")
-                    break
+                    return
 
-                # 添加本页的帖子URL（可能需要截断以满足max_posts限制）
-                if max_posts:
-                    remaining = max_posts - len(post_urls)
-                    page_post_urls = page_post_urls[:remaining]
+                # 检查是否有下一页（在交出本页结果前读取，调用方可能在此后停止翻页）
+                next_page = await page.query_selector(NEXT_PAGE_SELECTOR)
 
-                post_urls.extend(page_post_urls)
-                self.logger.info(
-                    f"第 {page_num} 页: 收集 {len(page_post_urls)} 篇帖子 "
-                    f"（累计 {len(post_urls)} 篇）"
-                )
+            except ThrottledError as e:
+                # 限流不是页面故障，页面照常复用
+                self.logger.error(f"第 {page_num} 页提取失败: {str(e)}")
+                return
+            except Exception as e:
+                self.logger.error(f"第 {page_num} 页提取失败: {str(e)}")
+                self.pool.discard(page)
+                return
 
-                # 如果已达到帖子数限制，退出
-                if max_posts and len(post_urls) >= max_posts:
-                    break
+            yield page_post_urls
 
-                # 检查是否已达到页数限制
-                if max_pages and page_num >= max_pages:
-                    self.logger.info(f"已达到页数限制 ({max_pages} 页)，停止收集")
-                    break
+            if not next_page:
+                self.logger.info("没有下一页，收集完成")
+                return
 
-                page_num += 1
+            page_num += 1
 
-                # 检查是否有下一页
-                next_page = await self.page.query_selector('.pages .next')
-                if not next_page:
-                    self.logger.info("没有下一页，收集完成")
-                    break
+    async def _iter_listing_pages_http(
+        self,
+        author_url: str,
+        author_name: Optional[str]
+    ) -> AsyncIterator[List[str]]:
+        """HTTP 模式：下载列表页 HTML 并静态解析，产出每页的帖子 URL"""
+        page_num = 1
+        is_author_homepage = '/@' in author_url
 
-                # 防反爬延迟
-                await asyncio.sleep(0.5)
+        while True:
+            current_url = self._listing_page_url(author_url, page_num)
 
+            try:
+                self.logger.info(f"正在抓取第 {page_num} 页 (HTTP)...")
+                html = await self.http.fetch(current_url)
+                page_post_urls, has_next = parse_listing_html(
+                    html, self.base_url, author_name, is_author_homepage
+                )
             except Exception as e:
                 self.logger.error(f"第 {page_num} 页提取失败: {str(e)}")
-                break
+                return
 
-        self.logger.info(f"收集完成，共 {len(post_urls)} 篇帖子")
-        return post_urls
+            if not page_post_urls:
+                self.logger.info(f"第 {page_num} 页无更多匹配的帖子")
+                return
+
+            yield page_post_urls
+
+            if not has_next:
+                self.logger.info("没有下一页，收集完成")
+                return
 
-    async def extract_post_details(self, post_url: str) -> Optional[Dict]:
+            page_num += 1
+
+    @staticmethod
+    def _listing_page_url(author_url: str, page_num: int) -> str:
+        """构造分页 URL（第 1 页为原始 URL）"""
+        if page_num <= 1:
+            return author_url
+        # Assume pagination format: &page=N
+        separator = '&' if '?' in author_url else '?'
+        return f"{author_url}{separator}page={page_num}"
+
+    async def extract_post_details(
+        self,
+        post_url: str,
+        page: Optional[Page] = None
+    ) -> Optional[Dict]:
         """提取单个帖子的详细信息（两阶段的第二阶段）
 
         Args:
             post_url: Full URL of the post
+            page: Already leased page to use (default: lease one from the pool)
 
         Returns:
             Dictionary with keys: url, title, author, time, content, images, videos
             Returns None if extraction fails
         """
-        self.logger.info(f"提取帖子详情: {post_url}")
-
-        try:
-            await self.page.goto(post_url, wait_until=self.wait_until, timeout=self.page_timeout)
-
-            # 提取标题（选择器: h4.f16 或 h1）
-            title = await self._extract_title()
-
-            # 提取作者（选择器: .tr1.do_not_catch b 或 .authicon a）
-            author = await self._extract_author()
+        if page is None and self.fetch_mode == 'http':
+            return await self._extract_post_details_http(post_url)
 
-            # 提取发布时间（选择器: .tr1.do_not_catch .f10）
-            time_text = await self._extract_time()
+        if page is None:
+            async with self.pool.lease() as leased_page:
+                return await self.extract_post_details(post_url, page=leased_page)
 
-            # 提取正文内容（选择器: .tpc_content 或 .t_msgfont）
-            content = await self._extract_content()
+        self.logger.info(f"提取帖子详情: {post_url}")
 
-            # 提取图片 URL
-            images = await self._extract_images()
+        try:
+            await self.navigator.goto(page, post_url, wait_for=POST_READY_SELECTOR)
 
-            # 提取视频 URL
-            videos = await self._extract_videos()
+            # 一次 evaluate 取回全部字段（避免逐个选择器的 IPC 往返）
+            raw = await page.evaluate(EXTRACTION_SCRIPT, EXTRACTION_SELECTORS)
+            post_data = normalize_extracted(raw, post_url, self.base_url)
 
-            post_data = {
-                'url': post_url,
-                'title': title,
-                'author': author,
-                'time': time_text,
-                'content': content,
-                'images': images,
-                'videos': videos
-            }
+            if not raw.get('title'):
+                self.logger.warning("未找到标题")
+            if not raw.get('content'):
+                self.logger.warning("未找到正文内容")
 
             self.logger.info(
-                f"提取成功: {title} | "
-                f"{len(images)} 图片 | "
-                f"{len(videos)} 视频"
+                f"提取成功: {post_data['title']} | "
+                f"{len(post_data['images'])} 图片 | "
+                f"{len(post_data['videos'])} 视频"
             )
 
             return post_data
 
-        except Exception as e:
+        except ThrottledError as e:
+            # 限流不是页面故障，页面照常复用
             self.logger.error(f"提取失败 {post_url}: {str(e)}")
             return None
-
-    async def _extract_title(self) -> str:
-        """提取标题"""
-        try:
-            # Try multiple selectors
-            selectors = ['h4.f16', 'h1', '.postbox h1', 'h2.ts']
-            for selector in selectors:
-                title_elem = await self.page.query_selector(selector)
-                if title_elem:
-                    title = await title_elem.inner_text()
-                    return title.strip()
-
-            self.logger.warning("未找到标题")
-            return '无标题'
-        except Exception as e:
-            self.logger.error(f"标题提取失败: {str(e)}")
-            return '无标题'
-
-    async def _extract_author(self) -> str:
-        """提取作者"""
-        try:
-            # Try multiple selectors
-            selectors = [
-                '.tr1.do_not_catch b',
-                '.authicon a',
-                '.postinfo a.author'
-            ]
-            for selector in selectors:
-                author_elem = await self.page.query_selector(selector)
-                if author_elem:
-                    author = await author_elem.inner_text()
-                    return author.strip()
-
-            self.logger.warning("未找到作者")
-            return '未知作者'
-        except Exception as e:
-            self.logger.error(f"作者提取失败: {str(e)}")
-            return '未知作者'
-
-    async def _extract_time(self) -> str:
-        """提取发布时间"""
-        try:
-            # Try multiple selectors
-            selectors = [
-                '.tipad',                      # 最常见的位置
-                '.tr1.do_not_catch .f10',
-                '.postinfo',
-                '.authorinfo em'
-            ]
-            for selector in selectors:
-                time_elem = await self.page.query_selector(selector)
-                if time_elem:
-                    time_text = await time_elem.inner_text()
-
-                    # 提取 "Posted: YYYY-MM-DD HH:MM" 格式
-                    posted_match = re.search(r'Posted:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})', time_text)
-                    if posted_match:
-                        return posted_match.group(1)
-
-                    # 清理其他格式的时间文本
-                    time_text = re.sub(r'发表于[:：\s]*', '', time_text)
-                    time_text = time_text.strip()
-
-                    # 如果包含时间格式，返回
-                    if re.search(r'\d{4}[-/]\d{2}[-/]\d{2}', time_text):
-                        return time_text
-
-            self.logger.warning("未找到发布时间")
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         except Exception as e:
-            self.logger.error(f"时间提取失败: {str(e)}")
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    async def _extract_content(self) -> str:
-        """提取正文内容（HTML 格式）"""
-        try:
-            # Try multiple selectors
-            selectors = [
-                '.tpc_content',
-                '.t_msgfont',
-                '.postbody .message',
-                '.postmessage'
-            ]
-            for selector in selectors:
-                content_elem = await self.page.query_selector(selector)
-                if content_elem:
-                    content = await content_elem.inner_html()
-                    return content
-
-            self.logger.warning("未找到正文内容")
-            return ''
-        except Exception as e:
-            self.logger.error(f"内容提取失败: {str(e)}")
-            return ''
-
-    async def _extract_images(self) -> List[str]:
-        """提取图片 URL"""
-        try:
-            # Try multiple selectors for images
-            selectors = [
-                '.tpc_content img',
-                '.t_msgfont img',
-                '.postbody img',
-                '.message img'
-            ]
-
-            images = []
-            for selector in selectors:
-                img_elems = await self.page.query_selector_all(selector)
-                if img_elems:
-                    for img in img_elems:
-                        # Try multiple attributes
-                        src = (
-                            await img.get_attribute('data-original') or
-                            await img.get_attribute('file') or
-                            await img.get_attribute('src')
-                        )
-                        if src and src not in images:
-                            # Convert to absolute URL
-                            abs_url = parse_relative_url(self.base_url, src)
-                            images.append(abs_url)
-                    break
+            self.logger.error(f"提取失败 {post_url}: {str(e)}")
+            # 异常在这里被吞掉，lease 看不到：标记页面，归还时回收
+            self.pool.discard(page)
+            return None
 
-            return images
-        except Exception as e:
-            self.logger.error(f"图片提取失败: {str(e)}")
-            return []
+    async def _extract_post_details_http(self, post_url: str) -> Optional[Dict]:
+        """HTTP 模式：下载帖子 HTML 并静态解析"""
+        self.logger.info(f"提取帖子详情 (HTTP): {post_url}")
 
-    async def _extract_videos(self) -> List[str]:
-        """提取视频 URL"""
         try:
-            videos = []
-
-            # Try video elements with src attribute (most common)
-            video_elems = await self.page.query_selector_all('video[src]')
-            for video in video_elems:
-                src = await video.get_attribute('src')
-                if src and src not in videos:
-                    abs_url = parse_relative_url(self.base_url, src)
-                    videos.append(abs_url)
-
-            # Try video elements with source children
-            source_elems = await self.page.query_selector_all('video source')
-            for source in source_elems:
-                src = await source.get_attribute('src')
-                if src and src not in videos:
-                    abs_url = parse_relative_url(self.base_url, src)
-                    videos.append(abs_url)
-
-            # Try embed/iframe for video platforms
-            iframe_elems = await self.page.query_selector_all('iframe')
-            for iframe in iframe_elems:
-                src = await iframe.get_attribute('src')
-                if src and ('video' in src.lower() or 'player' in src.lower()):
-                    if src not in videos:
-                        videos.append(src)
-
-            return videos
+            html = await self.http.fetch(post_url)
+            post_data = parse_post_html(html, post_url, self.base_url)
         except Exception as e:
-            self.logger.error(f"视频提取失败: {str(e)}")
-            return []
+            self.logger.error(f"提取失败 {post_url}: {str(e)}")
+            return None
 
+        self.logger.info(
+            f"提取成功: {post_data['title']} | "
+            f"{len(post_data['images'])} 图片 | "
+            f"{len(post_data['videos'])} 视频"
+        )
+        return post_data
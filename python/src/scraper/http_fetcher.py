@@ -0,0 +1,176 @@
+"""HTTP page fetcher (browser-free fetch mode)
+
+Listing and post pages are static HTML, so the optional `fetch_mode: http`
+downloads them over a pooled aiohttp session and parses them with
+page_parser instead of driving Chromium.
+
+When the forum answers with an anti-bot challenge, cookies (and the user
+agent they are bound to) are borrowed once from a real browser session via
+`cookie_source`, then the request is retried. Chromium is only launched if
+that happens.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from yarl import URL
+
+from .navigator import THROTTLE_STATUSES, AdaptiveThrottle, parse_retry_after
+
+# 挑战页特征（Cloudflare 等反爬检查）
+CHALLENGE_STATUSES = (403, 429, 503)
+CHALLENGE_MARKERS = (
+    'cf-browser-verification',
+    'challenge-platform',
+    'cf_chl_',
+    'Just a moment...',
+    'DDoS protection',
+)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+)
+
+# 浏览器 cookie 来源：url -> (cookies, user_agent)
+CookieSource = Callable[[str], Awaitable[Tuple[List[Dict], str]]]
+
+
+class ChallengeError(Exception):
+    """借用浏览器 cookie 后仍然遇到反爬挑战"""
+
+
+def is_challenge(status: int, html: str) -> bool:
+    """判断响应是否为反爬挑战页"""
+    if status in CHALLENGE_STATUSES:
+        return True
+    head = html[:4096]
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class HttpPageFetcher:
+    """HTTP 页面抓取器（连接池 + 按需借用浏览器 cookie）"""
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        timeout: int = 60,
+        cookie_source: Optional[CookieSource] = None,
+        throttle: Optional[AdaptiveThrottle] = None,
+        max_retries: int = 2,
+        logger=None
+    ):
+        """Initialize fetcher
+
+        Args:
+            max_connections: Pooled connections (also the concurrency limit)
+            timeout: Request timeout in seconds
+            cookie_source: Async callable returning browser cookies and user agent
+            throttle: Shared request pacing (None = no pacing)
+            max_retries: Retries after a 429/503 response that is not a challenge page
+            logger: Logger (optional)
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cookie_source = cookie_source
+        self.throttle = throttle
+        self.max_retries = max(0, max_retries)
+        self.logger = logger
+        self.user_agent = DEFAULT_USER_AGENT
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._cookie_lock = asyncio.Lock()
+        self._cookie_generation = 0
+
+    async def start(self) -> None:
+        """创建共享会话"""
+        if self.session is not None and not self.session.closed:
+            return
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            cookie_jar=aiohttp.CookieJar(unsafe=True)
+        )
+
+    async def close(self) -> None:
+        """关闭会话"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url: str) -> str:
+        """下载页面 HTML（遇到反爬挑战时借用浏览器 cookie 重试一次）
+
+        Args:
+            url: Page URL
+
+        Returns:
+            HTML text
+
+        Raises:
+            ChallengeError: Still challenged after borrowing browser cookies
+            aiohttp.ClientError: Network errors
+        """
+        await self.start()
+
+        generation = self._cookie_generation
+        status, html = await self._get(url)
+        if not is_challenge(status, html):
+            return html
+
+        if self.cookie_source is None:
+            raise ChallengeError(f"反爬检查 (HTTP {status}): {url}")
+
+        await self._borrow_cookies(url, generation)
+
+        status, html = await self._get(url)
+        if is_challenge(status, html):
+            raise ChallengeError(f"借用浏览器 cookie 后仍被拦截 (HTTP {status}): {url}")
+        return html
+
+    async def _get(self, url: str) -> Tuple[int, str]:
+        """GET（经过节流；429/503 且不是挑战页时退避重试）"""
+        for attempt in range(self.max_retries + 1):
+            if self.throttle:
+                await self.throttle.wait()
+            start = time.monotonic()
+            try:
+                async with self.session.get(url, headers={'User-Agent': self.user_agent}) as response:
+                    status = response.status
+                    html = await response.text(errors='replace')
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except Exception:
+                if self.throttle:
+                    self.throttle.record_error()
+                raise
+
+            throttled = status in THROTTLE_STATUSES and not is_challenge(200, html)
+            if self.throttle:
+                self.throttle.record(
+                    time.monotonic() - start, status if throttled else None, retry_after
+                )
+            if not throttled or attempt == self.max_retries:
+                return status, html
+            if self.logger:
+                self.logger.info(f"HTTP {status}，退避后重试 ({attempt + 1}/{self.max_retries}): {url}")
+        return status, html
+
+    async def _borrow_cookies(self, url: str, generation: int) -> None:
+        """从浏览器会话导入 cookie（并发请求只触发一次）"""
+        async with self._cookie_lock:
+            if generation != self._cookie_generation:
+                return  # 其他请求已经更新过 cookie
+
+            if self.logger:
+                self.logger.info(f"遇到反爬检查，从浏览器会话借用 cookie: {url}")
+
+            cookies, user_agent = await self.cookie_source(url)
+            for cookie in cookies:
+                morsel_cookies = {cookie['name']: cookie['value']}
+                domain = cookie.get('domain', '').lstrip('.')
+                response_url = f"https://{domain}/" if domain else url
+                self.session.cookie_jar.update_cookies(morsel_cookies, URL(response_url))
+            if user_agent:
+                self.user_agent = user_agent
+            self._cookie_generation += 1
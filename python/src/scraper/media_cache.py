@@ -0,0 +1,110 @@
+"""Persistent URL -> media fingerprint cache
+
+Remembers the validators (ETag / Last-Modified), size and SHA-256 of every
+downloaded media URL, so re-archiving or repairing a post can revalidate
+existing files with a conditional request (If-None-Match /
+If-Modified-Since) and skip the body on 304.
+
+Default location: python/data/media_cache.db
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class MediaFingerprintCache:
+    """媒体指纹缓存（URL -> ETag / Last-Modified / 大小 / SHA-256）"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize cache
+
+        Args:
+            db_path: SQLite file (default: python/data/media_cache.db)
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            db_path = project_root / 'data' / 'media_cache.db'
+
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取连接（首次使用时创建数据库，避免构造时产生文件）"""
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS media_fingerprints (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER,
+                sha256 TEXT,
+                checked_at TIMESTAMP NOT NULL
+            )
+        """)
+        self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        """关闭数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, url: str) -> Optional[Dict]:
+        """获取 URL 的指纹
+
+        Args:
+            url: Media URL
+
+        Returns:
+            Dict with etag, last_modified, size, sha256 (None if unknown)
+        """
+        row = self._get_conn().execute(
+            "SELECT etag, last_modified, size, sha256 FROM media_fingerprints WHERE url = ?",
+            (url,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        size: int,
+        sha256: Optional[str]
+    ) -> None:
+        """保存（覆盖）URL 的指纹"""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO media_fingerprints "
+            "(url, etag, last_modified, size, sha256, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, size, sha256, datetime.now().isoformat())
+        )
+        conn.commit()
+
+    def touch(self, url: str) -> None:
+        """记录一次 304 重新验证"""
+        conn = self._get_conn()
+        conn.execute(
+            "UPDATE media_fingerprints SET checked_at = ? WHERE url = ?",
+            (datetime.now().isoformat(), url)
+        )
+        conn.commit()
+
+    @staticmethod
+    def conditional_headers(fingerprint: Dict) -> Dict[str, str]:
+        """根据指纹构造条件请求头"""
+        headers = {}
+        if fingerprint.get('etag'):
+            headers['If-None-Match'] = fingerprint['etag']
+        if fingerprint.get('last_modified'):
+            headers['If-Modified-Since'] = fingerprint['last_modified']
+        return headers
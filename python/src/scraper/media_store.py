@@ -0,0 +1,191 @@
+"""Content-addressed media store with cross-post deduplication
+
+The same images are reposted across many posts and authors. With the store
+enabled, every downloaded file is kept once as a SHA-256 blob and linked
+into the usual `photo/img_N.ext` / `video/video_N.ext` post layout, so
+`content.html` paths keep working.
+
+Layout:
+    <store>/blobs/ab/cd/<sha256><ext>
+    <store>/index.db          (url -> sha256 index)
+
+Features:
+- Hardlink blobs into post directories (copy fallback across filesystems)
+- URL -> hash index: a known URL is never fetched twice
+- Identical content from different URLs shares one blob
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import sqlite3
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+# 哈希读取块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """计算文件 SHA-256（同步，调用方应放到线程中执行）
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """内容寻址媒体库（SHA-256 blob + URL 索引）"""
+
+    def __init__(self, root: Path, logger: Optional[logging.Logger] = None):
+        """Initialize media store
+
+        Args:
+            root: Store directory (should be on the same filesystem as the
+                archive so that hardlinks work)
+            logger: Logger (optional)
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取索引连接（关闭后再次使用时重新打开）"""
+        if self._conn is not None:
+            return self._conn
+
+        self._conn = sqlite3.connect(str(self.root / 'index.db'), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_index (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TIMESTAMP NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_url_index_sha256 ON url_index(sha256)")
+        self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        """关闭索引数据库"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def blob_path(self, sha256: str, ext: str) -> Path:
+        """blob 存储路径（两级目录分散文件）"""
+        return self.blob_dir / sha256[:2] / sha256[2:4] / f"{sha256}{ext.lower()}"
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """按 URL 查找已存储的 blob
+
+        Args:
+            url: Media URL
+
+        Returns:
+            Blob path if the URL is known and its blob still exists
+        """
+        row = self._get_conn().execute(
+            "SELECT sha256, ext FROM url_index WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        blob = self.blob_path(row[0], row[1])
+        return blob if blob.exists() else None
+
+    def lookup_hash(self, url: str) -> Optional[str]:
+        """按 URL 查找内容哈希"""
+        row = self._get_conn().execute(
+            "SELECT sha256 FROM url_index WHERE url = ?", (url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    async def materialize(self, url: str, dest: Path) -> bool:
+        """已知 URL 直接从 blob 链接到目标路径（不发起下载）
+
+        Args:
+            url: Media URL
+            dest: Target path inside the post directory
+
+        Returns:
+            True if the file was linked from the store
+        """
+        blob = self.lookup(url)
+        if blob is None:
+            return False
+
+        await asyncio.to_thread(self._link, blob, dest)
+        self.logger.debug(f"媒体库命中，跳过下载: {dest.name}")
+        return True
+
+    async def ingest(self, url: str, path: Path, sha256: Optional[str] = None) -> str:
+        """把刚下载的文件纳入媒体库，并用链接替换原文件
+
+        Args:
+            url: Media URL
+            path: Downloaded file inside the post directory
+            sha256: Precomputed hash (computed if omitted)
+
+        Returns:
+            Content SHA-256
+        """
+        if sha256 is None:
+            sha256 = await asyncio.to_thread(file_sha256, path)
+
+        ext = path.suffix
+        size = await asyncio.to_thread(self._store_blob, path, sha256, ext)
+
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO url_index (url, sha256, ext, size, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url, sha256, ext.lower(), size, datetime.now().isoformat())
+        )
+        conn.commit()
+        return sha256
+
+    def _store_blob(self, path: Path, sha256: str, ext: str) -> int:
+        """保存 blob（已存在时去重），再把 path 指向 blob"""
+        blob = self.blob_path(sha256, ext)
+        size = path.stat().st_size
+
+        if blob.exists():
+            # 重复内容：丢弃新副本，改为链接到已有 blob
+            self._link(blob, path)
+            return size
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except OSError:
+            shutil.copy2(path, blob)
+        return size
+
+    def _link(self, blob: Path, dest: Path) -> None:
+        """硬链接 blob 到 dest（跨文件系统时复制）"""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_suffix(dest.suffix + '.linking')
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            shutil.copy2(blob, tmp)
+        tmp.replace(dest)
@@ -0,0 +1,222 @@
+"""Adaptive page navigation (selector waits + AIMD request pacing)
+
+Instead of one `wait_until` load event and fixed sleeps between pages,
+every forum request goes through a shared AdaptiveThrottle:
+
+- Navigation returns as soon as the selector the caller needs is attached
+  (post content container, listing rows), not when every resource loaded.
+  If the page finishes loading without it, the caller gets the page as is.
+- The delay between requests shrinks additively while the forum answers
+  quickly, and grows multiplicatively on 429/503 responses, slow responses
+  and errors (AIMD). Retry-After is honored. When the retries run out the
+  navigation raises ThrottledError instead of handing back the rate-limit page.
+
+The same throttle paces the HTTP fetch mode, so both modes back off alike.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from playwright.async_api import Page, Response
+
+from .page_pool import PagePool
+
+# 表示论坛过载/限流的状态码
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（只支持秒数格式）"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class ThrottledError(Exception):
+    """重试用尽后论坛仍返回 429/503（响应是限流页面，不能当作正常页面解析）"""
+
+    def __init__(self, url: str, status: Optional[int]):
+        super().__init__(f"论坛限流 (HTTP {status})，重试已用尽: {url}")
+        self.url = url
+        self.status = status
+
+
+class AdaptiveThrottle:
+    """自适应请求间隔（AIMD：健康时加性减小，限流/变慢时乘性增大）"""
+
+    def __init__(
+        self,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.1,
+        max_delay: float = 30.0,
+        target_latency: float = 3.0,
+        decrease_step: float = 0.05,
+        backoff_factor: float = 2.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize throttle
+
+        Args:
+            initial_delay: Starting delay between request starts (seconds)
+            min_delay: Lower bound while the forum is healthy
+            max_delay: Upper bound while backing off
+            target_latency: Responses slower than this count as overload
+            decrease_step: Additive decrease per healthy response
+            backoff_factor: Multiplicative increase on 429/503
+            logger: Logger (optional)
+        """
+        self.min_delay = max(0.0, min_delay)
+        self.max_delay = max(self.min_delay, max_delay)
+        self.delay = min(self.max_delay, max(self.min_delay, initial_delay))
+        self.target_latency = target_latency
+        self.decrease_step = decrease_step
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = asyncio.Lock()
+        self._last_start = 0.0
+        self._not_before = 0.0
+
+    @classmethod
+    def from_config(cls, config: dict, logger: Optional[logging.Logger] = None) -> 'AdaptiveThrottle':
+        """从配置创建（rate_limit_delay 作为初始间隔）"""
+        advanced = config.get('advanced', {})
+        return cls(
+            initial_delay=advanced.get('rate_limit_delay', 0.5),
+            min_delay=advanced.get('adaptive_min_delay', 0.1),
+            max_delay=advanced.get('adaptive_max_delay', 30.0),
+            target_latency=advanced.get('adaptive_target_latency', 3.0),
+            logger=logger
+        )
+
+    async def wait(self) -> None:
+        """等待到下一次请求可以开始（所有并发调用方共享间隔）"""
+        async with self._lock:
+            ready_at = max(self._last_start + self.delay, self._not_before)
+            wait = ready_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_start = time.monotonic()
+
+    def record(self, latency: float, status: Optional[int] = None,
+               retry_after: Optional[float] = None) -> None:
+        """根据一次请求的结果调整间隔
+
+        Args:
+            latency: Seconds until the page was usable
+            status: HTTP status (None if unknown)
+            retry_after: Retry-After seconds from the response (optional)
+        """
+        if status in THROTTLE_STATUSES:
+            self.delay = min(self.max_delay, max(self.delay * self.backoff_factor, 1.0))
+            if retry_after:
+                self._not_before = time.monotonic() + min(retry_after, self.max_delay)
+            self.logger.warning(f"论坛限流 (HTTP {status})，请求间隔增至 {self.delay:.2f}s")
+        elif latency > self.target_latency:
+            self.delay = min(self.max_delay, self.delay * 1.25 + self.decrease_step)
+            self.logger.debug(f"响应变慢 ({latency:.1f}s)，请求间隔增至 {self.delay:.2f}s")
+        else:
+            self.delay = max(self.min_delay, self.delay - self.decrease_step)
+
+    def record_error(self) -> None:
+        """请求失败（超时、连接错误）时增大间隔"""
+        self.delay = min(self.max_delay, self.delay * 1.5 + self.decrease_step)
+
+
+class AdaptiveNavigator:
+    """自适应导航（等待所需选择器 + 共享节流）"""
+
+    def __init__(
+        self,
+        pool: PagePool,
+        throttle: AdaptiveThrottle,
+        timeout: int = 60000,
+        wait_until: str = 'domcontentloaded',
+        max_retries: int = 2,
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize navigator
+
+        Args:
+            pool: Page pool (navigations are counted for recycling)
+            throttle: Shared request pacing
+            timeout: Navigation timeout in milliseconds
+            wait_until: Load event used when the caller gives no selector
+            max_retries: Retries after a 429/503 response
+            logger: Logger (optional)
+        """
+        self.pool = pool
+        self.throttle = throttle
+        self.timeout = timeout
+        self.wait_until = wait_until
+        self.max_retries = max(0, max_retries)
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def goto(self, page: Page, url: str, wait_for: Optional[str] = None) -> Optional[Response]:
+        """导航到 URL（限流时退避重试）
+
+        Args:
+            page: Leased page
+            url: Target URL
+            wait_for: CSS selector the caller needs (None = wait for `wait_until`)
+
+        Returns:
+            Playwright response
+
+        Raises:
+            ThrottledError: Still throttled after max_retries retries
+        """
+        response = None
+        for attempt in range(self.max_retries + 1):
+            await self.throttle.wait()
+            start = time.monotonic()
+            try:
+                response = await self.pool.goto(
+                    page, url,
+                    wait_until='commit' if wait_for else self.wait_until,
+                    timeout=self.timeout
+                )
+                status = response.status if response else None
+                found = status != 429 and await self._wait_for(page, wait_for)
+            except Exception:
+                self.throttle.record_error()
+                raise
+
+            throttled = status in THROTTLE_STATUSES and not (wait_for and found)
+            retry_after = parse_retry_after(
+                response.headers.get('retry-after') if response and throttled else None
+            )
+            self.throttle.record(time.monotonic() - start, status if throttled else None, retry_after)
+
+            if not throttled:
+                return response
+            if attempt < self.max_retries:
+                self.logger.info(f"HTTP {status}，退避后重试 ({attempt + 1}/{self.max_retries}): {url}")
+
+        raise ThrottledError(url, status)
+
+    async def _wait_for(self, page: Page, selector: Optional[str]) -> bool:
+        """等待选择器出现；页面加载完仍未出现时返回 False（不等到超时）"""
+        if selector is None:
+            return True
+
+        found = asyncio.ensure_future(
+            page.wait_for_selector(selector, state='attached', timeout=self.timeout)
+        )
+        loaded = asyncio.ensure_future(page.wait_for_load_state('load', timeout=self.timeout))
+        try:
+            await asyncio.wait({found, loaded}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (found, loaded):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(found, loaded, return_exceptions=True)
+
+        if not found.cancelled() and found.exception() is None:
+            return True
+        return await page.query_selector(selector) is not None
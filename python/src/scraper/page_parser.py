@@ -0,0 +1,293 @@
+"""Static HTML parsing for listing and post pages
+
+Shared by the browser extractor and the HTTP fetch mode. Post pages go
+through one raw-field format: the browser fills it with a single
+`page.evaluate(EXTRACTION_SCRIPT)` call, the HTTP mode with
+`extract_raw_post`, and both are finished by `normalize_extracted`.
+Bump EXTRACTION_SCRIPT_VERSION whenever that format changes.
+
+Uses lxml as the BeautifulSoup backend when installed (several times
+faster), otherwise the built-in html.parser.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .utils import parse_relative_url
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+# ============ 选择器（浏览器模式和 HTTP 模式共用） ============
+
+# 列表页
+LISTING_ROW_SELECTOR = 'table tbody tr'
+LISTING_LINK_SELECTOR = 'a[href*="htm_data"]'
+NEXT_PAGE_SELECTOR = '.pages .next'
+
+# 帖子页（按顺序尝试，第一个命中的生效）
+TITLE_SELECTORS = ['h4.f16', 'h1', '.postbox h1', 'h2.ts']
+AUTHOR_SELECTORS = ['.tr1.do_not_catch b', '.authicon a', '.postinfo a.author']
+TIME_SELECTORS = ['.tipad', '.tr1.do_not_catch .f10', '.postinfo', '.authorinfo em']
+CONTENT_SELECTORS = ['.tpc_content', '.t_msgfont', '.postbody .message', '.postmessage']
+IMAGE_SELECTORS = ['.tpc_content img', '.t_msgfont img', '.postbody img', '.message img']
+IMAGE_SRC_ATTRIBUTES = ['data-original', 'file', 'src']
+
+# 帖子页可提取的标志（任一正文容器出现即可）
+POST_READY_SELECTOR = ', '.join(CONTENT_SELECTORS)
+
+
+def normalize_time_text(time_text: str) -> Optional[str]:
+    """从时间元素文本中提取发布时间
+
+    Args:
+        time_text: 时间元素的文本（如 "Posted: 2026-02-10 15:30 | ..."）
+
+    Returns:
+        时间字符串，不含日期时返回 None
+    """
+    # 提取 "Posted: YYYY-MM-DD HH:MM" 格式
+    posted_match = re.search(r'Posted:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})', time_text)
+    if posted_match:
+        return posted_match.group(1)
+
+    # 清理其他格式的时间文本
+    time_text = re.sub(r'发表于[:：\s]*', '', time_text).strip()
+
+    # 如果包含时间格式，返回
+    if re.search(r'\d{4}[-/]\d{2}[-/]\d{2}', time_text):
+        return time_text
+    return None
+
+
+def parse_listing_html(
+    html: str,
+    base_url: str,
+    author_name: Optional[str] = None,
+    is_author_homepage: bool = False
+) -> Tuple[List[str], bool]:
+    """解析列表页
+
+    Args:
+        html: 列表页 HTML
+        base_url: 论坛根 URL（用于补全相对链接）
+        author_name: 期望的作者名（非作者主页时按第 3 列过滤）
+        is_author_homepage: 是否为 @作者名 主页（不需要作者过滤）
+
+    Returns:
+        (帖子 URL 列表, 是否有下一页)
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    urls = []
+
+    for row in soup.select(LISTING_ROW_SELECTOR):
+        link = row.select_one(LISTING_LINK_SELECTOR)
+        if link is None:
+            continue
+
+        # TD3 包含作者信息（格式：作者名 时间）
+        if author_name and not is_author_homepage:
+            cells = row.find_all('td')
+            if len(cells) >= 3:
+                author_text = cells[2].get_text(' ', strip=True)
+                row_author = author_text.split()[0] if author_text else ''
+                if row_author.lower().strip() != author_name.lower().strip():
+                    continue
+
+        href = link.get('href')
+        if href:
+            urls.append(parse_relative_url(base_url, href))
+
+    return urls, soup.select_one(NEXT_PAGE_SELECTOR) is not None
+
+
+# ============ 帖子页提取（浏览器单次 evaluate + 静态解析共用） ============
+
+# 原始提取结果格式版本（脚本和 normalize_extracted 必须一致）
+EXTRACTION_SCRIPT_VERSION = 1
+
+# 浏览器端提取脚本：一次 page.evaluate 取回所有原始字段，参数为 EXTRACTION_SELECTORS
+EXTRACTION_SCRIPT = """
+(selectors) => {
+    const first = (list) => {
+        for (const selector of list) {
+            const elem = document.querySelector(selector);
+            if (elem) return elem;
+        }
+        return null;
+    };
+    const attrs = (selector) => Array.from(document.querySelectorAll(selector))
+        .map((elem) => elem.getAttribute('src'))
+        .filter(Boolean);
+
+    const title = first(selectors.title);
+    const author = first(selectors.author);
+    const content = first(selectors.content);
+
+    const timeTexts = [];
+    for (const selector of selectors.time) {
+        const elem = document.querySelector(selector);
+        if (elem) timeTexts.push(elem.innerText);
+    }
+
+    let imageSrcs = [];
+    for (const selector of selectors.image) {
+        const elems = document.querySelectorAll(selector);
+        if (elems.length) {
+            imageSrcs = Array.from(elems)
+                .map((img) => {
+                    for (const attr of selectors.imageSrc) {
+                        const value = img.getAttribute(attr);
+                        if (value) return value;
+                    }
+                    return null;
+                })
+                .filter(Boolean);
+            break;
+        }
+    }
+
+    return {
+        version: __VERSION__,
+        title: title ? title.innerText : null,
+        author: author ? author.innerText : null,
+        time_texts: timeTexts,
+        content: content ? content.innerHTML : null,
+        image_srcs: imageSrcs,
+        video_srcs: attrs('video[src]').concat(attrs('video source')),
+        iframe_srcs: attrs('iframe'),
+    };
+}
+""".replace('__VERSION__', str(EXTRACTION_SCRIPT_VERSION))
+
+EXTRACTION_SELECTORS = {
+    'title': TITLE_SELECTORS,
+    'author': AUTHOR_SELECTORS,
+    'time': TIME_SELECTORS,
+    'content': CONTENT_SELECTORS,
+    'image': IMAGE_SELECTORS,
+    'imageSrc': IMAGE_SRC_ATTRIBUTES,
+}
+
+
+def _first_match(soup: BeautifulSoup, selectors: List[str]):
+    """按顺序尝试选择器，返回第一个命中的元素"""
+    for selector in selectors:
+        elem = soup.select_one(selector)
+        if elem is not None:
+            return elem
+    return None
+
+
+def extract_raw_post(html: str) -> Dict:
+    """静态解析帖子页，返回与 EXTRACTION_SCRIPT 相同格式的原始字段"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    title_elem = _first_match(soup, TITLE_SELECTORS)
+    author_elem = _first_match(soup, AUTHOR_SELECTORS)
+    content_elem = _first_match(soup, CONTENT_SELECTORS)
+
+    time_texts = []
+    for selector in TIME_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem is not None:
+            time_texts.append(elem.get_text())
+
+    image_srcs = []
+    for selector in IMAGE_SELECTORS:
+        img_elems = soup.select(selector)
+        if img_elems:
+            for img in img_elems:
+                src = next((img.get(attr) for attr in IMAGE_SRC_ATTRIBUTES if img.get(attr)), None)
+                if src:
+                    image_srcs.append(src)
+            break
+
+    def srcs(selector: str) -> List[str]:
+        return [elem.get('src') for elem in soup.select(selector) if elem.get('src')]
+
+    return {
+        'version': EXTRACTION_SCRIPT_VERSION,
+        'title': title_elem.get_text() if title_elem else None,
+        'author': author_elem.get_text() if author_elem else None,
+        'time_texts': time_texts,
+        'content': content_elem.decode_contents() if content_elem else None,
+        'image_srcs': image_srcs,
+        'video_srcs': srcs('video[src]') + srcs('video source'),
+        'iframe_srcs': srcs('iframe'),
+    }
+
+
+def normalize_extracted(raw: Dict, post_url: str, base_url: str) -> Dict:
+    """把原始提取字段整理为帖子数据（补全 URL、清理时间、去重、缺失字段取默认值）
+
+    Args:
+        raw: EXTRACTION_SCRIPT 或 extract_raw_post 的返回值
+        post_url: 帖子 URL
+        base_url: 论坛根 URL（用于补全相对链接）
+
+    Returns:
+        {'url', 'title', 'author', 'time', 'content', 'images', 'videos'}
+
+    Raises:
+        ValueError: 原始字段格式版本不匹配
+    """
+    if raw.get('version') != EXTRACTION_SCRIPT_VERSION:
+        raise ValueError(
+            f"提取脚本版本不匹配: {raw.get('version')} (需要 {EXTRACTION_SCRIPT_VERSION})"
+        )
+
+    time_text = None
+    for text in raw.get('time_texts') or []:
+        time_text = normalize_time_text(text)
+        if time_text:
+            break
+
+    images = []
+    for src in raw.get('image_srcs') or []:
+        abs_url = parse_relative_url(base_url, src)
+        if abs_url not in images:
+            images.append(abs_url)
+
+    videos = []
+    for src in raw.get('video_srcs') or []:
+        abs_url = parse_relative_url(base_url, src)
+        if abs_url not in videos:
+            videos.append(abs_url)
+    for src in raw.get('iframe_srcs') or []:
+        if ('video' in src.lower() or 'player' in src.lower()) and src not in videos:
+            videos.append(src)
+
+    title = (raw.get('title') or '').strip()
+    author = (raw.get('author') or '').strip()
+
+    return {
+        'url': post_url,
+        'title': title or '无标题',
+        'author': author or '未知作者',
+        'time': time_text or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'content': raw.get('content') or '',
+        'images': images,
+        'videos': videos
+    }
+
+
+def parse_post_html(html: str, post_url: str, base_url: str) -> Dict:
+    """解析帖子页（与浏览器模式 extract_post_details 的返回格式一致）
+
+    Args:
+        html: 帖子页 HTML
+        post_url: 帖子 URL
+        base_url: 论坛根 URL（用于补全相对链接）
+
+    Returns:
+        {'url', 'title', 'author', 'time', 'content', 'images', 'videos'}
+    """
+    return normalize_extracted(extract_raw_post(html), post_url, base_url)
@@ -0,0 +1,169 @@
+"""Playwright page pool
+
+Provides N reusable pages inside one browser context so that independent
+operations (author checks, post extraction) can navigate in parallel
+without fighting over a single tab.
+
+Features:
+- Lease a page per operation (async context manager)
+- Health check on lease (closed/crashed pages are replaced)
+- Pages whose operation failed are replaced when returned (exception or discard())
+- Recycle pages after K navigations to limit Chromium memory growth
+- Optional ResourcePolicy routed on the context (blocks images/fonts/ads)
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from playwright.async_api import Browser, BrowserContext, Page, Response
+
+from .resource_policy import ResourcePolicy
+
+
+class PagePool:
+    """页面池（同一 BrowserContext 下的 N 个可复用页面）"""
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int = 2,
+        max_navigations: int = 100,
+        resource_policy: Optional[ResourcePolicy] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize page pool
+
+        Args:
+            browser: Launched Playwright browser
+            size: Number of pages in the pool
+            max_navigations: Recycle a page after this many navigations
+            resource_policy: Request interception policy (None = load everything)
+            logger: Logger (optional)
+        """
+        self.browser = browser
+        self.size = max(1, size)
+        self.max_navigations = max_navigations
+        self.resource_policy = resource_policy
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.context: Optional[BrowserContext] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._pages: List[Page] = []
+        self._navigations: Dict[Page, int] = {}
+        self._discarded: Set[Page] = set()
+
+    async def start(self) -> None:
+        """创建浏览器上下文和页面"""
+        self.context = await self.browser.new_context()
+        if self.resource_policy is not None:
+            await self.context.route('**/*', self.resource_policy.handle)
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            page = await self._new_page()
+            self._idle.put_nowait(page)
+        self.logger.info(f"页面池已创建: {self.size} 个页面")
+
+    async def close(self) -> None:
+        """关闭所有页面和上下文"""
+        for page in list(self._pages):
+            await self._close_page(page)
+        if self.resource_policy is not None:
+            self.logger.info(
+                f"资源拦截: 拦截 {self.resource_policy.blocked} 个请求，"
+                f"放行 {self.resource_policy.allowed} 个"
+            )
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception:
+                pass
+            self.context = None
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Page]:
+        """租用一个页面（用完自动归还）
+
+        操作中抛出异常或被 discard() 标记的页面会被回收替换，避免卡死的页面影响后续操作。
+        任务取消（CancelledError）和提前关闭的异步生成器（GeneratorExit）不算失败，页面照常复用。
+
+        Example:
+            async with pool.lease() as page:
+                await pool.goto(page, url)
+        """
+        if self._idle is None:
+            raise RuntimeError("页面池未启动，请先调用 start()")
+
+        page = await self._idle.get()
+        healthy = True
+        try:
+            page = await self._ensure_healthy(page)
+            yield page
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if not healthy or page in self._discarded:
+                try:
+                    page = await self._recycle(page, reason="操作异常")
+                except Exception as e:
+                    # 保留槽位：下次租用时健康检查会再次尝试替换
+                    self.logger.warning(f"页面回收失败: {str(e)}")
+            self._idle.put_nowait(page)
+
+    def discard(self, page: Page) -> None:
+        """标记页面不健康，归还时回收替换
+
+        调用方自行捕获了异常（lease 看不到失败）时使用。
+
+        Args:
+            page: Leased page
+        """
+        if page in self._pages:
+            self._discarded.add(page)
+
+    async def goto(self, page: Page, url: str, **kwargs) -> Optional[Response]:
+        """导航并记录导航次数（用于回收判断）
+
+        Args:
+            page: Leased page
+            url: Target URL
+            **kwargs: Passed through to page.goto (wait_until, timeout...)
+
+        Returns:
+            Playwright response
+        """
+        self._navigations[page] = self._navigations.get(page, 0) + 1
+        return await page.goto(url, **kwargs)
+
+    async def _ensure_healthy(self, page: Page) -> Page:
+        """健康检查：页面已关闭或导航次数超限时替换"""
+        if page.is_closed():
+            return await self._recycle(page, reason="页面已关闭")
+        if self._navigations.get(page, 0) >= self.max_navigations:
+            return await self._recycle(page, reason=f"已导航 {self.max_navigations} 次")
+        return page
+
+    async def _recycle(self, page: Page, reason: str) -> Page:
+        """关闭旧页面并创建新页面"""
+        self.logger.debug(f"回收页面: {reason}")
+        await self._close_page(page)
+        return await self._new_page()
+
+    async def _new_page(self) -> Page:
+        page = await self.context.new_page()
+        self._pages.append(page)
+        self._navigations[page] = 0
+        return page
+
+    async def _close_page(self, page: Page) -> None:
+        if page in self._pages:
+            self._pages.remove(page)
+        self._navigations.pop(page, None)
+        self._discarded.discard(page)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass
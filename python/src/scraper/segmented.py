@@ -0,0 +1,231 @@
+"""Parallel segmented (multi-range) downloads for large files
+
+A single connection caps video backfills at per-connection throughput.
+When the server advertises byte ranges, the file is split into N ranges
+fetched in parallel into one preallocated file.
+
+Features:
+- Segment plan derived from the HEAD-probed size
+- Preallocated temp file, each segment writes at its own offset
+- Progress persisted to a `.segments` JSON file (crash resumes only
+  unfinished segments)
+- Plan invalidated when size or ETag changes on the server
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from .file_writer import StreamingFileWriter, CHUNK_LARGE
+
+
+# 进度落盘间隔（每个分段每写入这么多字节保存一次）
+PROGRESS_SAVE_INTERVAL = 4 * 1024 * 1024
+
+
+def plan_segments(size: int, count: int) -> List[Dict[str, int]]:
+    """把文件切分为 count 个连续字节区间
+
+    Args:
+        size: Total file size in bytes
+        count: Number of segments
+
+    Returns:
+        List of {'start', 'end', 'done'} dicts (end is inclusive)
+    """
+    count = max(1, min(count, size))
+    step = size // count
+    segments = []
+    for i in range(count):
+        start = i * step
+        end = size - 1 if i == count - 1 else start + step - 1
+        segments.append({'start': start, 'end': end, 'done': 0})
+    return segments
+
+
+class SegmentedDownload:
+    """单个文件的分段并行下载"""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        temp_path: Path,
+        size: int,
+        etag: Optional[str],
+        segment_count: int,
+        retry_count: int,
+        fsync_policy: str = 'none',
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize segmented download
+
+        Args:
+            session: Shared aiohttp session
+            url: File URL
+            temp_path: Preallocated `.downloading` file
+            size: Total size from the HEAD probe
+            etag: ETag from the HEAD probe (used to validate resumed state)
+            segment_count: Number of parallel ranges
+            retry_count: Retry attempts per segment
+            fsync_policy: Passed through to StreamingFileWriter
+            logger: Logger (optional)
+        """
+        self.session = session
+        self.url = url
+        self.temp_path = temp_path
+        self.state_path = temp_path.with_suffix('.segments')
+        self.size = size
+        self.etag = etag
+        self.segment_count = segment_count
+        self.retry_count = retry_count
+        self.fsync_policy = fsync_policy
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.state: Dict[str, Any] = {}
+        self._save_lock = asyncio.Lock()
+
+    async def run(self) -> bool:
+        """执行分段下载（所有分段完成且大小一致时返回 True）"""
+        await self._prepare()
+
+        pending = [
+            seg for seg in self.state['segments']
+            if seg['start'] + seg['done'] <= seg['end']
+        ]
+        if len(pending) < len(self.state['segments']):
+            self.logger.info(
+                f"分段续传 {self.temp_path.name}: "
+                f"剩余 {len(pending)}/{len(self.state['segments'])} 段"
+            )
+
+        results = await asyncio.gather(
+            *(self._fetch_segment(seg) for seg in pending)
+        )
+        await self._save_state()
+
+        if not all(results):
+            return False
+
+        actual = self.temp_path.stat().st_size
+        if actual != self.size:
+            self.logger.warning(
+                f"分段下载大小不一致 {self.url}: {actual} != {self.size}"
+            )
+            return False
+
+        self.state_path.unlink(missing_ok=True)
+        return True
+
+    def discard(self) -> None:
+        """删除临时文件和进度文件"""
+        self.temp_path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+
+    async def _prepare(self) -> None:
+        """加载进度（与服务器不一致时重建），并预分配临时文件"""
+        state = self._load_state()
+        if (
+            state
+            and state.get('url') == self.url
+            and state.get('size') == self.size
+            and state.get('etag') == self.etag
+            and self.temp_path.exists()
+            and self.temp_path.stat().st_size == self.size
+        ):
+            self.state = state
+            return
+
+        self.state = {
+            'url': self.url,
+            'size': self.size,
+            'etag': self.etag,
+            'segments': plan_segments(self.size, self.segment_count)
+        }
+        await asyncio.to_thread(self._preallocate)
+        await self._save_state()
+
+    def _preallocate(self) -> None:
+        with open(self.temp_path, 'wb') as f:
+            f.truncate(self.size)
+
+    async def _fetch_segment(self, seg: Dict[str, int]) -> bool:
+        """下载一个分段（带重试，从已完成位置继续）"""
+        for attempt in range(self.retry_count):
+            start = seg['start'] + seg['done']
+            if start > seg['end']:
+                return True
+
+            try:
+                headers = {'Range': f"bytes={start}-{seg['end']}"}
+                if self.etag:
+                    headers['If-Range'] = self.etag
+
+                async with self.session.get(self.url, headers=headers) as response:
+                    if response.status != 206:
+                        # 服务器忽略 Range（或 ETag 变化返回 200），无法分段
+                        self.logger.warning(
+                            f"分段请求未返回 206 {self.url}: HTTP {response.status}"
+                        )
+                        return False
+
+                    saved = seg['done']
+                    remaining = seg['end'] - start + 1
+                    writer = StreamingFileWriter(
+                        self.temp_path, 'r+b',
+                        fsync=self.fsync_policy,
+                        offset=start
+                    )
+                    try:
+                        async with writer:
+                            async for chunk in response.content.iter_chunked(CHUNK_LARGE):
+                                # 不越界写入相邻分段
+                                chunk = chunk[:remaining]
+                                remaining -= len(chunk)
+                                await writer.write(chunk)
+                                # 只记录已落盘的字节，缓冲区中的数据崩溃后重新下载
+                                seg['done'] = start - seg['start'] + writer.bytes_written
+                                if seg['done'] - saved >= PROGRESS_SAVE_INTERVAL:
+                                    await self._save_state()
+                                    saved = seg['done']
+                    finally:
+                        # 异常时 writer 关闭前会写出缓冲区，这部分同样计入进度
+                        seg['done'] = start - seg['start'] + writer.bytes_written
+
+                if seg['start'] + seg['done'] > seg['end']:
+                    return True
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                self.logger.warning(
+                    f"分段下载失败，重试 {attempt+1}/{self.retry_count}: "
+                    f"{self.url} [{seg['start']}-{seg['end']}] - {str(e)}"
+                )
+
+            await self._save_state()
+            await asyncio.sleep(1 * (attempt + 1))
+
+        return False
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        if not self.state_path.exists():
+            return None
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    async def _save_state(self) -> None:
+        """保存分段进度（仅记录已写入磁盘的字节）"""
+        async with self._save_lock:
+            data = json.dumps(self.state, ensure_ascii=False)
+            await asyncio.to_thread(self._write_state, data)
+
+    def _write_state(self, data: str) -> None:
+        tmp = self.state_path.with_suffix('.segments.tmp')
+        tmp.write_text(data, encoding='utf-8')
+        tmp.replace(self.state_path)
@@ -0,0 +1,139 @@
+"""帖子目录扫描工具
+
+用 os.scandir 一次遍历帖子目录，同时得到目录大小、图片/视频列表和标记文件状态，
+替代 rglob + glob + exists 的多次遍历（网络存储上每次 stat 都是一次往返）。
+
+目录结构:
+    帖子目录/
+        ├── content.html
+        ├── .complete / .progress     （归档标记）
+        ├── photo/img_1.jpg (+ img_1.jpg.done)
+        └── video/video_1.mp4 (+ video_1.mp4.done)
+
+只有 img_*.{jpg,png,jpeg,webp} 和 video_* 计入媒体列表（与原 archiver 的 glob 规则一致）。
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Union
+
+# 下载完成标记后缀
+DONE_SUFFIX = '.done'
+
+# 下载中的临时文件后缀（不计入媒体列表；.linking 为媒体库链接中的文件）
+TEMP_SUFFIXES = ('.downloading', '.segments', '.tmp', '.linking')
+
+# 媒体文件命名（与 downloader 的 prefix 一致；图片只收录这些扩展名）
+IMAGE_PREFIX = 'img_'
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.jpeg', '.webp')
+VIDEO_PREFIX = 'video_'
+
+
+@dataclass
+class PostScan:
+    """帖子目录扫描结果（相对路径统一使用 / 分隔）"""
+    path: Path
+    exists: bool = False
+    total_size: int = 0
+    files: Dict[str, int] = field(default_factory=dict)   # 相对路径 → 文件大小
+    dirs: Set[str] = field(default_factory=set)           # 子目录相对路径
+    images: List[str] = field(default_factory=list)       # photo/ 下的媒体文件
+    videos: List[str] = field(default_factory=list)       # video/ 下的媒体文件
+    done: Set[str] = field(default_factory=set)           # 有 .done 标记的媒体文件
+    has_content: bool = False                             # content.html
+    is_complete: bool = False                             # .complete
+    has_progress: bool = False                            # .progress
+
+    def size_of(self, rel_path: str) -> int:
+        """文件大小（不存在时为 0）"""
+        return self.files.get(rel_path, 0)
+
+
+def _is_media_file(name: str) -> bool:
+    """排除标记文件和下载中的临时文件"""
+    return not name.endswith(DONE_SUFFIX) and not name.endswith(TEMP_SUFFIXES)
+
+
+def _is_image_file(name: str) -> bool:
+    """photo/ 下的图片：img_*.{jpg,png,jpeg,webp}"""
+    return name.startswith(IMAGE_PREFIX) and name.endswith(IMAGE_EXTENSIONS)
+
+
+def _is_video_file(name: str) -> bool:
+    """video/ 下的视频：video_*（排除标记和临时文件）"""
+    return name.startswith(VIDEO_PREFIX) and _is_media_file(name)
+
+
+def scan_post_dir(post_dir: Union[str, Path]) -> PostScan:
+    """扫描帖子目录（单次遍历）
+
+    Args:
+        post_dir: 帖子目录路径
+
+    Returns:
+        PostScan 扫描结果（目录不存在时 exists 为 False，其余为空）
+    """
+    scan = PostScan(path=Path(post_dir))
+    stack = [(str(post_dir), '')]
+
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    rel_path = f"{prefix}/{entry.name}" if prefix else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            scan.dirs.add(rel_path)
+                            stack.append((entry.path, rel_path))
+                        elif entry.is_file():
+                            size = entry.stat().st_size
+                            scan.total_size += size
+                            scan.files[rel_path] = size
+                    except OSError:
+                        pass
+        except OSError:
+            if not prefix:
+                return scan
+
+    scan.exists = True
+
+    for rel_path in scan.files:
+        folder, _, name = rel_path.rpartition('/')
+        if folder not in ('photo', 'video'):
+            continue
+        if name.endswith(DONE_SUFFIX):
+            scan.done.add(rel_path[:-len(DONE_SUFFIX)])
+        elif folder == 'photo' and _is_image_file(name):
+            scan.images.append(rel_path)
+        elif folder == 'video' and _is_video_file(name):
+            scan.videos.append(rel_path)
+
+    scan.images.sort()
+    scan.videos.sort()
+    scan.has_content = 'content.html' in scan.files
+    scan.is_complete = '.complete' in scan.files
+    scan.has_progress = '.progress' in scan.files
+
+    return scan
+
+
+def iter_post_dirs(author_dir: Union[str, Path]) -> Iterator[str]:
+    """遍历 作者/年/月/帖子 目录
+
+    Args:
+        author_dir: 作者目录路径
+
+    Yields:
+        帖子目录路径（按名称排序）
+    """
+    def subdirs(path) -> List[str]:
+        try:
+            with os.scandir(path) as entries:
+                return sorted(entry.path for entry in entries if entry.is_dir())
+        except OSError:
+            return []
+
+    for year_dir in subdirs(author_dir):
+        for month_dir in subdirs(year_dir):
+            yield from subdirs(month_dir)
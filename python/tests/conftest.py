@@ -0,0 +1,14 @@
+"""Shared pytest fixtures"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+
+
+@pytest.fixture
+def db(tmp_path):
+    """已初始化的临时数据库"""
+    db = DatabaseConnection(str(tmp_path / 'forum.db'))
+    assert db.initialize_database()
+    yield db
+    db.close()
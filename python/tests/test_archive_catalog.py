@@ -0,0 +1,81 @@
+"""Unit tests for scraper.archive_catalog module"""
+
+import asyncio
+
+from src.scraper.archive_catalog import ArchiveCatalog
+from src.scraper.archiver import ForumArchiver
+from src.scraper.downloader import MediaDownloader
+
+
+def test_catalog_posts_and_files(tmp_path):
+    """测试帖子和文件记录，目录/文件被删除时自动失效"""
+    catalog = ArchiveCatalog(tmp_path / 'catalog.db')
+    post_dir = tmp_path / 'post'
+    post_dir.mkdir()
+
+    assert not catalog.is_archived('https://e/1')
+    catalog.mark_archived('https://e/1', post_dir, '作者', '标题')
+    assert catalog.is_archived('https://e/1')
+    post_dir.rmdir()
+    assert not catalog.is_archived('https://e/1')
+    assert catalog.get_post_dir('https://e/1') is None
+
+    image = tmp_path / 'img_1.jpg'
+    image.write_bytes(b'x')
+    catalog.mark_file_complete(image)
+    assert catalog.is_file_complete(image)
+    image.unlink()
+    assert not catalog.is_file_complete(image)
+    catalog.close()
+
+
+def test_catalog_keys_are_absolute(tmp_path, monkeypatch):
+    """测试相对路径存储为绝对路径，切换当前目录后仍能命中"""
+    catalog = ArchiveCatalog(tmp_path / 'catalog.db')
+    (tmp_path / 'archive' / 'post').mkdir(parents=True)
+    (tmp_path / 'archive' / 'img_1.jpg').write_bytes(b'x')
+
+    monkeypatch.chdir(tmp_path)
+    catalog.mark_archived('https://e/1', 'archive/post')
+    catalog.mark_file_complete('archive/img_1.jpg')
+
+    monkeypatch.chdir(tmp_path / 'archive')
+    assert catalog.get_post_dir('https://e/1') == tmp_path.resolve() / 'archive' / 'post'
+    assert catalog.is_archived('https://e/1')
+    assert catalog.is_file_complete(tmp_path / 'archive' / 'img_1.jpg')
+    catalog.close()
+
+
+def test_downloader_backfills_from_marker(tmp_path):
+    """测试 .done 标记命中时补录到目录索引"""
+    catalog = ArchiveCatalog(tmp_path / 'catalog.db')
+    downloader = MediaDownloader(1, 1, 5, tmp_path, catalog=catalog)
+    image = tmp_path / 'img_1.jpg'
+    image.write_bytes(b'x')
+    (tmp_path / 'img_1.jpg.done').touch()
+
+    assert downloader._is_download_complete(image)
+    assert catalog.is_file_complete(image)
+    catalog.close()
+
+
+def test_archiver_skips_cataloged_posts_without_page_load(tmp_path):
+    """测试目录索引中已归档的帖子不加载页面"""
+    config = {
+        'forum': {'section_url': 'https://t66y.com/thread0806.php?fid=7'},
+        'storage': {'archive_path': str(tmp_path / 'archive')},
+        'advanced': {'archive_catalog_path': str(tmp_path / 'catalog.db'), 'media_cache_enabled': False}
+    }
+    archiver = ForumArchiver(config, log_dir=tmp_path / 'logs')
+    archiver.catalog.mark_archived('https://e/1', tmp_path, '作者')
+
+    async def extract(url):
+        raise AssertionError(f"不应加载页面: {url}")
+
+    archiver.extractor.extract_post_details = extract
+    stats = {'new': 0, 'skipped': 0, 'failed': 0, 'archived_urls': []}
+    asyncio.run(archiver._archive_posts_sequential('作者', ['https://e/1'], stats))
+
+    assert stats['skipped'] == 1 and stats['failed'] == 0
+    assert stats['archived_urls'] == ['https://e/1']
+    archiver.catalog.close()
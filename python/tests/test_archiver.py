@@ -0,0 +1,139 @@
+"""Unit tests for scraper.archiver resource handling"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.scraper.archiver import ForumArchiver
+
+
+def make_archiver(tmp_path, **advanced):
+    config = {
+        'forum': {'section_url': 'https://forum.example/thread0806.php?fid=7'},
+        'storage': {'archive_path': str(tmp_path / 'archive')},
+        'advanced': {
+            'archive_catalog_path': str(tmp_path / 'catalog.db'),
+            'media_cache_path': str(tmp_path / 'media_cache.db'),
+            'geocode_cache_path': str(tmp_path / 'geocode_cache.db'),
+            **advanced
+        }
+    }
+    return ForumArchiver(config, log_dir=tmp_path / 'logs')
+
+
+def test_archive_author_closes_resources(tmp_path):
+    """测试 archive_author 结束时关闭所有 SQLite 句柄，之后可重新打开"""
+    archiver = make_archiver(tmp_path, media_store_enabled=True)
+    resources = [archiver.media_store, archiver.media_cache, archiver.catalog, archiver.geocode_cache]
+    for resource in resources:
+        resource._get_conn()
+
+    async def fail_start():
+        raise RuntimeError('browser unavailable')
+
+    archiver.extractor.start = fail_start
+    with pytest.raises(RuntimeError):
+        asyncio.run(archiver.archive_author('作者', 'https://forum.example/@作者'))
+
+    assert all(resource._conn is None for resource in resources)
+    assert archiver.media_store.lookup('https://cdn.example/1.jpg') is None
+    archiver._close_resources()
+
+
+def _pipeline_archiver(tmp_path, events, pipeline):
+    """流水线测试用归档器：提取与归档替换为记录事件的桩"""
+    archiver = make_archiver(
+        tmp_path,
+        pipeline_enabled=pipeline,
+        pipeline_extract_workers=1,
+        pipeline_download_workers=1
+    )
+
+    async def extract(post_url):
+        events.append(f"extract {post_url}")
+        if post_url == 'p3':
+            raise RuntimeError('page crashed')
+        if post_url == 'p2':
+            return None
+        return {
+            'url': post_url,
+            'title': f"标题 {post_url}",
+            'author': '其他人' if post_url == 'p4' else '作者',
+            'time': '2024-01-02 10:00',
+            'content': '',
+            'images': [],
+            'videos': []
+        }
+
+    async def archive_post(post_dir, post_data):
+        events.append(f"archive {post_data['url']}")
+        await asyncio.sleep(0.01)
+        events.append(f"archived {post_data['url']}")
+        return post_data['url'] != 'p6'
+
+    archiver.extractor.extract_post_details = extract
+    archiver._archive_post = archive_post
+    return archiver
+
+
+@pytest.mark.parametrize('pipeline', [False, True])
+def test_archive_posts_counts_failures(tmp_path, pipeline):
+    """测试顺序/流水线模式的统计一致：提取失败、作者不匹配、归档失败分别计数"""
+    events = []
+    archiver = _pipeline_archiver(tmp_path, events, pipeline)
+    stats = {'new': 0, 'skipped': 0, 'failed': 0, 'archived_urls': []}
+    urls = ['p1', 'p2', 'p3', 'p4', 'p5', 'p6']
+
+    run = archiver._archive_posts_pipelined if pipeline else archiver._archive_posts_sequential
+    asyncio.run(run('作者', urls, stats))
+
+    assert (stats['new'], stats['skipped'], stats['failed']) == (2, 1, 3)
+    assert stats['archived_urls'] == ['p1', 'p5']
+    archiver._close_resources()
+
+
+def test_pipeline_overlaps_extraction_and_keeps_order(tmp_path):
+    """测试流水线模式：归档上一篇时已开始提取下一篇，单消费者按提交顺序归档"""
+    events = []
+    archiver = _pipeline_archiver(tmp_path, events, pipeline=True)
+    stats = {'new': 0, 'skipped': 0, 'failed': 0, 'archived_urls': []}
+
+    asyncio.run(archiver._archive_posts_pipelined('作者', ['p1', 'p5', 'p6'], stats))
+
+    assert events.index('extract p5') < events.index('archived p1')
+    archived = [event.split()[1] for event in events if event.startswith('archive ')]
+    assert archived == ['p1', 'p5', 'p6']
+    archiver._close_resources()
+
+
+def test_archive_post_syncs_off_event_loop(tmp_path, monkeypatch):
+    """测试归档时的数据库同步在线程中执行，不阻塞事件循环上的其他任务"""
+    from src.database import sync
+
+    archiver = make_archiver(tmp_path)
+    loop_ran = threading.Event()
+    synced = []
+
+    def slow_sync(**kwargs):
+        # 同步在事件循环线程执行时，其他任务无法运行，等待会超时
+        synced.append(loop_ran.wait(timeout=2))
+
+    monkeypatch.setattr(sync, 'sync_archived_post', slow_sync)
+
+    async def other_task():
+        await asyncio.sleep(0.05)
+        loop_ran.set()
+
+    async def run():
+        post_data = {
+            'url': 'https://forum.example/p1', 'title': '标题', 'author': '作者',
+            'time': '2024-01-02 10:00', 'content': '', 'images': [], 'videos': []
+        }
+        return await asyncio.gather(
+            archiver._archive_post(tmp_path / 'post', post_data), other_task()
+        )
+
+    assert asyncio.run(run())[0] is True
+    assert synced == [True]
+    archiver._close_resources()
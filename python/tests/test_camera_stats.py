@@ -0,0 +1,148 @@
+"""Unit tests for database.camera_stats module"""
+
+from pathlib import Path
+
+import pytest
+
+from src.database.camera_stats import (
+    ensure_camera_stats,
+    refresh_dirty_camera_stats,
+    rebuild_camera_stats
+)
+from src.database.connection import DatabaseConnection
+from src.database.query import get_camera_ranking, get_author_camera_usage
+
+SCHEMA_DIR = Path(__file__).parent.parent / 'src' / 'database'
+
+
+@pytest.fixture
+def db(db):
+    """带原始相机视图的测试数据库"""
+    conn = db.get_connection()
+    for name in ('schema_v2.sql', 'schema_camera_usage.sql'):
+        conn.executescript((SCHEMA_DIR / name).read_text(encoding='utf-8'))
+
+    conn.execute("INSERT INTO authors (name, added_date) VALUES ('甲', '2024-01-01')")
+    conn.execute("INSERT INTO authors (name, added_date) VALUES ('乙', '2024-01-01')")
+    for post_id, author_id, date in ((1, 1, '2024-01-02'), (2, 1, '2024-01-03'), (3, 2, '2024-01-03')):
+        conn.execute(
+            "INSERT INTO posts (id, author_id, url, url_hash, title, publish_date, "
+            "publish_year, publish_month, file_path, archived_date) "
+            "VALUES (?, ?, ?, ?, 't', ?, 2024, 1, 'p', '2024-02-01')",
+            (post_id, author_id, f"u{post_id}", f"h{post_id}", date)
+        )
+    conn.commit()
+    return db
+
+
+def _add_image(conn, post_id, make, model, iso=100):
+    conn.execute(
+        "INSERT INTO media (post_id, type, url, file_name, file_path, exif_make, exif_model, exif_iso) "
+        "VALUES (?, 'image', 'm', 'f', 'p', ?, ?, ?)",
+        (post_id, make, model, iso)
+    )
+
+
+def _assert_matches_views(conn):
+    pairs = (
+        ('v_camera_stats', 'mv_camera_stats', 'make, model'),
+        ('v_camera_author_usage', 'mv_camera_author_usage', 'make, model, author_id'),
+        ('v_camera_daily_usage', 'mv_camera_daily_usage', 'make, model, date'),
+        ('v_author_camera_summary', 'mv_author_camera_summary', 'author_id'),
+    )
+    for view, table, order in pairs:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        select = f"SELECT {', '.join(columns)} FROM {{}} ORDER BY {order}"
+        expected = [tuple(row) for row in conn.execute(select.format(view))]
+        actual = [tuple(row) for row in conn.execute(select.format(table))]
+        assert actual == expected, table
+
+
+def test_incremental_refresh_matches_views(db):
+    """测试增删改后增量刷新结果与原视图一致"""
+    conn = db.get_connection()
+    _add_image(conn, 1, 'Canon', 'R5', 100)
+    _add_image(conn, 1, 'Canon', 'R5', 200)
+    _add_image(conn, 2, 'Sony', 'A7', 400)
+    _add_image(conn, 3, 'Canon', 'R5', 800)
+    conn.commit()
+
+    assert refresh_dirty_camera_stats(db) == 2
+    _assert_matches_views(conn)
+    assert refresh_dirty_camera_stats(db) == 0
+
+    # EXIF 更新：相机从 Sony 改为 Canon，两个相机都应重算
+    conn.execute("UPDATE media SET exif_make = 'Canon', exif_model = 'R5' WHERE exif_make = 'Sony'")
+    conn.execute("DELETE FROM media WHERE post_id = 3")
+    conn.execute("UPDATE posts SET publish_date = '2024-01-05' WHERE id = 1")
+    conn.commit()
+
+    refresh_dirty_camera_stats(db)
+    _assert_matches_views(conn)
+    assert conn.execute("SELECT COUNT(*) FROM mv_camera_stats").fetchone()[0] == 1
+
+    # 帖子换作者：原作者和新作者的汇总都应重算
+    conn.execute("UPDATE posts SET author_id = 2 WHERE id = 2")
+    conn.commit()
+
+    refresh_dirty_camera_stats(db)
+    _assert_matches_views(conn)
+
+
+def test_rebuild(db):
+    """测试完整重建"""
+    conn = db.get_connection()
+    _add_image(conn, 2, 'Sony', 'A7')
+    conn.commit()
+    conn.execute("DELETE FROM mv_camera_stats")
+    conn.commit()
+
+    rebuild_camera_stats(db)
+    _assert_matches_views(conn)
+    assert conn.execute("SELECT COUNT(*) FROM mv_camera_dirty").fetchone()[0] == 0
+
+
+def test_queries_are_read_only(db):
+    """测试查询不刷新物化表（刷新由写入路径负责）"""
+    conn = db.get_connection()
+    _add_image(conn, 1, 'Canon', 'R5')
+    conn.commit()
+
+    assert get_camera_ranking(db=db) == []
+    get_author_camera_usage('甲', db=db)
+    assert conn.execute("SELECT COUNT(*) FROM mv_camera_dirty").fetchone()[0] == 1
+
+    refresh_dirty_camera_stats(db)
+    assert [row['model'] for row in get_camera_ranking(db=db)] == ['R5']
+
+
+def test_ensure_inside_transaction_does_not_commit(db):
+    """测试在调用方事务内建表不会提前提交该事务"""
+    conn = db.get_connection()
+    conn.execute("DROP TABLE mv_author_camera_summary")
+    conn.commit()
+
+    with pytest.raises(ValueError):
+        with db.transaction() as tx:
+            tx.execute("INSERT INTO authors (name, added_date) VALUES ('丙', '2024-01-01')")
+            ensure_camera_stats(db)
+            raise ValueError()
+
+    assert conn.execute("SELECT COUNT(*) FROM authors WHERE name = '丙'").fetchone()[0] == 0
+
+
+def test_existing_database_gets_tables_on_open(db):
+    """测试已有数据库（没有物化表）重新打开时建表并完整重建"""
+    conn = db.get_connection()
+    _add_image(conn, 1, 'Canon', 'R5')
+    for table in ('mv_camera_stats', 'mv_camera_author_usage', 'mv_camera_daily_usage',
+                  'mv_author_camera_summary', 'mv_camera_dirty'):
+        conn.execute(f"DROP TABLE {table}")
+    conn.commit()
+    path = db.get_db_path()
+    db.close()
+
+    db = DatabaseConnection(path)
+    assert db.is_initialized()
+    assert [row['model'] for row in get_camera_ranking(db=db)] == ['R5']
+    _assert_matches_views(db.get_connection())
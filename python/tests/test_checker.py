@@ -0,0 +1,113 @@
+"""Unit tests for scraper.checker early-stop scanning"""
+
+import asyncio
+
+from src.data.post_tracker import PostTracker
+from src.scraper.checker import PostChecker
+from src.scraper.extractor import PostExtractor
+from src.scraper.page_pool import PagePool
+
+
+class FakeExtractor:
+    """按页产出帖子 URL，记录加载的页数"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.loaded = 0
+
+    async def iter_listing_pages(self, author_url, author_name=None):
+        for page_urls in self.pages:
+            self.loaded += 1
+            yield page_urls
+
+
+def _url(thread_id):
+    return f"https://t66y.com/htm_data/2602/7/{thread_id}.html"
+
+
+def _checker(tmp_path, pages):
+    checker = PostChecker({}, extractor=FakeExtractor(pages))
+    checker.tracker = PostTracker(tmp_path / 'archived_posts.json')
+    return checker
+
+
+def test_stops_at_first_old_page(tmp_path):
+    """测试新帖在第一页时只加载到第一个全是旧帖的页面"""
+    pages = [[_url(105), _url(104)], [_url(103), _url(102)], [_url(101), _url(100)]]
+    checker = _checker(tmp_path, pages)
+    checker.tracker.add_archived_posts_batch('甲', [_url(104), _url(103), _url(102)])
+
+    result = asyncio.run(checker.check_new_posts('甲', 'https://t66y.com/@甲', max_pages=None))
+
+    assert result['new_urls'] == [_url(105)]
+    assert result['pages_scanned'] == 2
+    assert checker.extractor.loaded == 2
+
+
+def test_high_water_stops_without_hashes(tmp_path):
+    """测试 hash 不在记录中但主题ID不超过高水位的页面也会停止扫描"""
+    pages = [[_url(90), _url(80)], [_url(70)]]
+    checker = _checker(tmp_path, pages)
+    checker.tracker.add_archived_post('甲', _url(95))
+    assert checker.tracker.get_high_water('甲') == 95
+
+    result = asyncio.run(checker.check_new_posts_incremental('甲', 'https://t66y.com/@甲'))
+
+    assert result['pages_scanned'] == 1
+
+
+class _FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.pages = []
+
+    async def new_context(self):
+        return self
+
+    async def new_page(self):
+        page = _FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        pass
+
+
+def test_early_stop_reuses_pool_page(tmp_path):
+    """测试提前停止翻页（关闭列表迭代器）后页面池中的页面被复用，不会重建"""
+    extractor = PostExtractor('https://t66y.com', tmp_path)
+    browser = _FakeBrowser()
+    extractor.pool = PagePool(browser, size=1)
+    asyncio.run(extractor.pool.start())
+    pages = [[_url(105)], [_url(104)], [_url(103)]]
+    leased = []
+
+    async def iter_pages(page, author_url, author_name):
+        leased.append(page)
+        for page_urls in pages:
+            yield page_urls
+
+    extractor._iter_listing_pages = iter_pages
+    checker = PostChecker({}, extractor=extractor)
+    checker.tracker = PostTracker(tmp_path / 'archived_posts.json')
+    checker.tracker.add_archived_post('甲', _url(104))
+
+    async def run():
+        for _ in range(2):
+            result = await checker.check_new_posts('甲', 'https://t66y.com/@甲', max_pages=None)
+            assert result['pages_scanned'] == 2
+        await extractor.pool.close()
+
+    asyncio.run(run())
+    assert leased[0] is leased[1]
+    assert len(browser.pages) == 1
@@ -0,0 +1,194 @@
+"""Unit tests for database.connection read/write split"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.database.connection import DatabaseConnection, MEDIA_EXIF_COLUMNS
+from src.database.models import Author
+from src.database.sync import sync_archived_posts
+
+
+def test_reader_per_thread_and_read_only(db):
+    """测试每个线程独立的只读连接"""
+    main_reader = db.get_read_connection()
+    assert db.get_read_connection() is main_reader
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.get_read_connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main_reader
+    assert main_reader is not db.get_connection()
+    with pytest.raises(sqlite3.OperationalError):
+        main_reader.execute("INSERT INTO authors (name, added_date) VALUES ('x', '2024-01-01')")
+
+
+def test_concurrent_writers_and_readers(db):
+    """测试多线程写入串行化，读线程同时查询不报错"""
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(20):
+                with db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO authors (name, added_date) VALUES (?, '2024-01-01')",
+                        (f"w{n}-{i}",)
+                    )
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(50):
+                db.get_read_connection().execute("SELECT COUNT(*) FROM authors").fetchone()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    count = db.get_read_connection().execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+    assert count == 80
+
+
+def test_transaction_rollback_and_nesting(db):
+    """测试异常回滚，嵌套事务只在最外层提交"""
+    with pytest.raises(ValueError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO authors (name, added_date) VALUES ('a', '2024-01-01')")
+            raise ValueError()
+
+    with db.transaction() as conn:
+        with db.transaction() as inner:
+            inner.execute("INSERT INTO authors (name, added_date) VALUES ('b', '2024-01-01')")
+        assert db.get_read_connection().execute("SELECT COUNT(*) FROM authors").fetchone()[0] == 0
+
+    names = [row[0] for row in db.get_read_connection().execute("SELECT name FROM authors")]
+    assert names == ['b']
+
+
+def test_model_write_waits_for_other_thread_transaction(db, monkeypatch):
+    """测试模型写入与另一线程的事务串行：不会提交对方未完成的事务"""
+    monkeypatch.setattr(Author, '_db', db)
+    in_transaction = threading.Event()
+    errors = []
+
+    def rollback_writer():
+        try:
+            with db.transaction() as conn:
+                conn.execute("INSERT INTO authors (name, added_date) VALUES ('rolled', '2024-01-01')")
+                in_transaction.set()
+                # 给模型写入线程足够时间尝试写入
+                threading.Event().wait(0.2)
+                raise ValueError()
+        except ValueError:
+            pass
+        except Exception as e:
+            errors.append(e)
+
+    def model_writer():
+        try:
+            in_transaction.wait()
+            Author.create(name='kept', added_date='2024-01-01')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=rollback_writer), threading.Thread(target=model_writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    names = [row[0] for row in db.get_read_connection().execute("SELECT name FROM authors")]
+    assert names == ['kept']
+
+
+def test_tuning_profile_applied_to_every_connection(db):
+    """测试调优方案应用到读写连接，并通过 get_db_info 报告"""
+    DatabaseConnection.set_tuning_profile('low_memory')
+    try:
+        reader = db.get_read_connection()
+        assert reader.execute("PRAGMA cache_size").fetchone()[0] == -8000
+        assert reader.execute("PRAGMA mmap_size").fetchone()[0] == 0
+
+        info = db.get_db_info()
+        assert info['tuning_profile'] == 'low_memory'
+        assert info['pragmas']['journal_mode'] == 'wal'
+        assert info['pragmas']['cache_size'] == -8000
+        assert info['pragmas']['busy_timeout'] == 30000
+    finally:
+        DatabaseConnection.set_tuning_profile('default')
+
+    assert db.get_connection().execute("PRAGMA cache_size").fetchone()[0] == -40000
+    with pytest.raises(ValueError):
+        DatabaseConnection.set_tuning_profile('unknown')
+
+
+def test_existing_database_upgraded_on_open(tmp_path):
+    """测试已有数据库（旧结构）打开时补齐新增列，归档同步可以直接写入"""
+    path = tmp_path / 'old.db'
+    schema = (Path(__file__).parent.parent / 'src' / 'database' / 'schema.sql').read_text(encoding='utf-8')
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+    for column, col_type in MEDIA_EXIF_COLUMNS:
+        if column != 'exif_location_source':
+            conn.execute(f"ALTER TABLE media ADD COLUMN {column} {col_type}")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseConnection(str(path))
+    try:
+        assert db.is_initialized()
+        columns = {row[1] for row in db.get_read_connection().execute("PRAGMA table_info(media)")}
+        assert 'exif_location_source' in columns
+
+        post_dir = tmp_path / 'post'
+        (post_dir / 'photo').mkdir(parents=True)
+        (post_dir / 'photo' / 'img_1.jpg').write_bytes(b'x' * 100)
+        assert sync_archived_posts('作者', [{
+            'post_url': 'https://forum.example/1',
+            'post_dir': post_dir,
+            'metadata': {'title': '旧库', 'images': ['photo/img_1.jpg'], 'videos': []}
+        }], db=db) == 1
+    finally:
+        db.close()
+
+
+def test_close_waits_for_other_thread_transaction(tmp_path):
+    """测试 close() 等待其他线程的事务结束后才关闭写连接"""
+    path = str(tmp_path / 'close.db')
+    db = DatabaseConnection(path)
+    assert db.initialize_database()
+    in_transaction = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            with db.transaction() as conn:
+                in_transaction.set()
+                threading.Event().wait(0.2)
+                conn.execute("INSERT INTO authors (name, added_date) VALUES ('w', '2024-01-01')")
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    in_transaction.wait()
+    db.close()
+    thread.join()
+
+    assert errors == []
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM authors").fetchall() == [('w',)]
+    conn.close()
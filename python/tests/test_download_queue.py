@@ -0,0 +1,187 @@
+"""Unit tests for scraper.download_queue module"""
+
+import asyncio
+from pathlib import Path
+
+from src.scraper.download_queue import (
+    DownloadQueue,
+    TokenBucket,
+    PRIORITY_NEW,
+    PRIORITY_BACKFILL
+)
+
+
+class TestTokenBucket:
+    """Test token bucket rate limiting"""
+
+    def test_burst_then_throttle(self):
+        """测试突发容量用尽后按速率限流"""
+        async def run():
+            bucket = TokenBucket(rate=20.0, capacity=2)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(4):
+                await bucket.acquire()
+            return loop.time() - start
+
+        elapsed = asyncio.run(run())
+        # 2 个令牌立即可用，其余 2 个需等待约 2 * 0.05 秒
+        assert elapsed >= 0.09
+
+    def test_zero_rate_is_unlimited(self):
+        """测试 rate <= 0 时不限速"""
+        async def run():
+            bucket = TokenBucket(rate=0, capacity=1)
+            for _ in range(100):
+                await bucket.acquire()
+            return True
+
+        assert asyncio.run(run())
+
+
+class TestDownloadQueue:
+    """Test global download queue scheduling"""
+
+    def test_priority_order(self):
+        """测试新帖优先于回填，图片优先于视频"""
+        order = []
+
+        async def fetch(url, output_path):
+            order.append(url)
+            return True
+
+        async def run():
+            queue = DownloadQueue(fetch, max_concurrent=1, per_host_limit=1, host_rate=0)
+            await queue.start()
+            gate = asyncio.Event()
+
+            async def blocking_fetch(url, output_path):
+                await gate.wait()
+                return await fetch(url, output_path)
+
+            queue.fetch = blocking_fetch
+            first = queue.submit('http://a.com/0', Path('0'))
+            await asyncio.sleep(0)  # worker 取走第一个任务并阻塞
+
+            futures = [
+                queue.submit('http://a.com/backfill-video', Path('1'),
+                             priority=PRIORITY_BACKFILL, media_type='video'),
+                queue.submit('http://a.com/backfill-image', Path('2'),
+                             priority=PRIORITY_BACKFILL, media_type='image'),
+                queue.submit('http://a.com/new-video', Path('3'),
+                             priority=PRIORITY_NEW, media_type='video'),
+                queue.submit('http://a.com/new-image', Path('4'),
+                             priority=PRIORITY_NEW, media_type='image'),
+            ]
+            gate.set()
+            results = await asyncio.gather(first, *futures)
+            await queue.close()
+            return results
+
+        results = asyncio.run(run())
+        assert all(results)
+        assert order == [
+            'http://a.com/0',
+            'http://a.com/new-image',
+            'http://a.com/new-video',
+            'http://a.com/backfill-image',
+            'http://a.com/backfill-video',
+        ]
+
+    def test_priority_across_hosts(self):
+        """测试优先级跨主机生效：新帖任务不排在其他主机的回填任务之后"""
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def fetch(url, output_path):
+                await gate.wait()
+                order.append(url)
+                return True
+
+            queue = DownloadQueue(fetch, max_concurrent=1, per_host_limit=2, host_rate=0)
+            await queue.start()
+            first = queue.submit('http://a.com/0', Path('0'))
+            await asyncio.sleep(0)  # 唯一的 worker 取走第一个任务并阻塞
+
+            futures = [
+                queue.submit(f'http://a.com/backfill-{i}', Path(str(i)), priority=PRIORITY_BACKFILL)
+                for i in range(3)
+            ]
+            futures.append(queue.submit('http://b.com/new', Path('new'), priority=PRIORITY_NEW))
+            gate.set()
+            results = await asyncio.gather(first, *futures)
+            await queue.close()
+            return results
+
+        assert all(asyncio.run(run()))
+        assert order[:2] == ['http://a.com/0', 'http://b.com/new']
+
+    def test_rate_limited_host_does_not_block_others(self):
+        """测试优先级最高的主机被限速时，其他主机的任务照常下载"""
+        order = []
+
+        async def fetch(url, output_path):
+            order.append(url)
+            return True
+
+        async def run():
+            queue = DownloadQueue(fetch, max_concurrent=1, per_host_limit=1,
+                                  host_rate=2.0, host_burst=1)
+            await queue.start()
+            futures = [
+                queue.submit('http://a.com/new-1', Path('1'), priority=PRIORITY_NEW),
+                queue.submit('http://a.com/new-2', Path('2'), priority=PRIORITY_NEW),
+                queue.submit('http://b.com/backfill', Path('3'), priority=PRIORITY_BACKFILL),
+            ]
+            results = await asyncio.gather(*futures)
+            await queue.close()
+            return results
+
+        assert all(asyncio.run(run()))
+        assert order == ['http://a.com/new-1', 'http://b.com/backfill', 'http://a.com/new-2']
+
+    def test_per_host_limit(self):
+        """测试单主机并发上限，不同主机互不阻塞"""
+        active = {}
+        peak = {}
+
+        async def fetch(url, output_path):
+            host = url.split('/')[2]
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return True
+
+        async def run():
+            queue = DownloadQueue(fetch, max_concurrent=10, per_host_limit=2, host_rate=0)
+            await queue.start()
+            futures = [
+                queue.submit(f'http://{host}/{i}', Path(str(i)))
+                for host in ('a.com', 'b.com')
+                for i in range(6)
+            ]
+            results = await asyncio.gather(*futures)
+            await queue.close()
+            return results
+
+        assert all(asyncio.run(run()))
+        assert peak == {'a.com': 2, 'b.com': 2}
+
+    def test_close_fails_pending_jobs(self):
+        """测试关闭队列时未完成任务返回 False"""
+        async def fetch(url, output_path):
+            await asyncio.sleep(10)
+            return True
+
+        async def run():
+            queue = DownloadQueue(fetch, max_concurrent=1, per_host_limit=1, host_rate=0)
+            await queue.start()
+            futures = [queue.submit(f'http://a.com/{i}', Path(str(i))) for i in range(3)]
+            await asyncio.sleep(0)
+            await queue.close()
+            return [f.result() for f in futures]
+
+        assert asyncio.run(run()) == [False, False, False]
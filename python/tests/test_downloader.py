@@ -0,0 +1,143 @@
+"""Unit tests for scraper.downloader against a local aiohttp server"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+
+from src.scraper.downloader import MediaDownloader
+from src.scraper.media_cache import MediaFingerprintCache
+from src.scraper.segmented import SegmentedDownload, plan_segments
+
+# 伪 JPEG（通过魔数校验，且大于 1KB 的最小文件限制）
+JPEG = b'\xFF\xD8\xFF\xE0' + bytes(range(256)) * 16
+ETAG = '"v1"'
+
+
+@asynccontextmanager
+async def serve(handler):
+    """启动本地服务器，返回 base URL"""
+    app = web.Application()
+    app.router.add_route('*', '/{name}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def make_downloader(tmp_path, **kwargs):
+    return MediaDownloader(
+        max_concurrent=2, retry_count=1, timeout=10, log_dir=tmp_path / 'logs', **kwargs
+    )
+
+
+def test_shared_session_reuses_connection(tmp_path):
+    """测试多次下载复用同一个会话和 keep-alive 连接"""
+    peers = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info('peername')[1])
+        return web.Response(body=JPEG, content_type='image/jpeg')
+
+    async def run():
+        downloader = make_downloader(tmp_path)
+        async with serve(handler) as base:
+            await downloader.start()
+            session = downloader.session
+            try:
+                for name in ('a.jpg', 'b.jpg'):
+                    assert await downloader._fetch_file(f"{base}/{name}", tmp_path / name)
+                assert downloader.session is session
+            finally:
+                await downloader.close()
+        assert downloader.session is None and session.closed
+
+    asyncio.run(run())
+    assert len(peers) == 2 and len(set(peers)) == 1
+    assert (tmp_path / 'a.jpg').read_bytes() == JPEG
+    assert (tmp_path / 'b.jpg.done').exists()
+
+
+def test_not_modified_marks_done(tmp_path):
+    """测试指纹一致时发送条件请求，304 不传输内容并补写 .done 标记"""
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get('If-None-Match'))
+        return web.Response(status=304)
+
+    output = tmp_path / 'img_1.jpg'
+    output.write_bytes(JPEG)
+    cache = MediaFingerprintCache(tmp_path / 'media_cache.db')
+
+    async def run():
+        downloader = make_downloader(tmp_path, fingerprint_cache=cache, revalidate=True)
+        async with serve(handler) as base:
+            url = f"{base}/img_1.jpg"
+            cache.put(url, etag=ETAG, last_modified=None, size=len(JPEG), sha256='x')
+            try:
+                return await downloader._fetch_file(url, output)
+            finally:
+                await downloader.close()
+
+    try:
+        assert asyncio.run(run())
+    finally:
+        cache.close()
+    assert requests == [ETAG]
+    assert output.read_bytes() == JPEG
+    assert (tmp_path / 'img_1.jpg.done').exists()
+
+
+def test_segmented_resume_fetches_only_unfinished_ranges(tmp_path):
+    """测试从 .segments 进度文件续传：已完成的分段不再请求"""
+    data = bytes(range(256)) * 64
+    ranges = []
+
+    async def handler(request):
+        spec = request.headers['Range'][len('bytes='):]
+        ranges.append(spec)
+        start, end = (int(x) for x in spec.split('-'))
+        return web.Response(
+            status=206, body=data[start:end + 1], content_type='application/octet-stream'
+        )
+
+    temp_path = tmp_path / 'video_1.mp4.downloading'
+    segments = plan_segments(len(data), 4)
+    # 模拟崩溃前：第 1 段完成，第 2 段完成一半，其余未开始
+    segments[0]['done'] = segments[0]['end'] + 1
+    segments[1]['done'] = 1000
+    content = bytearray(len(data))
+    content[:segments[0]['end'] + 1] = data[:segments[0]['end'] + 1]
+    content[segments[1]['start']:segments[1]['start'] + 1000] = \
+        data[segments[1]['start']:segments[1]['start'] + 1000]
+    temp_path.write_bytes(bytes(content))
+
+    async def run():
+        async with serve(handler) as base:
+            url = f"{base}/video_1.mp4"
+            (tmp_path / 'video_1.mp4.segments').write_text(json.dumps({
+                'url': url, 'size': len(data), 'etag': ETAG, 'segments': segments
+            }))
+            downloader = make_downloader(tmp_path)
+            try:
+                download = SegmentedDownload(
+                    await downloader._get_session(), url, temp_path, len(data),
+                    etag=ETAG, segment_count=4, retry_count=1
+                )
+                return await download.run()
+            finally:
+                await downloader.close()
+
+    assert asyncio.run(run())
+    assert sorted(ranges) == sorted(
+        f"{seg['start'] + seg['done']}-{seg['end']}" for seg in segments[1:]
+    )
+    assert temp_path.read_bytes() == data
+    assert not (tmp_path / 'video_1.mp4.segments').exists()
@@ -0,0 +1,45 @@
+"""Unit tests for analysis.exif_engine module"""
+
+from PIL import Image
+
+from src.analysis.exif_engine import read_app1_exif, load_exif
+
+
+def _save_jpeg(path, exif=None):
+    img = Image.new('RGB', (32, 32))
+    if exif is not None:
+        img.save(path, exif=exif.tobytes())
+    else:
+        img.save(path)
+
+
+class TestReadApp1Exif:
+    """Test APP1-only EXIF reading"""
+
+    def test_jpeg_with_exif(self, tmp_path):
+        """测试只读 APP1 段与 Pillow 完整打开结果一致"""
+        exif = Image.Exif()
+        exif[0x010F] = 'Canon'
+        exif[0x0110] = 'EOS R5'
+        path = tmp_path / 'a.jpg'
+        _save_jpeg(path, exif)
+
+        assert read_app1_exif(str(path))
+        with Image.open(path) as img:
+            assert dict(load_exif(str(path))) == dict(img.getexif())
+
+    def test_jpeg_without_exif(self, tmp_path):
+        """测试无 EXIF 的 JPEG 返回空数据"""
+        path = tmp_path / 'b.jpg'
+        _save_jpeg(path)
+
+        assert read_app1_exif(str(path)) == b''
+        assert dict(load_exif(str(path))) == {}
+
+    def test_non_jpeg_falls_back(self, tmp_path):
+        """测试非 JPEG 返回 None（回退到 Pillow）"""
+        path = tmp_path / 'c.png'
+        Image.new('RGB', (8, 8)).save(path)
+
+        assert read_app1_exif(str(path)) is None
+        assert dict(load_exif(str(path))) == {}
@@ -0,0 +1,70 @@
+"""Unit tests for scraper.file_writer module"""
+
+import asyncio
+
+import pytest
+
+from src.scraper.file_writer import (
+    CHUNK_LARGE,
+    CHUNK_MEDIUM,
+    CHUNK_SMALL,
+    StreamingFileWriter,
+    choose_chunk_size
+)
+
+
+def test_choose_chunk_size():
+    assert choose_chunk_size(None) == CHUNK_MEDIUM
+    assert choose_chunk_size(200 * 1024) == CHUNK_SMALL
+    assert choose_chunk_size(8 * 1024 * 1024) == CHUNK_MEDIUM
+    assert choose_chunk_size(512 * 1024 * 1024) == CHUNK_LARGE
+
+
+def test_buffered_writes_and_append(tmp_path):
+    """测试缓冲满时才落盘，关闭时写出剩余数据，ab 模式追加"""
+    path = tmp_path / 'out.bin'
+
+    async def run():
+        async with StreamingFileWriter(path, 'wb', fsync='close', buffer_size=10) as writer:
+            await writer.write(b'x' * 6)
+            assert writer.bytes_written == 0
+            await writer.write(b'y' * 6)
+            assert writer.bytes_written == 12
+            await writer.write(b'z' * 3)
+        assert writer.bytes_written == 15
+
+        async with StreamingFileWriter(path, 'ab') as writer:
+            await writer.write(b'!')
+
+    asyncio.run(run())
+    assert path.read_bytes() == b'x' * 6 + b'y' * 6 + b'z' * 3 + b'!'
+
+
+def test_offset_write_into_preallocated_file(tmp_path):
+    """测试 r+b 模式从指定偏移写入（分段下载）"""
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'\0' * 8)
+
+    async def run():
+        async with StreamingFileWriter(path, 'r+b', fsync='always', offset=4) as writer:
+            await writer.write(b'abcd')
+
+    asyncio.run(run())
+    assert path.read_bytes() == b'\0' * 4 + b'abcd'
+
+
+def test_close_flushes_on_error(tmp_path):
+    """测试出错时关闭前仍写出缓冲区（已写入部分可续传）"""
+    path = tmp_path / 'out.bin'
+
+    async def run():
+        async with StreamingFileWriter(path, 'wb') as writer:
+            await writer.write(b'partial')
+            raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert path.read_bytes() == b'partial'
+
+    with pytest.raises(ValueError):
+        StreamingFileWriter(path, fsync='sometimes')
@@ -0,0 +1,109 @@
+"""Unit tests for analysis.geocode_cache module"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.analysis import ExifAnalyzer
+from src.analysis.geocode_cache import GeocodeCache, geohash_encode, MISS
+
+
+class _CountingGeolocator:
+    """记录调用次数的假 Nominatim"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def reverse(self, query, language=None, timeout=None):
+        self.calls += 1
+        return SimpleNamespace(address='南山区, 深圳市, 广东省, 中国')
+
+
+def test_geohash_encode():
+    """测试 geohash 与标准实现一致"""
+    assert geohash_encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert geohash_encode(39.9042, 116.4074, 5) == 'wx4g0'
+
+
+class TestGeocodeCache:
+    """Test persistent geocode cache"""
+
+    def test_get_put_bucket(self, tmp_path):
+        """测试同一 geohash 单元内的坐标共享缓存，无地址结果也被缓存"""
+        cache = GeocodeCache(tmp_path / 'g.db', precision=6)
+        assert cache.get('online', 22.5431, 114.0579) is MISS
+
+        cache.put('online', 22.5431, 114.0579, '深圳市')
+        cache.put('online', 0.0, -140.0, None)
+
+        assert cache.get('online', 22.5432, 114.0580) == '深圳市'
+        assert cache.get('online', 0.0, -140.0) is None
+        assert cache.get('offline', 22.5431, 114.0579) is MISS
+
+    def test_ttl_expiry(self, tmp_path):
+        """测试过期记录视为未命中"""
+        cache = GeocodeCache(tmp_path / 'g.db', ttl_days=30)
+        cache.put('online', 22.5431, 114.0579, '深圳市')
+        old = (datetime.now() - timedelta(days=31)).isoformat()
+        cache._get_conn().execute("UPDATE geocode_cache SET updated_at = ?", (old,))
+
+        assert cache.get('online', 22.5431, 114.0579) is MISS
+
+    def test_warm_up_keeps_existing(self, tmp_path):
+        """测试预热不覆盖已有记录"""
+        cache = GeocodeCache(tmp_path / 'g.db')
+        cache.put('online', 22.5431, 114.0579, '深圳市南山区')
+
+        added = cache.warm_up([
+            (22.5431, 114.0579, '旧地址'),
+            (31.2304, 121.4737, '上海市'),
+            (31.2304, 121.4737, '上海市'),
+            (None, 121.0, 'x'),
+        ], 'online')
+
+        assert added == 1
+        assert cache.get('online', 22.5431, 114.0579) == '深圳市南山区'
+        assert cache.get('online', 31.2304, 121.4737) == '上海市'
+
+    def test_warm_up_from_media_same_source_only(self, tmp_path, db):
+        """测试只用同来源的已有地址预热（离线城市级地址不冒充在线结果）"""
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO authors (name, added_date) VALUES ('甲', '2024-01-01')")
+            conn.execute(
+                "INSERT INTO posts (id, author_id, url, url_hash, title, publish_date, "
+                "publish_year, publish_month, file_path, archived_date) "
+                "VALUES (1, 1, 'u', 'h', 't', '2024-01-02', 2024, 1, 'p', '2024-02-01')"
+            )
+            for lat, lng, location, source in (
+                (22.5431, 114.0579, '深圳市南山区', 'online'),
+                (31.2304, 121.4737, '上海市', 'offline'),
+                (39.9042, 116.4074, '北京市', None),
+            ):
+                conn.execute(
+                    "INSERT INTO media (post_id, type, url, file_name, file_path, exif_gps_lat, "
+                    "exif_gps_lng, exif_location, exif_location_source) "
+                    "VALUES (1, 'image', 'm', 'f', 'p', ?, ?, ?, ?)",
+                    (lat, lng, location, source)
+                )
+
+        cache = GeocodeCache.from_config({'advanced': {'geocode_cache_path': str(tmp_path / 'g.db')}})
+        try:
+            assert cache.warm_up_from_media(db, 'online') == 1
+            assert cache.get('online', 22.5431, 114.0579) == '深圳市南山区'
+            assert cache.get('online', 31.2304, 121.4737) is MISS
+            assert cache.get('online', 39.9042, 116.4074) is MISS
+        finally:
+            cache.close()
+
+
+def test_analyzer_repeat_run_no_external_calls(tmp_path):
+    """测试重复运行（新的分析器实例）不再请求在线服务"""
+    geolocator = _CountingGeolocator()
+    for _ in range(2):
+        analyzer = ExifAnalyzer(
+            geocode_mode='online',
+            geocode_cache=GeocodeCache(tmp_path / 'g.db')
+        )
+        analyzer.geolocator = geolocator
+        assert analyzer.reverse_geocode(22.5431, 114.0579)
+
+    assert geolocator.calls == 1
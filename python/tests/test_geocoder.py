@@ -0,0 +1,37 @@
+"""Unit tests for analysis.geocoder module"""
+
+from src.analysis import geocoder
+from src.analysis.geocoder import OfflineGeocoder
+
+
+class TestOfflineGeocoder:
+    """Test offline nearest-place lookup"""
+
+    def test_lookup_labels(self):
+        """测试中国地点显示省份城市，直辖市和国外地点的格式"""
+        gc = OfflineGeocoder()
+        assert gc.lookup(22.55, 114.10) == '广东省深圳市'
+        assert gc.lookup(39.91, 116.40) == '北京市'
+        assert gc.lookup(35.68, 139.70) == '日本东京'
+
+    def test_far_from_any_place(self):
+        """测试海上坐标超出距离阈值返回 None"""
+        assert OfflineGeocoder().lookup(0.0, -140.0) is None
+
+    def test_lookup_many_matches_single(self, monkeypatch):
+        """测试批量查询（NumPy 分块）与单点查询结果一致"""
+        monkeypatch.setattr(geocoder, 'QUERY_CHUNK_SIZE', 2)
+        gc = OfflineGeocoder()
+        gc._tree = None
+        coords = [(22.55, 114.10), (31.23, 121.47), (0.0, -140.0), (39.91, 116.40), (35.68, 139.70)]
+
+        results = gc.lookup_many([c[0] for c in coords], [c[1] for c in coords])
+
+        assert results == [gc.lookup(lat, lng) for lat, lng in coords]
+        assert results[1] == '上海市'
+
+    def test_custom_dataset(self, tmp_path):
+        """测试自定义数据集"""
+        path = tmp_path / 'places.csv'
+        path.write_text('name,admin1,country,lat,lng\n测试镇,测试省,中国,10.0,10.0\n', encoding='utf-8')
+        assert OfflineGeocoder(path).lookup(10.1, 10.1) == '测试省测试镇'
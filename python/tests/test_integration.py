@@ -43,7 +43,7 @@ class TestScraperIntegration:
         assert archiver.archive_dir == Path('./test_archive')
         assert archiver.download_images is True
         assert archiver.download_videos is True
-        assert archiver.rate_limit_delay == 0.5
+        assert archiver.extractor.throttle.delay == 0.5
 
     def test_post_directory_calculation(self):
         """测试帖子目录路径计算"""
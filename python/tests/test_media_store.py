@@ -0,0 +1,59 @@
+"""Unit tests for scraper.media_store module"""
+
+import asyncio
+
+from src.scraper import media_store
+from src.scraper.media_store import MediaStore, file_sha256
+
+
+def _ingest_and_materialize(store, tmp_path):
+    first = tmp_path / 'post1' / 'photo' / 'img_1.jpg'
+    first.parent.mkdir(parents=True)
+    first.write_bytes(b'image-bytes')
+    dup = tmp_path / 'post2' / 'photo' / 'img_1.jpg'
+    dup.parent.mkdir(parents=True)
+    dup.write_bytes(b'image-bytes')
+    linked = tmp_path / 'post3' / 'photo' / 'img_1.jpg'
+
+    async def run():
+        sha = await store.ingest('https://cdn.example/a.jpg', first)
+        await store.ingest('https://mirror.example/a.jpg', dup)
+        assert await store.materialize('https://cdn.example/a.jpg', linked)
+        assert not await store.materialize('https://cdn.example/unknown.jpg', tmp_path / 'x.jpg')
+        return sha
+
+    return asyncio.run(run()), first, dup, linked
+
+
+def test_dedup_with_hardlinks(tmp_path):
+    """测试相同内容只保存一个 blob，帖子目录中的文件硬链接到 blob"""
+    store = MediaStore(tmp_path / 'store')
+    try:
+        sha, first, dup, linked = _ingest_and_materialize(store, tmp_path)
+        blob = store.blob_path(sha, '.jpg')
+
+        assert sha == file_sha256(blob)
+        assert len(list((tmp_path / 'store' / 'blobs').rglob('*.jpg'))) == 1
+        assert first.stat().st_ino == dup.stat().st_ino == linked.stat().st_ino == blob.stat().st_ino
+        assert store.lookup_hash('https://mirror.example/a.jpg') == sha
+        assert not list(linked.parent.glob('*.linking'))
+    finally:
+        store.close()
+
+
+def test_copy_fallback_when_hardlinks_fail(tmp_path, monkeypatch):
+    """测试跨文件系统（硬链接失败）时回退为复制"""
+    def no_link(src, dst):
+        raise OSError('cross-device link')
+
+    monkeypatch.setattr(media_store.os, 'link', no_link)
+    store = MediaStore(tmp_path / 'store')
+    try:
+        sha, first, dup, linked = _ingest_and_materialize(store, tmp_path)
+        blob = store.blob_path(sha, '.jpg')
+
+        assert blob.read_bytes() == linked.read_bytes() == dup.read_bytes() == b'image-bytes'
+        assert linked.stat().st_ino != blob.stat().st_ino
+        assert not list(linked.parent.glob('*.linking'))
+    finally:
+        store.close()
@@ -0,0 +1,108 @@
+"""Unit tests for database.migrate parallel import"""
+
+import os
+
+from src.database import migrate
+from src.database.migrate import _ensure_import_tables, _save_checkpoint, import_all_data
+
+
+def _make_archive(root):
+    for author, count in (('甲', 3), ('乙', 2)):
+        for i in range(count):
+            post_dir = root / author / '2024' / '01' / f"帖子{i}"
+            (post_dir / 'photo').mkdir(parents=True)
+            (post_dir / 'content.html').write_text(
+                f"<html><title>{author}-{i}</title><body>"
+                f"<span class=\"date\">2024-01-0{i + 1} 10:00:00</span></body></html>",
+                encoding='utf-8'
+            )
+            (post_dir / 'photo' / 'img_1.jpg').write_bytes(b'x' * 10)
+    (root / '.media_store').mkdir()
+
+
+def test_parallel_import(tmp_path, db, monkeypatch):
+    """测试进程池解析 + 写入线程导入，重复导入时全部跳过"""
+    monkeypatch.setattr(migrate, 'MIN_PARALLEL_POSTS', 1)
+    archive = tmp_path / 'archive'
+    _make_archive(archive)
+
+    result = import_all_data(str(archive), {}, db=db, show_progress=False, workers=2)
+    assert result['errors'] == []
+    assert (result['authors_added'], result['posts_added'], result['media_added']) == (2, 5, 5)
+
+    conn = db.get_connection()
+    row = conn.execute(
+        "SELECT p.publish_date, p.file_size_bytes, m.file_size_bytes FROM posts p "
+        "JOIN media m ON m.post_id = p.id WHERE p.title = '甲-1'"
+    ).fetchone()
+    assert row[0] == '2024-01-02 10:00:00'
+    assert row[1] > 10 and row[2] == 10
+    assert conn.execute("SELECT COUNT(*) FROM import_checkpoints").fetchone()[0] == 0
+
+    again = import_all_data(str(archive), {}, db=db, show_progress=False, workers=1)
+    assert (again['posts_added'], again['posts_skipped']) == (0, 5)
+
+
+def test_resume_skips_completed_authors(tmp_path, db):
+    """测试从检查点继续时跳过已完成的作者"""
+    archive = tmp_path / 'archive'
+    _make_archive(archive)
+    _ensure_import_tables(db)
+    _save_checkpoint(db, str(archive), '甲', 3)
+
+    result = import_all_data(str(archive), {}, db=db, show_progress=False, workers=1)
+    assert (result['authors_resumed'], result['posts_added']) == (1, 2)
+
+    fresh = import_all_data(str(archive), {}, db=db, show_progress=False, workers=1, resume=False)
+    assert fresh['posts_added'] == 3
+
+
+def test_incremental_sync_reparses_changed_dirs(tmp_path, db):
+    """测试清单比对：只重新解析变化的目录，保留已有媒体的 EXIF"""
+    archive = tmp_path / 'archive'
+    _make_archive(archive)
+    import_all_data(str(archive), {}, db=db, show_progress=False, workers=1)
+
+    conn = db.get_connection()
+    conn.execute("UPDATE media SET exif_make = 'Canon'")
+    conn.commit()
+
+    post_dir = archive / '甲' / '2024' / '01' / '帖子0'
+    (post_dir / 'content.html').write_text('<html><title>新标题</title></html>', encoding='utf-8')
+    (post_dir / 'photo' / 'img_2.jpg').write_bytes(b'y' * 20)
+    os.utime(post_dir / 'photo', ns=(1, 2 * 10 ** 18))
+
+    result = import_all_data(str(archive), {}, db=db, show_progress=False, workers=1)
+    assert (result['posts_added'], result['posts_updated'], result['posts_skipped']) == (0, 1, 4)
+    assert result['media_added'] == 1
+
+    post_id = conn.execute("SELECT id FROM posts WHERE title = '新标题'").fetchone()[0]
+    makes = [row[0] for row in conn.execute(
+        "SELECT exif_make FROM media WHERE post_id = ? ORDER BY file_name", (post_id,)
+    )]
+    assert makes == ['Canon', None]
+
+
+def test_failed_post_rolled_back_alone(tmp_path, db, monkeypatch):
+    """测试单篇帖子写入失败时只回滚该帖子，同批其他帖子正常提交"""
+    archive = tmp_path / 'archive'
+    _make_archive(archive)
+
+    write_manifest = migrate._ImportWriter._write_manifest
+
+    def failing_manifest(self, conn, post_id, metadata):
+        # 帖子和媒体已写入后才失败
+        if metadata['title'] == '甲-1':
+            raise RuntimeError('boom')
+        write_manifest(self, conn, post_id, metadata)
+
+    monkeypatch.setattr(migrate._ImportWriter, '_write_manifest', failing_manifest)
+
+    result = import_all_data(str(archive), {}, db=db, show_progress=False, workers=1)
+    assert len(result['errors']) == 1
+    assert (result['posts_added'], result['media_added']) == (4, 4)
+
+    conn = db.get_read_connection()
+    titles = {row[0] for row in conn.execute("SELECT title FROM posts")}
+    assert '甲-1' not in titles and len(titles) == 4
+    assert conn.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 4
@@ -0,0 +1,82 @@
+"""Unit tests for scraper.navigator adaptive pacing"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper.navigator import (
+    AdaptiveNavigator,
+    AdaptiveThrottle,
+    ThrottledError,
+    parse_retry_after
+)
+
+
+def test_throttle_aimd():
+    """测试健康响应加性减小间隔，限流/变慢/出错时增大，且不越界"""
+    throttle = AdaptiveThrottle(initial_delay=0.5, min_delay=0.1, max_delay=4.0, target_latency=2.0)
+
+    for _ in range(20):
+        throttle.record(0.3)
+    assert throttle.delay == 0.1
+
+    throttle.record(0.3, status=429)
+    assert throttle.delay == 1.0
+    throttle.record(0.3, status=503)
+    assert throttle.delay == 2.0
+
+    throttle.record(5.0)
+    assert throttle.delay > 2.0
+    for _ in range(5):
+        throttle.record_error()
+    assert throttle.delay == 4.0
+
+    throttle.record(0.3)
+    assert round(throttle.delay, 2) == 3.95
+
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('Wed, 21 Oct 2026 07:28:00 GMT') is None
+
+
+def test_navigator_retries_throttled_and_waits_for_selector():
+    """测试 429 退避重试，成功后等待所需选择器而不是完整加载"""
+    statuses = [429, 200]
+    gotos = []
+
+    class FakePool:
+        async def goto(self, page, url, **kwargs):
+            gotos.append(kwargs['wait_until'])
+            return SimpleNamespace(status=statuses.pop(0), headers={})
+
+    class FakePage:
+        async def wait_for_selector(self, selector, **kwargs):
+            return object()
+
+        async def wait_for_load_state(self, state, **kwargs):
+            await asyncio.sleep(10)
+
+    throttle = AdaptiveThrottle(initial_delay=0.0, min_delay=0.0, max_delay=0.0)
+    navigator = AdaptiveNavigator(FakePool(), throttle, max_retries=2)
+
+    response = asyncio.run(navigator.goto(FakePage(), 'https://f.example/p', wait_for='.tpc_content'))
+    assert response.status == 200
+    assert gotos == ['commit', 'commit']
+
+
+def test_navigator_raises_when_retries_exhausted():
+    """测试重试用尽仍被限流时抛出 ThrottledError，不把限流页面当作成功返回"""
+    gotos = []
+
+    class FakePool:
+        async def goto(self, page, url, **kwargs):
+            gotos.append(url)
+            return SimpleNamespace(status=429, headers={})
+
+    throttle = AdaptiveThrottle(initial_delay=0.0, min_delay=0.0, max_delay=0.0)
+    navigator = AdaptiveNavigator(FakePool(), throttle, max_retries=2)
+
+    with pytest.raises(ThrottledError) as excinfo:
+        asyncio.run(navigator.goto(object(), 'https://f.example/p'))
+    assert excinfo.value.status == 429
+    assert len(gotos) == 3
@@ -0,0 +1,94 @@
+"""Unit tests for scraper.page_parser"""
+
+import pytest
+
+from src.scraper.http_fetcher import is_challenge
+from src.scraper.page_parser import (
+    EXTRACTION_SCRIPT,
+    EXTRACTION_SCRIPT_VERSION,
+    extract_raw_post,
+    normalize_extracted,
+    normalize_time_text,
+    parse_listing_html,
+    parse_post_html,
+)
+
+BASE_URL = 'https://forum.example'
+
+LISTING_HTML = """
+<table><tbody>
+  <tr><td>1</td><td><a href="htm_data/2602/7/1001.html">A</a></td><td>alice 2026-02-10</td></tr>
+  <tr><td>2</td><td><a href="htm_data/2602/7/1002.html">B</a></td><td>bob 2026-02-09</td></tr>
+  <tr><td>3</td><td><a href="/read.php?tid=1">not a post</a></td><td>alice</td></tr>
+  <tr><td>4</td><td><a href="/htm_data/2602/7/1003.html">C</a></td><td>Alice 2026-02-08</td></tr>
+</tbody></table>
+<div class="pages"><a class="next" href="?page=2">下一页</a></div>
+"""
+
+POST_HTML = """
+<h4 class="f16">  测试标题 </h4>
+<div class="tr1 do_not_catch"><b>alice</b></div>
+<div class="tipad">Posted: 2026-02-10 15:30 | 回复</div>
+<div class="tpc_content">正文<img data-original="/img/1.jpg" src="thumb.jpg"><img src="https://cdn.example/2.png">
+  <video src="/v/1.mp4"></video></div>
+<iframe src="https://player.example/embed/9"></iframe>
+"""
+
+
+def test_parse_listing_filters_author_and_detects_next_page():
+    """测试列表页解析：作者过滤、相对链接补全、下一页检测"""
+    urls, has_next = parse_listing_html(LISTING_HTML, BASE_URL, author_name='alice')
+    assert urls == [
+        'https://forum.example/htm_data/2602/7/1001.html',
+        'https://forum.example/htm_data/2602/7/1003.html',
+    ]
+    assert has_next
+
+    urls, has_next = parse_listing_html(
+        LISTING_HTML.split('<div class="pages">')[0], BASE_URL,
+        author_name='alice', is_author_homepage=True
+    )
+    assert len(urls) == 3
+    assert not has_next
+
+
+def test_parse_post_matches_browser_format():
+    """测试帖子页解析结果与浏览器模式格式一致"""
+    post = parse_post_html(POST_HTML, f'{BASE_URL}/htm_data/1.html', BASE_URL)
+
+    assert post['title'] == '测试标题'
+    assert post['author'] == 'alice'
+    assert post['time'] == '2026-02-10 15:30'
+    assert post['content'].startswith('正文')
+    assert post['images'] == ['https://forum.example/img/1.jpg', 'https://cdn.example/2.png']
+    assert post['videos'] == ['https://forum.example/v/1.mp4', 'https://player.example/embed/9']
+
+
+def test_normalize_extracted_from_browser_raw_fields():
+    """测试浏览器脚本返回的原始字段整理：缺失字段取默认值，版本不匹配报错"""
+    raw = extract_raw_post(POST_HTML)
+    assert raw['time_texts'][0].startswith('Posted:')
+    assert f'version: {EXTRACTION_SCRIPT_VERSION},' in EXTRACTION_SCRIPT
+
+    empty = {
+        'version': EXTRACTION_SCRIPT_VERSION, 'title': '  ', 'author': None, 'time_texts': ['无日期'],
+        'content': None, 'image_srcs': ['a.jpg', '/a.jpg'], 'video_srcs': [], 'iframe_srcs': ['/ads'],
+    }
+    post = normalize_extracted(empty, f'{BASE_URL}/p.html', BASE_URL)
+    assert (post['title'], post['author'], post['content']) == ('无标题', '未知作者', '')
+    assert post['images'] == ['https://forum.example/a.jpg']
+    assert post['videos'] == []
+    assert post['time']
+
+    with pytest.raises(ValueError):
+        normalize_extracted(dict(empty, version=0), f'{BASE_URL}/p.html', BASE_URL)
+
+
+def test_time_normalization_and_challenge_detection():
+    """测试时间文本清理和反爬挑战页识别"""
+    assert normalize_time_text('发表于： 2026/02/10 08:00') == '2026/02/10 08:00'
+    assert normalize_time_text('无日期') is None
+
+    assert is_challenge(503, '')
+    assert is_challenge(200, '<title>Just a moment...</title>')
+    assert not is_challenge(200, POST_HTML)
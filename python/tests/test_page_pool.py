@@ -0,0 +1,136 @@
+"""Unit tests for scraper.page_pool lease recycling"""
+
+import asyncio
+
+import pytest
+
+from src.scraper.extractor import PostExtractor
+from src.scraper.page_pool import PagePool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.context = FakeContext()
+
+    async def new_context(self):
+        return self.context
+
+
+def _start_pool(size=1):
+    pool = PagePool(FakeBrowser(), size=size)
+    asyncio.run(pool.start())
+    return pool
+
+
+def test_lease_reuses_healthy_page():
+    """测试正常归还的页面被复用"""
+    pool = _start_pool()
+
+    async def run():
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second and not first.closed
+
+
+def test_lease_recycles_failed_and_discarded_pages():
+    """测试抛出异常或被 discard() 标记的页面在归还时被替换"""
+    pool = _start_pool()
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as failed:
+                raise RuntimeError()
+        async with pool.lease() as discarded:
+            pool.discard(discarded)
+        async with pool.lease() as fresh:
+            pass
+        return failed, discarded, fresh
+
+    failed, discarded, fresh = asyncio.run(run())
+    assert failed.closed and discarded.closed
+    assert fresh is not failed and fresh is not discarded and not fresh.closed
+    assert len(pool.browser.context.pages) == 3
+
+
+def test_failed_extraction_recycles_page(tmp_path):
+    """测试帖子提取失败（异常被吞掉）时页面仍被回收"""
+    extractor = PostExtractor('https://f.example', tmp_path)
+    extractor.pool = _start_pool()
+
+    class FailingNavigator:
+        async def goto(self, page, url, wait_for=None):
+            raise TimeoutError('navigation timeout')
+
+    extractor.navigator = FailingNavigator()
+
+    async def run():
+        async with extractor.pool.lease() as page:
+            pass
+        assert await extractor.extract_post_details('https://f.example/p') is None
+        async with extractor.pool.lease() as replacement:
+            pass
+        return page, replacement
+
+    page, replacement = asyncio.run(run())
+    assert page.closed and replacement is not page
+
+
+def test_lease_keeps_page_on_early_close_and_cancel():
+    """测试提前关闭的异步生成器和被取消的任务不会回收页面"""
+    pool = _start_pool()
+
+    async def pages():
+        async with pool.lease() as page:
+            yield page
+            yield page
+
+    async def hold():
+        async with pool.lease():
+            await asyncio.sleep(10)
+
+    async def run():
+        gen = pages()
+        first = await gen.__anext__()
+        await gen.aclose()
+
+        task = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        async with pool.lease() as page:
+            return first, page
+
+    first, page = asyncio.run(run())
+    assert page is first and not page.closed
+    assert len(pool.browser.context.pages) == 1
@@ -0,0 +1,54 @@
+"""Unit tests for utils.post_scanner module"""
+
+from src.utils.post_scanner import iter_post_dirs, scan_post_dir
+
+
+def test_scan_post_dir(tmp_path):
+    """测试单次扫描：大小、媒体分类、标记文件"""
+    post_dir = tmp_path / 'post'
+    (post_dir / 'photo').mkdir(parents=True)
+    (post_dir / 'video').mkdir()
+    (post_dir / 'content.html').write_text('abc')
+    (post_dir / '.complete').write_text('12345678')
+    (post_dir / 'photo' / 'img_2.png').write_bytes(b'x' * 10)
+    (post_dir / 'photo' / 'img_1.jpg').write_bytes(b'x' * 5)
+    (post_dir / 'photo' / 'img_1.jpg.done').write_bytes(b'')
+    (post_dir / 'video' / 'video_1.mp4.downloading').write_bytes(b'x' * 7)
+
+    scan = scan_post_dir(post_dir)
+
+    assert scan.exists and scan.has_content and scan.is_complete and not scan.has_progress
+    assert scan.total_size == 3 + 8 + 10 + 5 + 7
+    assert scan.images == ['photo/img_1.jpg', 'photo/img_2.png']
+    assert scan.videos == []
+    assert scan.done == {'photo/img_1.jpg'}
+    assert scan.size_of('photo/img_2.png') == 10
+    assert {'photo', 'video'} <= scan.dirs
+
+    assert not scan_post_dir(tmp_path / 'missing').exists
+
+
+def test_scan_skips_temp_and_unknown_files(tmp_path):
+    """测试媒体库链接中的临时文件和不符合命名的文件不计入媒体列表"""
+    post_dir = tmp_path / 'post'
+    (post_dir / 'photo').mkdir(parents=True)
+    (post_dir / 'video').mkdir()
+    for name in ('img_1.jpg', 'img_2.jpg.linking', 'img_3.bin', 'cover.jpg', 'img_4.webp'):
+        (post_dir / 'photo' / name).write_bytes(b'x')
+    for name in ('video_1.mp4', 'video_2.mp4.linking', 'video_3.mp4.segments', 'notes.txt'):
+        (post_dir / 'video' / name).write_bytes(b'x')
+
+    scan = scan_post_dir(post_dir)
+
+    assert scan.images == ['photo/img_1.jpg', 'photo/img_4.webp']
+    assert scan.videos == ['video/video_1.mp4']
+
+
+def test_iter_post_dirs(tmp_path):
+    for path in ('2024/02/b', '2024/01/a', '2023/12/c'):
+        (tmp_path / path).mkdir(parents=True)
+    (tmp_path / '2024' / 'notes.txt').write_text('')
+
+    assert [p[len(str(tmp_path)) + 1:] for p in iter_post_dirs(tmp_path)] == [
+        '2023/12/c', '2024/01/a', '2024/02/b'
+    ]
@@ -0,0 +1,56 @@
+"""Unit tests for scraper.resource_policy"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.scraper.resource_policy import ResourcePolicy
+
+
+def test_should_block_by_type_third_party_and_allowlist():
+    """测试按资源类型、第三方域名拦截，反爬域名和主页面导航放行"""
+    policy = ResourcePolicy('https://www.forum.example')
+
+    assert policy.should_block('https://www.forum.example/a.jpg', 'image')
+    assert policy.should_block('https://cdn.forum.example/style.css', 'stylesheet')
+    assert policy.should_block('https://ads.tracker.example/t.js', 'script')
+    assert policy.should_block('https://ads.tracker.example/frame', 'document')
+
+    assert not policy.should_block('https://www.forum.example/app.js', 'script')
+    assert not policy.should_block('https://static.forum.example/app.js', 'script')
+    assert not policy.should_block('https://challenges.cloudflare.com/turnstile/api.js', 'script')
+    assert not policy.should_block('https://mirror.example/post.html', 'document', is_main_navigation=True)
+    assert not policy.should_block('data:image/png;base64,AAAA', 'image')
+
+    lenient = ResourcePolicy('https://forum.example', blocked_types=['font'], block_third_party=False)
+    assert not lenient.should_block('https://ads.tracker.example/t.js', 'script')
+    assert not lenient.should_block('https://forum.example/a.jpg', 'image')
+
+
+def test_from_config_and_route_handler():
+    """测试配置关闭时不创建策略，路由回调按判断结果 abort/continue"""
+    assert ResourcePolicy.from_config({'advanced': {'block_resources': False}}, 'https://f.example') is None
+
+    policy = ResourcePolicy.from_config({}, 'https://f.example')
+    calls = []
+
+    class FakeRoute:
+        def __init__(self, url, resource_type):
+            frame = SimpleNamespace(parent_frame=None)
+            self.request = SimpleNamespace(
+                url=url, resource_type=resource_type, frame=frame,
+                is_navigation_request=lambda: resource_type == 'document'
+            )
+
+        async def abort(self):
+            calls.append(('abort', self.request.url))
+
+        async def continue_(self):
+            calls.append(('continue', self.request.url))
+
+    async def run():
+        await policy.handle(FakeRoute('https://f.example/post.html', 'document'))
+        await policy.handle(FakeRoute('https://f.example/font.woff2', 'font'))
+
+    asyncio.run(run())
+    assert calls == [('continue', 'https://f.example/post.html'), ('abort', 'https://f.example/font.woff2')]
+    assert (policy.blocked, policy.allowed) == (1, 1)
@@ -0,0 +1,107 @@
+"""Unit tests for database.search_index module"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.models import Author, Post
+from src.database.query import search_posts
+from src.database.search_index import (
+    build_match_query,
+    has_search_index,
+    make_snippet,
+    rebuild_search_index
+)
+from src.database.sync import sync_archived_posts
+
+
+def _make_post(root, name, title, body):
+    post_dir = root / name
+    post_dir.mkdir()
+    (post_dir / 'content.html').write_text(
+        f"<html><head><title>{title}</title></head><body>"
+        f"<header><h1>{title}</h1><b>作者:</b> 测试</header>"
+        f"<article>{body}</article><script>var x = '北京';</script></body></html>",
+        encoding='utf-8'
+    )
+    return {
+        'post_url': f"https://example.com/{name}",
+        'post_dir': post_dir,
+        'metadata': {'title': title, 'publish_date': '2024-01-01', 'images': [], 'videos': []}
+    }
+
+
+@pytest.fixture
+def db(db, tmp_path):
+    """已同步三篇帖子的测试数据库"""
+    posts = [
+        _make_post(tmp_path, 'a', '周末游记', '今天去了北京大学，校园很美。'),
+        _make_post(tmp_path, 'b', '北京美食推荐', '烤鸭和炸酱面。'),
+        _make_post(tmp_path, 'c', '上海外滩', '夜景很漂亮。'),
+    ]
+    sync_archived_posts('测试', posts, db=db)
+    return db
+
+
+def test_build_match_query_escapes_quotes():
+    assert build_match_query(['a"b', '北京']) == '"a""b" AND "北京"'
+    assert build_match_query([]) is None
+
+
+def test_make_snippet_highlights():
+    snippet = make_snippet('前' * 100 + '北京大学' + '后' * 100, ['北京'], length=20)
+    assert '【北京】' in snippet
+    assert snippet.startswith('…') and snippet.endswith('…')
+
+
+def test_search_title_and_body_ranked(db):
+    """测试正文命中（含长词中的短词），标题命中排在前面"""
+    results = search_posts(keyword='北京', db=db)
+
+    assert [r['title'] for r in results] == ['北京美食推荐', '周末游记']
+    assert '【北京】' in results[1]['snippet']
+
+
+def test_search_excludes_page_chrome(db):
+    """测试页眉和脚本不进入索引"""
+    assert search_posts(keyword='作者', db=db) == []
+
+
+def test_resync_and_rebuild(db):
+    """测试重新同步覆盖旧索引，完整重建结果一致"""
+    assert [r['title'] for r in search_posts(keyword='外滩', db=db)] == ['上海外滩']
+    assert rebuild_search_index(db) == 3
+    assert len(search_posts(keyword='夜景', db=db)) == 1
+
+
+def test_model_create_and_update_indexed(db, tmp_path, monkeypatch):
+    """测试 Post.create / Post.update 写入和更新全文索引"""
+    monkeypatch.setattr(Post, '_db', db)
+    monkeypatch.setattr(Author, '_db', db)
+    post_dir = _make_post(tmp_path, 'd', '广州早茶', '虾饺和叉烧包。')['post_dir']
+    author = Author.get_by_name('测试')
+
+    post = Post.create(
+        author_id=author.id, url='https://example.com/d', url_hash='d',
+        title='广州早茶', file_path=str(post_dir), archived_date='2024-01-01'
+    )
+    assert [r['title'] for r in search_posts(keyword='虾饺', db=db)] == ['广州早茶']
+
+    post.update(title='深圳早茶')
+    assert search_posts(keyword='广州', db=db) == []
+    assert [r['title'] for r in search_posts(keyword='深圳', db=db)] == ['深圳早茶']
+
+
+def test_index_built_on_open_not_on_search(db):
+    """测试查询不会建立索引；已有数据库重新打开时建立索引"""
+    conn = db.get_connection()
+    conn.execute("DROP TABLE posts_fts")
+    conn.commit()
+
+    assert [r['title'] for r in search_posts(keyword='外滩', db=db)] == ['上海外滩']
+    assert not has_search_index(conn)
+
+    path = db.get_db_path()
+    db.close()
+    db = DatabaseConnection(path)
+    assert has_search_index(db.get_connection())
+    assert len(search_posts(keyword='夜景', db=db)) == 1
@@ -0,0 +1,68 @@
+"""Unit tests for database.sync batched archive sync"""
+
+from src.database.models import Media
+from src.database.sync import sync_archived_posts
+
+
+def _make_post(root, name, images):
+    post_dir = root / name
+    (post_dir / 'photo').mkdir(parents=True)
+    (post_dir / 'content.html').write_text(f"<html><title>{name}</title></html>", encoding='utf-8')
+    for image in images:
+        (post_dir / 'photo' / image).write_bytes(b'x' * 100)
+    return {
+        'post_url': f"https://forum.example/{name}",
+        'post_dir': post_dir,
+        'metadata': {
+            'title': name,
+            'publish_date': '2024-01-02 10:00:00',
+            'images': [f"photo/{image}" for image in images],
+            'videos': [],
+            'image_count': len(images)
+        }
+    }
+
+
+def _count(db, table):
+    return db.get_read_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_batch_sync_and_resync(tmp_path, db):
+    """测试整批同步帖子和媒体，重新同步时替换媒体记录而不重复"""
+    posts = [
+        _make_post(tmp_path, 'a', ['img_1.jpg', 'img_2.jpg']),
+        _make_post(tmp_path, 'b', ['img_1.jpg']),
+    ]
+
+    assert sync_archived_posts('作者', posts, db=db) == 2
+    assert (_count(db, 'posts'), _count(db, 'media')) == (2, 3)
+    sizes = {row[0] for row in db.get_read_connection().execute("SELECT file_size_bytes FROM media")}
+    assert sizes == {100}
+
+    (posts[0]['post_dir'] / 'photo' / 'img_2.jpg').unlink()
+    posts[0]['metadata']['images'] = ['photo/img_1.jpg']
+    assert sync_archived_posts('作者', posts, db=db) == 2
+    assert (_count(db, 'authors'), _count(db, 'posts'), _count(db, 'media')) == (1, 2, 2)
+
+
+def test_batch_sync_rolls_back_whole_batch(tmp_path, db, monkeypatch):
+    """测试批内任一帖子失败时整批回滚，并记录失败历史"""
+    posts = [
+        _make_post(tmp_path, 'a', ['img_1.jpg']),
+        _make_post(tmp_path, 'b', ['img_1.jpg']),
+    ]
+    bulk_create = Media.bulk_create.__func__
+    calls = []
+
+    def failing_bulk_create(cls, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError('disk full')
+        return bulk_create(cls, rows)
+
+    monkeypatch.setattr(Media, 'bulk_create', classmethod(failing_bulk_create))
+
+    assert sync_archived_posts('作者', posts, db=db) == 0
+    assert (_count(db, 'posts'), _count(db, 'media')) == (0, 0)
+    status = db.get_read_connection().execute("SELECT status FROM sync_history").fetchall()
+    assert [row[0] for row in status] == ['failed']